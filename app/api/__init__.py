@@ -5,11 +5,13 @@ This module exports the FastAPI routers for different parts of the application.
 Each router is responsible for a specific aspect of functionality.
 """
 
+from .admin import router as admin_router
 from .keyword import router as keyword_router
 from .pictogram import router as pictogram_router
 from .voice import router as voice_router
 
 __all__ = [
+    "admin_router",  # Admin routes, e.g. vocabulary batch generation
     "keyword_router",  # Routes for keyword CRUD operations
     "pictogram_router",  # Routes for pictogram generation
     "voice_router",  # Routes for voice generation
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import socket
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+from app.core.container import ServiceContainer
+from app.core.deps import get_services, require_admin_key
+from app.core.executors import PROVIDER
+from app.core.job_queue import GenerationQueue
+from app.core.rate_limit import get_rate_limiters
+from app.services.vocabulary_batch import enqueue_vocabulary, parse_vocabulary
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_key)]
+)
+
+
+def _require_queue(services: ServiceContainer) -> GenerationQueue:
+    if services.generation_queue is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Vocabulary batches need the generation queue "
+            "(GENERATION_QUEUE_ENABLED)",
+        )
+    return services.generation_queue
+
+
+async def _get_progress(queue: GenerationQueue, batch_id: int) -> Dict[str, Any]:
+    progress = await asyncio.to_thread(queue.batch_progress, batch_id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Vocabulary batch {batch_id} not found",
+        )
+    return progress
+
+
+@router.post(
+    "/vocabulary-batches",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_vocabulary_batch(
+    request: Request,
+    format: Literal["txt", "csv", "json"] = Query(
+        "txt", description="Format of the vocabulary file sent as the body"
+    ),
+    language: str = Query("en", description="Language of words that set none"),
+    name: Optional[str] = Query(None, description="Label shown in the progress"),
+    services: ServiceContainer = Depends(get_services),
+):
+    """
+    Generate content for a whole vocabulary. The request body is the
+    vocabulary file, e.g. `curl --data-binary @words.txt`.
+
+    Keywords are created as needed and a generation job is queued for each
+    keyword missing a pictogram or voice clips; the generation workers run
+    them. Posting the same file again resumes a cancelled batch. Returns the
+    batch's progress; poll it with GET /admin/vocabulary-batches/{batch_id}.
+    """
+    queue = _require_queue(services)
+    try:
+        keywords = parse_vocabulary(
+            (await request.body()).decode("utf-8"), format, language
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not keywords:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The vocabulary file has no words",
+        )
+    return await enqueue_vocabulary(
+        services.keyword_service, queue, keywords, name=name
+    )
+
+
+@router.get("/vocabulary-batches", response_model=List[Dict[str, Any]])
+async def list_vocabulary_batches(
+    limit: int = Query(20, ge=1, le=100),
+    services: ServiceContainer = Depends(get_services),
+):
+    """Progress of the most recent vocabulary batches, newest first."""
+    return await asyncio.to_thread(_require_queue(services).list_batches, limit)
+
+
+@router.get("/vocabulary-batches/{batch_id}", response_model=Dict[str, Any])
+async def get_vocabulary_batch(
+    batch_id: int,
+    services: ServiceContainer = Depends(get_services),
+):
+    """
+    Progress of a vocabulary batch, counted from the status of its jobs,
+    with its throughput (keywords per minute) and the failed keywords.
+    """
+    return await _get_progress(_require_queue(services), batch_id)
+
+
+@router.delete("/vocabulary-batches/{batch_id}", response_model=Dict[str, Any])
+async def cancel_vocabulary_batch(
+    batch_id: int,
+    services: ServiceContainer = Depends(get_services),
+):
+    """
+    Cancel the queued jobs of a vocabulary batch; jobs already running
+    finish. Post the file again to resume it.
+    """
+    queue = _require_queue(services)
+    await _get_progress(queue, batch_id)
+    await asyncio.to_thread(queue.cancel_batch, batch_id)
+    return await _get_progress(queue, batch_id)
+
+
+@router.get("/provider-limits", response_model=Dict[str, Any])
+async def get_provider_limits(services: ServiceContainer = Depends(get_services)):
+    """
+    Rate limiter state per AI provider in this API process: current and
+    configured rate, calls in flight and waiting, 429s received and time
+    spent waiting to be sent, plus each provider's thread pool.
+
+    Limiters are per process. With the generation queue enabled, keyword
+    content is generated by the worker processes, whose limiters are not
+    included here (they log their 429s); this covers the /pictogram and
+    /voice routes and any in-process generation.
+    """
+    return {
+        "process": f"{socket.gethostname()}:{os.getpid()}",
+        "scope": "this API process only",
+        "generation_queue_enabled": services.generation_queue is not None,
+        "providers": get_rate_limiters().stats(),
+        "executors": {
+            stage: stats
+            for stage, stats in services.executors.stats().items()
+            if stage.startswith(f"{PROVIDER}:")
+        },
+    }
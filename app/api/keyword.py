@@ -1,20 +1,155 @@
-from typing import Dict, List
-
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-
-from app.core.deps import get_keyword_content_generator, get_keyword_service
-from app.models import Audio
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from postgrest import APIError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.core.config import settings
+from app.core.deps import (
+    get_generation_queue,
+    get_keyword_content_generator,
+    get_keyword_service,
+)
+from app.core.http_cache import (
+    cache_headers,
+    compute_etag,
+    compute_last_modified,
+    is_not_modified,
+)
+from app.core.job_queue import GenerationQueue
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.serialization import fast_json_response
+from app.core.streaming import NDJSON_MEDIA_TYPE, gzip_chunks, ndjson_chunks
+from app.models import Keyword
 from app.schemas import (
+    GenerationJobRead,
+    KeywordAudioBatchItem,
+    KeywordAudioBatchRequest,
+    KeywordAudioBatchResponse,
     KeywordAudioResponse,
+    KeywordBulkCreate,
+    KeywordBulkCreateResponse,
+    KeywordBulkItemResult,
+    KeywordChangesResponse,
     KeywordCreate,
     KeywordRead,
     KeywordReadDetailed,
+    KeywordSearchHit,
     KeywordUpdate,
 )
 from app.services import KeywordContentGenerator, KeywordService
+from app.services.keyword_service import project_fields
 
 router = APIRouter(prefix="/keywords", tags=["keywords"])
 
+# Precompiled encoders for the hot read paths; see app.core.serialization
+KEYWORD_DETAIL_ADAPTER = TypeAdapter(KeywordReadDetailed)
+KEYWORD_LIST_ADAPTER = TypeAdapter(List[KeywordRead])
+KEYWORD_AUDIO_ADAPTER = TypeAdapter(KeywordAudioResponse)
+KEYWORD_SEARCH_ADAPTER = TypeAdapter(List[KeywordSearchHit])
+
+# Postgres error code raised when a write violates a unique constraint
+UNIQUE_VIOLATION = "23505"
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated list of fields to return, e.g. `name,pictogram_url`",
+)
+
+
+def _parse_fields(
+    fields: Optional[str], schema: Type[BaseModel]
+) -> Optional[List[str]]:
+    """
+    Parse a `fields=` query parameter into a list of field names.
+
+    Returns None when no projection was requested. Unknown names are
+    rejected with a 400 so typos do not silently return empty objects.
+    """
+    if not fields:
+        return None
+    requested = list(
+        dict.fromkeys(field.strip() for field in fields.split(",") if field.strip())
+    )
+    unknown = [field for field in requested if field not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    return requested or None
+
+
+def _raise_for_name_conflict(error: APIError, name: Optional[str]) -> None:
+    """Turn a unique violation on keywords.name into a 400 response."""
+    if error.code == UNIQUE_VIOLATION:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Keyword with name '{name}' already exists",
+        )
+
+
+async def _schedule_generation(
+    keywords: List[Keyword],
+    queue: Optional[GenerationQueue],
+    background_tasks: BackgroundTasks,
+    content_generator: KeywordContentGenerator,
+) -> None:
+    """
+    Queue content generation for new keywords for the worker, or, with the
+    queue disabled, run it as an in-process background task.
+    """
+    if queue is not None:
+        await asyncio.to_thread(queue.enqueue, keywords)
+    elif len(keywords) == 1:
+        background_tasks.add_task(
+            content_generator.generate_content_for_keyword, keywords[0]
+        )
+    else:
+        background_tasks.add_task(
+            content_generator.generate_content_for_keywords, keywords
+        )
+
+
+def _conditional_response(
+    request: Request,
+    items: List[Any],
+    content: Any,
+    cache_control: str,
+    adapter: Optional[TypeAdapter] = None,
+    variant: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    collection: bool = False,
+) -> Response:
+    """
+    Attach cache validators to a read response and honor conditional requests.
+
+    Returns a bodiless 304 when the client's copy is still current. Otherwise
+    encodes `content` straight to JSON, shaped by `adapter` (the route's
+    response model) or as-is for `fields=` projections. A `collection` is
+    validated by its ETag only, without Last-Modified, which deletions from
+    it would not advance.
+    """
+    etag = compute_etag(items, variant)
+    last_modified = None if collection else compute_last_modified(items)
+    headers = {**(headers or {}), **cache_headers(etag, last_modified, cache_control)}
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return fast_json_response(content, adapter, headers=headers)
+
 
 @router.post("/", response_model=KeywordRead, status_code=status.HTTP_201_CREATED)
 async def create_keyword(
@@ -22,105 +157,324 @@ async def create_keyword(
     background_tasks: BackgroundTasks,
     keyword_service: KeywordService = Depends(get_keyword_service),
     content_generator: KeywordContentGenerator = Depends(get_keyword_content_generator),
+    queue: Optional[GenerationQueue] = Depends(get_generation_queue),
 ):
     """
     Create a new keyword.
 
-    Also generates pictograms, selects the best one, generates voice clips,
-    and stores all the information in Supabase.
+    Also queues the generation of its pictogram and voice clips; follow it
+    with GET /keywords/{keyword_id}/generation.
     """
-    # Check if keyword with this name already exists
-    db_keyword = keyword_service.get_by_name(keyword.name)
-    if db_keyword:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Keyword with name '{keyword.name}' already exists",
-        )
-
-    # Create the keyword first
-    db_keyword = keyword_service.create(keyword)
+    # Create the keyword first; the unique constraint on name rejects duplicates
+    try:
+        db_keyword = await keyword_service.create(keyword)
+    except APIError as e:
+        _raise_for_name_conflict(e, keyword.name)
+        raise
     if not db_keyword:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create keyword in database",
         )
 
-    # Generate content in the background
-    background_tasks.add_task(
-        content_generator.generate_content_for_keyword, db_keyword
-    )
+    await _schedule_generation([db_keyword], queue, background_tasks, content_generator)
 
     return db_keyword
 
 
+@router.post("/bulk", response_model=KeywordBulkCreateResponse)
+async def bulk_create_keywords(
+    request: KeywordBulkCreate,
+    background_tasks: BackgroundTasks,
+    keyword_service: KeywordService = Depends(get_keyword_service),
+    content_generator: KeywordContentGenerator = Depends(get_keyword_content_generator),
+    queue: Optional[GenerationQueue] = Depends(get_generation_queue),
+):
+    """
+    Create many keywords in one request.
+
+    Valid items are inserted with a single upsert; names that already exist
+    are left untouched and reported as `existing`. Invalid items and
+    duplicate names within the request are reported as `failed`. Content
+    generation is queued for every newly created keyword.
+    """
+    if len(request.items) > settings.KEYWORD_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.KEYWORD_BULK_MAX_ITEMS} keywords per request",
+        )
+
+    results: List[KeywordBulkItemResult] = []
+    valid: Dict[str, KeywordCreate] = {}
+    for index, item in enumerate(request.items):
+        try:
+            keyword = KeywordCreate.model_validate(item)
+        except ValidationError as e:
+            results.append(
+                KeywordBulkItemResult(
+                    index=index,
+                    name=item.get("name")
+                    if isinstance(item.get("name"), str)
+                    else None,
+                    status="failed",
+                    error="; ".join(
+                        f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                        for err in e.errors()
+                    ),
+                )
+            )
+            continue
+
+        if keyword.name in valid:
+            results.append(
+                KeywordBulkItemResult(
+                    index=index,
+                    name=keyword.name,
+                    status="failed",
+                    error="Duplicate name in request",
+                )
+            )
+            continue
+
+        valid[keyword.name] = keyword
+        results.append(
+            KeywordBulkItemResult(index=index, name=keyword.name, status="existing")
+        )
+
+    created: List[Keyword] = []
+    error = None
+    try:
+        created = await keyword_service.bulk_create(list(valid.values()))
+    except APIError as e:
+        error = e.message or str(e)
+
+    created_by_name = {keyword.name: keyword for keyword in created}
+    for result in results:
+        if result.status != "existing":
+            continue
+        if error:
+            result.status = "failed"
+            result.error = error
+        elif result.name in created_by_name:
+            result.status = "created"
+            result.id = created_by_name[result.name].id
+
+    if created:
+        await _schedule_generation(created, queue, background_tasks, content_generator)
+
+    return KeywordBulkCreateResponse(
+        results=results,
+        created=sum(result.status == "created" for result in results),
+        existing=sum(result.status == "existing" for result in results),
+        failed=sum(result.status == "failed" for result in results),
+    )
+
+
+@router.get("/export")
+async def export_keywords(
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+    keyword_service: KeywordService = Depends(get_keyword_service),
+):
+    """
+    Stream the whole keyword catalog as NDJSON for offline use.
+
+    Each line is a keyword with its voice URLs and `updated_at`. Rows are read
+    from Supabase page by page while the response is being sent, so memory
+    stays constant and the first lines go out before the last page is fetched.
+    """
+    body = ndjson_chunks(
+        keyword_service.iter_catalog(page_size=settings.KEYWORD_EXPORT_PAGE_SIZE)
+    )
+    headers = {"Content-Disposition": 'attachment; filename="keywords.ndjson"'}
+    if gzip:
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/changes", response_model=KeywordChangesResponse)
+async def list_keyword_changes(
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1),
+    keyword_service: KeywordService = Depends(get_keyword_service),
+):
+    """
+    Delta sync: keywords upserted and ids deleted at or after `since`.
+
+    Pass `next_cursor` back as `cursor` (without `since`) until it is None,
+    then use `next_since` as `since` for the next sync. `next_since` lags the
+    newest change by up to a minute so late commits are not missed; changes
+    in that window come again and must be applied idempotently. `limit`
+    applies to each of `upserted` and `deleted` and is capped at
+    KEYWORD_PAGE_MAX_LIMIT.
+    """
+    limit = min(limit, settings.KEYWORD_PAGE_MAX_LIMIT)
+    try:
+        return await keyword_service.list_changes(
+            since=since, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/search", response_model=List[KeywordSearchHit])
+async def search_keywords(
+    q: str = Query(..., min_length=1, description="Text to search for"),
+    limit: int = Query(20, ge=1),
+    language: Optional[str] = None,
+    full_text: bool = Query(False, description="Also match descriptions"),
+    keyword_service: KeywordService = Depends(get_keyword_service),
+):
+    """
+    Search keywords by name, best matches first.
+
+    Exact and prefix matches rank above substrings, then typo-tolerant
+    matches. Type-ahead queries are answered from an in-process index;
+    `full_text` searches descriptions too and is answered by Postgres.
+    `limit` is capped at KEYWORD_SEARCH_MAX_LIMIT.
+    """
+    limit = min(limit, settings.KEYWORD_SEARCH_MAX_LIMIT)
+    hits = await keyword_service.search(
+        q, limit=limit, language=language, full_text=full_text
+    )
+    return fast_json_response(hits, KEYWORD_SEARCH_ADAPTER)
+
+
+@router.get("/stats", response_model=Dict[str, Any])
+async def get_keyword_read_stats(
+    keyword_service: KeywordService = Depends(get_keyword_service),
+):
+    """
+    Counters of this process's keyword read path: cache hits and misses, and
+    how many concurrent identical lookups were coalesced into one fetch.
+    """
+    return keyword_service.stats()
+
+
 @router.get("/{keyword_id}", response_model=KeywordReadDetailed)
-def get_keyword(
-    keyword_id: int, keyword_service: KeywordService = Depends(get_keyword_service)
+async def get_keyword(
+    keyword_id: int,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
+    keyword_service: KeywordService = Depends(get_keyword_service),
 ):
     """Get a keyword by ID with detailed information including audio data."""
-    db_keyword = keyword_service.get_by_id(keyword_id)
+    requested = _parse_fields(fields, KeywordReadDetailed)
+    db_keyword = await keyword_service.get_detailed_by_id(keyword_id)
     if not db_keyword:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Keyword with ID {keyword_id} not found",
         )
 
-    # Convert to dictionary to properly handle the audio relationship
-    result = _prepare_keyword_response(db_keyword)
-    return result
+    return _conditional_response(
+        request,
+        [db_keyword],
+        project_fields(db_keyword, requested),
+        settings.CACHE_CONTROL_KEYWORD_DETAIL,
+        adapter=None if requested else KEYWORD_DETAIL_ADAPTER,
+        variant=",".join(requested or []),
+    )
+
+
+@router.get("/{keyword_id}/generation", response_model=GenerationJobRead)
+async def get_keyword_generation(
+    keyword_id: int,
+    queue: Optional[GenerationQueue] = Depends(get_generation_queue),
+):
+    """
+    Status of the keyword's latest content generation job: overall status,
+    the status of each stage, attempts so far and the last error.
+    """
+    job = (
+        await asyncio.to_thread(queue.latest_for_keyword, keyword_id)
+        if queue is not None
+        else None
+    )
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No generation job for keyword with ID {keyword_id}",
+        )
+    return job
 
 
 @router.get("/", response_model=List[KeywordRead])
-def list_keywords(
-    skip: int = 0,
-    limit: int = 100,
+async def list_keywords(
+    request: Request,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0),
+    fields: Optional[str] = FIELDS_QUERY,
     keyword_service: KeywordService = Depends(get_keyword_service),
 ):
-    """Get a paginated list of keywords from Supabase."""
-    return keyword_service.list(skip=skip, limit=limit)
+    """
+    Get a page of keywords from Supabase.
+
+    Pages are ordered by id. Pass the `X-Next-Cursor` response header back as
+    `cursor` to fetch the next page; the header is absent on the last page.
+    `skip` selects the legacy offset pagination and is kept for older clients.
+    `limit` is capped at KEYWORD_PAGE_MAX_LIMIT. `fields` restricts both the
+    columns fetched from the database and the serialized response.
+    """
+    limit = min(limit, settings.KEYWORD_PAGE_MAX_LIMIT)
+    requested = _parse_fields(fields, KeywordRead)
+
+    next_cursor = None
+    try:
+        if skip is not None:
+            rows = await keyword_service.list_rows(
+                skip=skip, limit=limit, columns=requested
+            )
+        else:
+            rows, next_cursor = await keyword_service.list_page_rows(
+                limit=limit, cursor=cursor, columns=requested
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return _conditional_response(
+        request,
+        rows,
+        [project_fields(row, requested) for row in rows],
+        settings.CACHE_CONTROL_KEYWORD_LIST,
+        adapter=None if requested else KEYWORD_LIST_ADAPTER,
+        variant=f"{','.join(requested or [])}|{next_cursor}",
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
+        collection=True,
+    )
 
 
 @router.patch("/{keyword_id}", response_model=KeywordRead)
-def update_keyword(
+async def update_keyword(
     keyword_id: int,
     keyword: KeywordUpdate,
     keyword_service: KeywordService = Depends(get_keyword_service),
 ):
     """Update a keyword in Supabase by ID."""
-    # Check if keyword exists
-    db_keyword = keyword_service.get_by_id(keyword_id)
-    if not db_keyword:
+    # A single UPDATE ... RETURNING: no row back means the id does not exist,
+    # and the unique constraint on name rejects renames onto an existing name
+    try:
+        updated_keyword = await keyword_service.update(keyword_id, keyword)
+    except APIError as e:
+        _raise_for_name_conflict(e, keyword.name)
+        raise
+    if not updated_keyword:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Keyword with ID {keyword_id} not found",
         )
 
-    # Check if updating name and new name already exists
-    if keyword.name and keyword.name != db_keyword.name:
-        existing_keyword = keyword_service.get_by_name(keyword.name)
-        if existing_keyword and existing_keyword.id != keyword_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Keyword with name '{keyword.name}' already exists",
-            )
-
-    # Update the keyword
-    updated_keyword = keyword_service.update(keyword_id, keyword)
-    if not updated_keyword:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update keyword with ID {keyword_id}",
-        )
-
     return updated_keyword
 
 
 @router.delete("/{keyword_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_keyword(
+async def delete_keyword(
     keyword_id: int, keyword_service: KeywordService = Depends(get_keyword_service)
 ):
     """Delete a keyword from Supabase by ID."""
-    success = keyword_service.delete(keyword_id)
+    success = await keyword_service.delete(keyword_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -130,25 +484,36 @@ def delete_keyword(
 
 
 @router.get("/name/{name}", response_model=KeywordReadDetailed)
-def get_keyword_by_name(
-    name: str, keyword_service: KeywordService = Depends(get_keyword_service)
+async def get_keyword_by_name(
+    name: str,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
+    keyword_service: KeywordService = Depends(get_keyword_service),
 ):
     """Get a keyword by name with detailed information including audio data."""
-    db_keyword = keyword_service.get_by_name(name)
+    requested = _parse_fields(fields, KeywordReadDetailed)
+    db_keyword = await keyword_service.get_detailed_by_name(name)
     if not db_keyword:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Keyword with name '{name}' not found",
         )
 
-    # Convert to dictionary to properly handle the audio relationship
-    result = _prepare_keyword_response(db_keyword)
-    return result
+    return _conditional_response(
+        request,
+        [db_keyword],
+        project_fields(db_keyword, requested),
+        settings.CACHE_CONTROL_KEYWORD_DETAIL,
+        adapter=None if requested else KEYWORD_DETAIL_ADAPTER,
+        variant=",".join(requested or []),
+    )
 
 
 @router.get("/audio/{name}", response_model=KeywordAudioResponse)
-def get_keyword_with_audio(
-    name: str, keyword_service: KeywordService = Depends(get_keyword_service)
+async def get_keyword_with_audio(
+    name: str,
+    request: Request,
+    keyword_service: KeywordService = Depends(get_keyword_service),
 ):
     """
     Get a keyword by name with simplified format and audio URLs.
@@ -156,43 +521,48 @@ def get_keyword_with_audio(
     Returns only essential fields: id, name, language, pictogram_url, audio_id,
     and the voice URLs extracted from the audio record.
     """
-    result = keyword_service.get_keyword_with_audio_urls(name)
+    result = await keyword_service.get_keyword_with_audio_urls(name)
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Keyword with name '{name}' not found",
         )
 
-    return result
+    return _conditional_response(
+        request,
+        [result],
+        result,
+        settings.CACHE_CONTROL_KEYWORD_AUDIO,
+        adapter=KEYWORD_AUDIO_ADAPTER,
+    )
 
 
-def _prepare_keyword_response(keyword) -> Dict:
-    """
-    Prepare a keyword response with properly formatted audio data.
-    This prevents RelationshipInfo validation errors.
+@router.post("/audio:batch", response_model=KeywordAudioBatchResponse)
+async def get_keywords_with_audio_batch(
+    request: KeywordAudioBatchRequest,
+    keyword_service: KeywordService = Depends(get_keyword_service),
+):
     """
-    # Convert to dictionary
-    data = keyword.model_dump()
+    Resolve many keyword names with their audio URLs in one request.
 
-    # Handle audio explicitly
-    if hasattr(keyword, "audio") and keyword.audio is not None:
-        # Check if it's a proper Audio model instance
-        if isinstance(keyword.audio, Audio):
-            # Convert Audio model to dict
-            data["audio"] = {
-                "id": keyword.audio.id,
-                "keyword_id": keyword.audio.keyword_id,
-                "created_at": keyword.audio.created_at,
-                "voice_man": keyword.audio.voice_man,
-                "voice_woman": keyword.audio.voice_woman,
-            }
-        elif isinstance(keyword.audio, dict):
-            # Use the dictionary directly
-            data["audio"] = keyword.audio
-        else:
-            # Set to None if it's some other unexpected type
-            data["audio"] = None
-    else:
-        data["audio"] = None
+    Results are returned in the order of `names`. Names that do not exist
+    (or do not match `language`) are reported with `found: false` and are
+    also listed in `missing`.
+    """
+    if len(request.names) > settings.KEYWORD_BATCH_MAX_NAMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.KEYWORD_BATCH_MAX_NAMES} names per request",
+        )
 
-    return data
+    resolved = await keyword_service.get_keywords_with_audio_urls(
+        request.names, language=request.language
+    )
+    results = [
+        KeywordAudioBatchItem(name=name, found=keyword is not None, keyword=keyword)
+        for name, keyword in zip(request.names, resolved)
+    ]
+    return KeywordAudioBatchResponse(
+        results=results,
+        missing=[item.name for item in results if not item.found],
+    )
@@ -1,8 +1,9 @@
-
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from app.core.deps import get_executors
+from app.core.executors import StageExecutors
 from app.services.pictogram_generator_ideogram import generate_pictogram_ideogram
 
 
@@ -26,7 +27,10 @@ router = APIRouter(prefix="/pictogram", tags=["pictogram"])
 @router.post(
     "/generate/ideogram", response_model=PictogramResponse, tags=["generation"]
 )
-async def generate_ideogram_pictogram(request: PictogramRequest):
+async def generate_ideogram_pictogram(
+    request: PictogramRequest,
+    executors: StageExecutors = Depends(get_executors),
+):
     """
     Generate pictograms using Ideogram AI.
 
@@ -40,7 +44,9 @@ async def generate_ideogram_pictogram(request: PictogramRequest):
                 detail="Keyword cannot be empty",
             )
 
-        result = generate_pictogram_ideogram(keyword=request.keyword)
+        result = await executors.run_provider(
+            "ideogram", generate_pictogram_ideogram, keyword=request.keyword
+        )
 
         return PictogramResponse(
             success=True,
@@ -59,7 +65,10 @@ async def generate_ideogram_pictogram(request: PictogramRequest):
 
 
 @router.post("/generate/four", response_model=PictogramResponse, tags=["generation"])
-async def generate_four_pictograms(request: PictogramRequest):
+async def generate_four_pictograms(
+    request: PictogramRequest,
+    executors: StageExecutors = Depends(get_executors),
+):
     """
     Generate four pictograms for a keyword.
 
@@ -73,7 +82,9 @@ async def generate_four_pictograms(request: PictogramRequest):
                 detail="Keyword cannot be empty",
             )
 
-        result = generate_pictogram_ideogram(keyword=request.keyword)
+        result = await executors.run_provider(
+            "ideogram", generate_pictogram_ideogram, keyword=request.keyword
+        )
 
         return PictogramResponse(
             success=True,
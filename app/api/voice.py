@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
 
+from app.core.deps import get_executors
+from app.core.executors import StageExecutors
 from app.models import Voice
 from app.services.voice_generator import generate_voice
 
@@ -13,6 +15,7 @@ async def generate_voice_endpoint(
     voice: Voice = Query(
         ..., description="Voice type: MAN, WOMAN, MAN_FLEMISH, or WOMAN_FLEMISH"
     ),
+    executors: StageExecutors = Depends(get_executors),
 ):
     """
     Generate voice audio for the provided text using the specified voice type.
@@ -27,7 +30,9 @@ async def generate_voice_endpoint(
     """
     try:
         # Generate voice and get file path
-        audio_path = generate_voice(text, voice)
+        audio_path = await executors.run_provider(
+            "elevenlabs", generate_voice, text, voice
+        )
 
         if not audio_path:
             raise HTTPException(
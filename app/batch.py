@@ -0,0 +1,143 @@
+"""
+Generate content for a whole vocabulary from the command line.
+
+    python -m app.batch core_vocabulary.txt
+    python -m app.batch words.csv --language nl --concurrency 8 \
+        --provider-concurrency ideogram=4 --provider-concurrency elevenlabs=6
+    python -m app.batch words.txt --no-worker
+
+The keywords are queued as one batch on the generation queue, which must be
+enabled (GENERATION_QUEUE_ENABLED). The command then runs a generation
+worker (app.worker) until the batch is done, or leaves the batch to the
+running workers with --no-worker. Keywords that already have a pictogram
+and both voice clips are skipped, so running the same file again resumes an
+interrupted batch. See app.services.vocabulary_batch for the file formats.
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.container import ServiceContainer
+from app.core.job_queue import RUNNING
+from app.services.keyword_content_generator import PROVIDERS
+from app.services.vocabulary_batch import (
+    VOCABULARY_FORMATS,
+    enqueue_vocabulary,
+    parse_vocabulary,
+)
+from app.worker import GenerationWorker
+
+# Seconds between progress reports while the batch runs
+_PROGRESS_SECONDS = 10.0
+
+
+def _provider_limits(values: List[str]) -> Dict[str, int]:
+    """Parse repeated PROVIDER=N options."""
+    limits = {}
+    for value in values:
+        provider, _, limit = value.partition("=")
+        if provider not in PROVIDERS or not limit.isdigit() or int(limit) < 1:
+            raise argparse.ArgumentTypeError(
+                f"Expected PROVIDER=N with PROVIDER one of {', '.join(PROVIDERS)}, "
+                f"got {value!r}"
+            )
+        limits[provider] = int(limit)
+    return limits
+
+
+async def run_batch(args: argparse.Namespace) -> Dict:
+    path = Path(args.vocabulary)
+    fmt = args.format or path.suffix.lstrip(".").lower()
+    keywords = parse_vocabulary(path.read_text(), fmt, args.language)
+
+    services = await ServiceContainer.create()
+    try:
+        queue = services.generation_queue
+        if queue is None:
+            raise SystemExit("Vocabulary batches need GENERATION_QUEUE_ENABLED=true")
+        progress = await enqueue_vocabulary(
+            services.keyword_service, queue, keywords, name=path.name
+        )
+        if args.no_worker:
+            return progress
+
+        worker = GenerationWorker(
+            queue,
+            services.content_generator,
+            concurrency=args.concurrency,
+            poll_seconds=settings.GENERATION_WORKER_POLL_SECONDS,
+            job_timeout_seconds=settings.GENERATION_JOB_TIMEOUT_SECONDS,
+        )
+        task = asyncio.create_task(worker.run())
+        try:
+            while progress["status"] == RUNNING and not task.done():
+                await asyncio.wait({task}, timeout=_PROGRESS_SECONDS)
+                progress = await asyncio.to_thread(queue.batch_progress, progress["id"])
+                logger.info(
+                    f"Vocabulary batch {progress['id']}: "
+                    f"{progress['done']}/{progress['jobs']} jobs "
+                    f"({progress['keywords_per_minute']} keywords/min, "
+                    f"{progress['failed']} failed)"
+                )
+        finally:
+            worker.stop()
+            await task
+        return progress
+    finally:
+        await services.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate pictograms and voice clips for a vocabulary file."
+    )
+    parser.add_argument("vocabulary", help="vocabulary file (.txt, .csv or .json)")
+    parser.add_argument(
+        "--format",
+        choices=VOCABULARY_FORMATS,
+        help="file format (default: from the file extension)",
+    )
+    parser.add_argument(
+        "--language", default="en", help="language of words that set none"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.GENERATION_WORKER_CONCURRENCY,
+        help="keywords the worker generates at the same time",
+    )
+    parser.add_argument(
+        "--no-worker",
+        action="store_true",
+        help="only queue the batch; the running workers generate it",
+    )
+    parser.add_argument(
+        "--provider-concurrency",
+        action="append",
+        default=[],
+        metavar="PROVIDER=N",
+        help=f"calls in flight per provider ({', '.join(PROVIDERS)}); repeatable",
+    )
+    args = parser.parse_args()
+    try:
+        limits = _provider_limits(args.provider_concurrency)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    # Read by the ServiceContainer when it builds the content generator
+    settings.GENERATION_PROVIDER_CONCURRENCY = {
+        **settings.GENERATION_PROVIDER_CONCURRENCY,
+        **limits,
+    }
+
+    progress = asyncio.run(run_batch(args))
+    print(json.dumps(progress, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,44 @@
 from .config import settings
-from .db import SupabaseCRUD, get_supabase_client
-from .deps import get_audio_service, get_keyword_content_generator, get_keyword_service
+from .db import (
+    AsyncSupabaseCRUD,
+    SupabaseCRUD,
+    close_async_supabase_client,
+    close_supabase_client,
+    get_async_supabase_client,
+    get_supabase_client,
+)
+from .deps import (
+    get_audio_service,
+    get_executors,
+    get_generation_queue,
+    get_keyword_content_generator,
+    get_keyword_service,
+    get_services,
+    require_admin_key,
+)
+from .postgres_db import AsyncPostgresCRUD, PostgresCRUD
+from .sqlite_db import AsyncSQLiteCRUD, SQLiteCRUD
+from .storage import AsyncStorageBackend, StorageBackend
 
 __all__ = [
     "settings",
     "get_keyword_service",
     "get_audio_service",
     "get_keyword_content_generator",
+    "get_services",
+    "require_admin_key",
+    "get_executors",
+    "get_generation_queue",
     "get_supabase_client",
+    "close_supabase_client",
+    "get_async_supabase_client",
+    "close_async_supabase_client",
     "SupabaseCRUD",
+    "AsyncSupabaseCRUD",
+    "StorageBackend",
+    "AsyncStorageBackend",
+    "SQLiteCRUD",
+    "AsyncSQLiteCRUD",
+    "PostgresCRUD",
+    "AsyncPostgresCRUD",
 ]
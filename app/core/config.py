@@ -1,7 +1,7 @@
 import importlib
 import json
 import os
-from typing import List, Union
+from typing import Dict, List, Literal, Optional, Union
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -37,6 +37,112 @@ class Settings(BaseSettings):
     # Database - Supabase
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
+    SUPABASE_POSTGREST_TIMEOUT: float = 10.0
+
+    # Storage backend: "supabase" (PostgREST over HTTPS), "postgres" for a
+    # pooled direct connection to the same database (DATABASE_URL), or "sqlite"
+    # for an in-process database used for network-free local development and
+    # benchmarks (":memory:" keeps nothing on disk)
+    STORAGE_BACKEND: Literal["supabase", "postgres", "sqlite"] = "supabase"
+    SQLITE_DATABASE_PATH: str = ":memory:"
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    POSTGRES_POOL_MIN_SIZE: int = 1
+    POSTGRES_POOL_MAX_SIZE: int = 10
+    # Run the hot keyword reads as server-side prepared statements. They need
+    # a direct or session-pooled connection; unset, they are turned off for
+    # Supabase's transaction pooler (port 6543), where PREPARE breaks.
+    POSTGRES_PREPARED_STATEMENTS: Optional[bool] = None
+    # Apply pending migrations/ over DATABASE_URL when the API starts
+    RUN_MIGRATIONS_ON_STARTUP: bool = False
+
+    # Worker pools for blocking generation work (see app.core.executors):
+    # threads per AI provider and for uploads/storage writes, processes
+    # for CPU-bound image processing (0 runs it in a single thread instead).
+    # Each image process loads its own rembg session (onnxruntime and the
+    # u2net model), several hundred MB of memory, on its first image: keep
+    # it at 1 on the 2 GB VMs and raise it only with the memory to match.
+    EXECUTOR_PROVIDER_THREADS: int = 8
+    EXECUTOR_STORAGE_THREADS: int = 8
+    EXECUTOR_IMAGE_PROCESSES: int = 1
+
+    # Durable content generation queue (see app.core.job_queue), processed by
+    # `python -m app.worker`; only enable it where a worker runs (fly.toml
+    # does). "postgres" uses the generation_jobs table behind DATABASE_URL;
+    # "sqlite" keeps it in a local file shared by the API and a worker on the
+    # same machine, for development. When disabled, the API generates in
+    # in-process background tasks.
+    GENERATION_QUEUE_ENABLED: bool = False
+    GENERATION_QUEUE_BACKEND: Literal["sqlite", "postgres"] = "postgres"
+    GENERATION_QUEUE_SQLITE_PATH: str = "generation_jobs.db"
+    GENERATION_MAX_ATTEMPTS: int = 5
+    GENERATION_RETRY_BASE_SECONDS: float = 30.0
+    GENERATION_RETRY_MAX_SECONDS: float = 1800.0
+    # Keywords each worker process generates at the same time
+    GENERATION_WORKER_CONCURRENCY: int = 4
+    GENERATION_WORKER_POLL_SECONDS: float = 2.0
+    # Running jobs not finished within this time are requeued (lost worker)
+    GENERATION_JOB_TIMEOUT_SECONDS: float = 900.0
+
+    # Calls in flight per AI provider across all keywords being generated,
+    # e.g. {"ideogram": 4, "elevenlabs": 6} (JSON in the environment)
+    GENERATION_PROVIDER_CONCURRENCY: Dict[str, int] = {}
+    # Token bucket per AI provider (see app.core.rate_limit), shared by every
+    # call to it in the process; providers not listed are only slowed down by
+    # their 429 responses. Rates halve on a 429 and recover on success.
+    PROVIDER_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+        "ideogram": {"requests_per_minute": 20, "burst": 4},
+        "openai": {"requests_per_minute": 60, "burst": 10},
+        "elevenlabs": {"requests_per_minute": 120, "burst": 10},
+    }
+    # Retries of a call rejected with 429, after its Retry-After or an
+    # exponential backoff capped at PROVIDER_BACKOFF_MAX_SECONDS
+    PROVIDER_RATE_LIMIT_RETRIES: int = 3
+    PROVIDER_BACKOFF_MAX_SECONDS: float = 60.0
+
+    # Keyword read cache (per process)
+    KEYWORD_CACHE_ENABLED: bool = True
+    KEYWORD_CACHE_MAX_SIZE: int = 5000
+    KEYWORD_CACHE_TTL_SECONDS: float = 300.0
+    # How long a name lookup that found nothing is remembered (0 disables).
+    # Kept short: creating or renaming to the name also drops the entry.
+    KEYWORD_NEGATIVE_CACHE_TTL_SECONDS: float = 30.0
+
+    # How far delta sync's next_since trails the present, so writes that
+    # commit late with an earlier updated_at are still returned
+    KEYWORD_CHANGES_SAFETY_LAG_SECONDS: float = 60.0
+
+    # Preloaded in-memory catalog of every keyword with its audio URLs, loaded
+    # at startup and refreshed from the delta-sync change stream; it answers
+    # audio lookups only. Each refresh re-reads the overlap window before its
+    # position, for writes committed late, and everything is reloaded every
+    # KEYWORD_CATALOG_FULL_RELOAD_SECONDS (0 disables) to bound any drift.
+    KEYWORD_CATALOG_ENABLED: bool = False
+    KEYWORD_CATALOG_REFRESH_SECONDS: float = 10.0
+    KEYWORD_CATALOG_REFRESH_OVERLAP_SECONDS: float = 60.0
+    KEYWORD_CATALOG_FULL_RELOAD_SECONDS: float = 3600.0
+
+    # Cache-Control sent with keyword reads (ETag/Last-Modified allow 304s)
+    CACHE_CONTROL_KEYWORD_DETAIL: str = "public, max-age=60"
+    CACHE_CONTROL_KEYWORD_AUDIO: str = "public, max-age=300"
+    CACHE_CONTROL_KEYWORD_LIST: str = "public, max-age=30"
+
+    # Hard cap on the page size of keyword list endpoints
+    KEYWORD_PAGE_MAX_LIMIT: int = 500
+
+    # Maximum number of names accepted by the batch audio lookup
+    KEYWORD_BATCH_MAX_NAMES: int = 200
+
+    # Maximum number of keywords accepted by the bulk create endpoint
+    KEYWORD_BULK_MAX_ITEMS: int = 1000
+
+    # Rows fetched per Supabase request while streaming the catalog export
+    KEYWORD_EXPORT_PAGE_SIZE: int = 500
+
+    # In-process search index over the catalog; when disabled, searches go to
+    # the search_keywords Postgres function
+    KEYWORD_SEARCH_INDEX_ENABLED: bool = True
+    KEYWORD_SEARCH_INDEX_TTL_SECONDS: float = 300.0
+    KEYWORD_SEARCH_MAX_LIMIT: int = 50
 
     # CORS
     BACKEND_CORS_ORIGINS: Union[List[str], str] = ["*"]
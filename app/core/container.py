@@ -0,0 +1,179 @@
+"""
+Process-wide service container.
+
+Builds the Supabase, OpenAI and Digital Ocean clients once and shares them
+between all request dependencies, so connection pools and TLS sessions are
+reused instead of being recreated per request. Blocking generation work
+runs on the container's stage executors. The API's keyword reads use
+the async storage backend; the sync one backs the background generation.
+With STORAGE_BACKEND=postgres both share one Postgres connection pool, and
+with STORAGE_BACKEND=sqlite one in-process SQLite database.
+"""
+
+from typing import Optional
+
+from loguru import logger
+from supabase import AsyncClient, Client
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.db import (
+    AsyncSupabaseCRUD,
+    SupabaseCRUD,
+    close_async_supabase_client,
+    close_supabase_client,
+    get_async_supabase_client,
+    get_supabase_client,
+)
+from app.core.executors import StageExecutors
+from app.core.job_queue import GenerationQueue, create_generation_queue
+from app.core.postgres_db import AsyncPostgresCRUD, PostgresCRUD
+from app.core.sqlite_db import AsyncSQLiteCRUD, SQLiteCRUD
+from app.core.storage import AsyncStorageBackend, StorageBackend
+from app.services.audio_service import AudioService
+from app.services.do_bucket import DOSpacesClient
+from app.services.image_judge import ImageJudge
+from app.services.keyword_catalog import KeywordCatalog
+from app.services.keyword_content_generator import KeywordContentGenerator
+from app.services.keyword_service import KeywordService
+
+
+class ServiceContainer:
+    """Holds the long-lived clients and services used by the API."""
+
+    def __init__(
+        self,
+        crud: StorageBackend,
+        async_crud: AsyncStorageBackend,
+        supabase_client: Optional[Client] = None,
+        async_supabase_client: Optional[AsyncClient] = None,
+    ):
+        self.crud = crud
+        self.async_crud = async_crud
+        self.supabase_client = supabase_client
+        self.async_supabase_client = async_supabase_client
+        self.image_judge = ImageJudge()
+        self.do_client = DOSpacesClient()
+        self.executors = StageExecutors(
+            provider_threads=settings.EXECUTOR_PROVIDER_THREADS,
+            storage_threads=settings.EXECUTOR_STORAGE_THREADS,
+            image_processes=settings.EXECUTOR_IMAGE_PROCESSES,
+        )
+
+        self.keyword_cache = (
+            TTLCache(
+                max_size=settings.KEYWORD_CACHE_MAX_SIZE,
+                ttl_seconds=settings.KEYWORD_CACHE_TTL_SECONDS,
+            )
+            if settings.KEYWORD_CACHE_ENABLED
+            else None
+        )
+
+        self.keyword_service = KeywordService(
+            crud=async_crud,
+            cache=self.keyword_cache,
+            negative_ttl_seconds=settings.KEYWORD_NEGATIVE_CACHE_TTL_SECONDS,
+            search_index_ttl_seconds=(
+                settings.KEYWORD_SEARCH_INDEX_TTL_SECONDS
+                if settings.KEYWORD_SEARCH_INDEX_ENABLED
+                else None
+            ),
+        )
+        self.keyword_catalog = (
+            KeywordCatalog(
+                self.keyword_service,
+                refresh_seconds=settings.KEYWORD_CATALOG_REFRESH_SECONDS,
+                page_size=settings.KEYWORD_EXPORT_PAGE_SIZE,
+                overlap_seconds=settings.KEYWORD_CATALOG_REFRESH_OVERLAP_SECONDS,
+                full_reload_seconds=settings.KEYWORD_CATALOG_FULL_RELOAD_SECONDS,
+            )
+            if settings.KEYWORD_CATALOG_ENABLED
+            else None
+        )
+        # Durable queue the API enqueues generation jobs on, for app.worker
+        self.generation_queue: Optional[GenerationQueue] = (
+            create_generation_queue() if settings.GENERATION_QUEUE_ENABLED else None
+        )
+        self.audio_service = AudioService(crud=crud)
+        self.content_generator = KeywordContentGenerator(
+            crud=crud,
+            image_judge=self.image_judge,
+            do_client=self.do_client,
+            keyword_cache=self.keyword_cache,
+            executors=self.executors,
+            provider_concurrency=settings.GENERATION_PROVIDER_CONCURRENCY,
+        )
+
+    @classmethod
+    async def create(cls) -> "ServiceContainer":
+        """Create a container with the storage backend chosen in Settings."""
+        logger.info(
+            f"Initializing shared service container ({settings.STORAGE_BACKEND})"
+        )
+        if settings.STORAGE_BACKEND == "sqlite":
+            crud = SQLiteCRUD(settings.SQLITE_DATABASE_PATH)
+            return cls(crud=crud, async_crud=AsyncSQLiteCRUD(crud))
+        if settings.STORAGE_BACKEND == "postgres":
+            crud = PostgresCRUD(
+                settings.DATABASE_URL,
+                min_size=settings.POSTGRES_POOL_MIN_SIZE,
+                max_size=settings.POSTGRES_POOL_MAX_SIZE,
+                prepared_statements=settings.POSTGRES_PREPARED_STATEMENTS,
+            )
+            return cls(crud=crud, async_crud=AsyncPostgresCRUD(crud))
+
+        supabase_client = get_supabase_client()
+        async_supabase_client = await get_async_supabase_client()
+        return cls(
+            crud=SupabaseCRUD(supabase_client),
+            async_crud=AsyncSupabaseCRUD(async_supabase_client),
+            supabase_client=supabase_client,
+            async_supabase_client=async_supabase_client,
+        )
+
+    async def start(self) -> None:
+        """
+        Run startup work: preload the keyword catalog when enabled. If it
+        cannot be loaded the API starts without it and reads from storage.
+        """
+        if self.keyword_catalog is None:
+            return
+        try:
+            await self.keyword_catalog.start()
+        except Exception as e:
+            logger.error(f"Keyword catalog disabled, initial load failed: {e}")
+            return
+        self.keyword_service.catalog = self.keyword_catalog
+
+    async def aclose(self) -> None:
+        """Close every pooled client held by the container."""
+        if self.keyword_catalog is not None:
+            await self.keyword_catalog.stop()
+        if self.async_supabase_client is not None:
+            try:
+                await close_async_supabase_client(self.async_supabase_client)
+            except Exception as e:
+                logger.error(f"Error closing async Supabase client: {e}")
+
+        closers = [
+            ("stage executors", self.executors.shutdown),
+            ("OpenAI", self.image_judge.client.close),
+            ("Digital Ocean Spaces", self.do_client.client.close),
+        ]
+        if self.supabase_client is not None:
+            closers.append(
+                ("Supabase", lambda: close_supabase_client(self.supabase_client))
+            )
+        if self.generation_queue is not None:
+            closers.append(("generation queue", self.generation_queue.close))
+        if isinstance(self.crud, SQLiteCRUD):
+            closers.append(("SQLite", self.crud.close))
+        if isinstance(self.crud, PostgresCRUD):
+            closers.append(("Postgres pool", self.crud.close))
+
+        for name, close in closers:
+            try:
+                close()
+            except Exception as e:
+                logger.error(f"Error closing {name} client: {e}")
+        logger.info("Shared service container closed")
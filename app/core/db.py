@@ -1,14 +1,76 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from supabase import Client, create_client
+from supabase import (
+    AsyncClient,
+    AsyncClientOptions,
+    Client,
+    ClientOptions,
+    acreate_client,
+    create_client,
+)
 
 from app.core.config import settings
 
 
 # Supabase Client
 def get_supabase_client() -> Client:
-    """Get a new Supabase client."""
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    """
+    Get a new Supabase client.
+
+    Each client owns its own keep-alive HTTP/2 connection pool, so callers
+    should create one per process and share it (see ServiceContainer).
+    """
+    options = ClientOptions(
+        postgrest_client_timeout=settings.SUPABASE_POSTGREST_TIMEOUT
+    )
+    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY, options)
+
+
+def close_supabase_client(client: Client) -> None:
+    """Close the pooled HTTP connections held by a Supabase client."""
+    client.postgrest.aclose()
+
+
+async def get_async_supabase_client() -> AsyncClient:
+    """
+    Get a new async Supabase client.
+
+    Requests made through it are awaited on the event loop instead of
+    blocking a worker thread. Like the sync client it owns a keep-alive
+    connection pool and should be shared per process.
+    """
+    options = AsyncClientOptions(
+        postgrest_client_timeout=settings.SUPABASE_POSTGREST_TIMEOUT
+    )
+    return await acreate_client(settings.SUPABASE_URL, settings.SUPABASE_KEY, options)
+
+
+async def close_async_supabase_client(client: AsyncClient) -> None:
+    """Close the pooled HTTP connections held by an async Supabase client."""
+    await client.postgrest.aclose()
+
+
+def select_clause(
+    columns: Optional[List[str]] = None, embedded: Optional[str] = None
+) -> str:
+    """
+    Build a PostgREST select clause.
+
+    `columns` restricts the fetched columns (all columns when None) and
+    `embedded` appends an embedded related resource.
+    """
+    select = ",".join(columns) if columns else "*"
+    return f"{select}, {embedded}" if embedded else select
+
+
+def keyset_after_filter(column: str, key: str, after: Tuple[str, Any]) -> str:
+    """
+    Build a PostgREST `or` filter for rows sorted after `after` by (column, key).
+
+    Values are double-quoted because timestamps contain reserved characters.
+    """
+    value, last_key = after
+    return f'{column}.gt."{value}",and({column}.eq."{value}",{key}.gt."{last_key}")'
 
 
 # CRUD operations
@@ -25,9 +87,39 @@ class SupabaseCRUD:
             return result.data[0]
         return {}
 
-    def read(self, table: str, id: int) -> Optional[Dict[str, Any]]:
+    def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str,
+        ignore_duplicates: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert many records in one statement, resolving conflicts on the
+        `on_conflict` columns.
+
+        With `ignore_duplicates` the existing rows are left untouched and only
+        the newly inserted rows are returned.
+        """
+        if not rows:
+            return []
+        return (
+            self.client.table(table)
+            .upsert(rows, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates)
+            .execute()
+            .data
+        )
+
+    def read(
+        self, table: str, id: int, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Get a record by its ID."""
-        result = self.client.table(table).select("*").eq("id", id).execute()
+        result = (
+            self.client.table(table)
+            .select(select_clause(columns))
+            .eq("id", id)
+            .execute()
+        )
         if result.data and len(result.data) > 0:
             return result.data[0]
         return None
@@ -45,30 +137,165 @@ class SupabaseCRUD:
         return len(result.data) > 0
 
     def read_all(
-        self, table: str, limit: int = 100, offset: int = 0
+        self,
+        table: str,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """Get all records from the specified table with pagination."""
         return (
             self.client.table(table)
-            .select("*")
+            .select(select_clause(columns))
             .range(offset, offset + limit - 1)
             .execute()
             .data
         )
 
+    def read_page(
+        self,
+        table: str,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get records ordered by id using keyset pagination.
+
+        Only rows with an id greater than `after_id` are returned, so the
+        database seeks straight to the page instead of skipping rows.
+        `embedded` optionally appends a related resource to each row.
+        """
+        query = self.client.table(table).select(select_clause(columns, embedded))
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        return query.order("id").limit(limit).execute().data
+
+    def read_changed_since(
+        self,
+        table: str,
+        column: str,
+        since: str,
+        limit: int = 100,
+        after: Optional[Tuple[str, Any]] = None,
+        key: str = "id",
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get records whose timestamp `column` is at or after `since`.
+
+        Rows are ordered by (`column`, `key`); `after` is the (timestamp, key)
+        of the last row already seen, so pages are read by keyset instead of
+        OFFSET. Backed by an index on (`column`, `key`).
+        """
+        query = (
+            self.client.table(table)
+            .select(select_clause(columns, embedded))
+            .gte(column, since)
+        )
+        if after is not None:
+            query = query.or_(keyset_after_filter(column, key, after))
+        return query.order(column).order(key).limit(limit).execute().data
+
     def read_filtered(
-        self, table: str, column: str, value: any
+        self,
+        table: str,
+        column: str,
+        value: any,
+        columns: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """Get records filtered by a column value."""
-        return self.client.table(table).select("*").eq(column, value).execute().data
+        return (
+            self.client.table(table)
+            .select(select_clause(columns))
+            .eq(column, value)
+            .execute()
+            .data
+        )
 
-    def read_by_name(self, table: str, name: str) -> Optional[Dict[str, Any]]:
+    def read_by_name(
+        self, table: str, name: str, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Get a record by its name column."""
-        result = self.client.table(table).select("*").eq("name", name).execute()
+        result = (
+            self.client.table(table)
+            .select(select_clause(columns))
+            .eq("name", name)
+            .execute()
+        )
         if result.data and len(result.data) > 0:
             return result.data[0]
         return None
 
+    def read_with_embedded(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        embedded: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a single record together with an embedded related resource.
+
+        `embedded` uses PostgREST resource embedding syntax, e.g.
+        ``audio:audio_files!fk_audio(*)``, so the join happens server-side
+        in the same request.
+        """
+        result = (
+            self.client.table(table)
+            .select(select_clause(columns, embedded))
+            .eq(column, value)
+            .limit(1)
+            .execute()
+        )
+        if result.data and len(result.data) > 0:
+            return result.data[0]
+        return None
+
+    def read_in(
+        self,
+        table: str,
+        column: str,
+        values: List[Any],
+        embedded: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all records whose `column` is one of `values` in a single request,
+        optionally with an embedded related resource.
+        """
+        if not values:
+            return []
+        return (
+            self.client.table(table)
+            .select(select_clause(columns, embedded))
+            .in_(column, values)
+            .execute()
+            .data
+        )
+
+    def rpc(
+        self,
+        function: str,
+        params: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Call a Postgres function that returns table rows.
+
+        `columns` and `embedded` shape the returned rows as they do for reads.
+        """
+        return (
+            self.client.rpc(function, params)
+            .select(select_clause(columns, embedded))
+            .execute()
+            .data
+        )
+
     def get_related(
         self, table: str, id: int, related_table: str, foreign_key: str
     ) -> List[Dict[str, Any]]:
@@ -80,3 +307,209 @@ class SupabaseCRUD:
             .execute()
             .data
         )
+
+
+class AsyncSupabaseCRUD:
+    """Async CRUD operations for Supabase, mirroring SupabaseCRUD."""
+
+    def __init__(self, client: AsyncClient):
+        self.client = client
+
+    async def create(self, table: str, data: dict) -> Dict[str, Any]:
+        """Create a new record in the specified table."""
+        result = await self.client.table(table).insert(data).execute()
+        if result.data and len(result.data) > 0:
+            return result.data[0]
+        return {}
+
+    async def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str,
+        ignore_duplicates: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Insert many records in one statement. See SupabaseCRUD.upsert_many."""
+        if not rows:
+            return []
+        result = (
+            await self.client.table(table)
+            .upsert(rows, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates)
+            .execute()
+        )
+        return result.data
+
+    async def read(
+        self, table: str, id: int, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its ID."""
+        result = (
+            await self.client.table(table)
+            .select(select_clause(columns))
+            .eq("id", id)
+            .execute()
+        )
+        if result.data and len(result.data) > 0:
+            return result.data[0]
+        return None
+
+    async def update(self, table: str, id: int, data: dict) -> Optional[Dict[str, Any]]:
+        """Update a record by its ID."""
+        result = await self.client.table(table).update(data).eq("id", id).execute()
+        if result.data and len(result.data) > 0:
+            return result.data[0]
+        return None
+
+    async def delete(self, table: str, id: int) -> bool:
+        """Delete a record by its ID."""
+        result = await self.client.table(table).delete().eq("id", id).execute()
+        return len(result.data) > 0
+
+    async def read_all(
+        self,
+        table: str,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records from the specified table with pagination."""
+        result = (
+            await self.client.table(table)
+            .select(select_clause(columns))
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        return result.data
+
+    async def read_page(
+        self,
+        table: str,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records ordered by id using keyset pagination."""
+        query = self.client.table(table).select(select_clause(columns, embedded))
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        result = await query.order("id").limit(limit).execute()
+        return result.data
+
+    async def read_changed_since(
+        self,
+        table: str,
+        column: str,
+        since: str,
+        limit: int = 100,
+        after: Optional[Tuple[str, Any]] = None,
+        key: str = "id",
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records changed since a timestamp. See SupabaseCRUD."""
+        query = (
+            self.client.table(table)
+            .select(select_clause(columns, embedded))
+            .gte(column, since)
+        )
+        if after is not None:
+            query = query.or_(keyset_after_filter(column, key, after))
+        result = await query.order(column).order(key).limit(limit).execute()
+        return result.data
+
+    async def read_filtered(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records filtered by a column value."""
+        result = (
+            await self.client.table(table)
+            .select(select_clause(columns))
+            .eq(column, value)
+            .execute()
+        )
+        return result.data
+
+    async def read_by_name(
+        self, table: str, name: str, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its name column."""
+        result = (
+            await self.client.table(table)
+            .select(select_clause(columns))
+            .eq("name", name)
+            .execute()
+        )
+        if result.data and len(result.data) > 0:
+            return result.data[0]
+        return None
+
+    async def read_with_embedded(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        embedded: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single record together with an embedded related resource."""
+        result = (
+            await self.client.table(table)
+            .select(select_clause(columns, embedded))
+            .eq(column, value)
+            .limit(1)
+            .execute()
+        )
+        if result.data and len(result.data) > 0:
+            return result.data[0]
+        return None
+
+    async def read_in(
+        self,
+        table: str,
+        column: str,
+        values: List[Any],
+        embedded: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records whose `column` is one of `values` in a single request."""
+        if not values:
+            return []
+        result = (
+            await self.client.table(table)
+            .select(select_clause(columns, embedded))
+            .in_(column, values)
+            .execute()
+        )
+        return result.data
+
+    async def rpc(
+        self,
+        function: str,
+        params: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Call a Postgres function that returns table rows. See SupabaseCRUD.rpc."""
+        result = (
+            await self.client.rpc(function, params)
+            .select(select_clause(columns, embedded))
+            .execute()
+        )
+        return result.data
+
+    async def get_related(
+        self, table: str, id: int, related_table: str, foreign_key: str
+    ) -> List[Dict[str, Any]]:
+        """Get related records from another table."""
+        result = (
+            await self.client.table(related_table)
+            .select("*")
+            .eq(foreign_key, id)
+            .execute()
+        )
+        return result.data
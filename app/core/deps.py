@@ -1,22 +1,63 @@
+import secrets
+from typing import Optional
 
+from fastapi import Depends, Header, HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.container import ServiceContainer
+from app.core.executors import StageExecutors
+from app.core.job_queue import GenerationQueue
 from app.services.audio_service import AudioService
 from app.services.keyword_content_generator import KeywordContentGenerator
 from app.services.keyword_service import KeywordService
 
 
+def get_services(request: Request) -> ServiceContainer:
+    """Dependency for the process-wide ServiceContainer built in the lifespan."""
+    return request.app.state.services
+
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)) -> None:
+    """Dependency rejecting requests without the ADMIN_API_KEY header."""
+    if not settings.ADMIN_API_KEY or not secrets.compare_digest(
+        x_admin_key or "", settings.ADMIN_API_KEY
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key"
+        )
+
+
 # Service dependencies
-def get_keyword_service() -> KeywordService:
+def get_keyword_service(
+    services: ServiceContainer = Depends(get_services),
+) -> KeywordService:
     """Dependency for KeywordService."""
-    return KeywordService()
+    return services.keyword_service
 
 
-def get_audio_service() -> AudioService:
+def get_audio_service(
+    services: ServiceContainer = Depends(get_services),
+) -> AudioService:
     """Dependency for AudioService."""
-    return AudioService()
+    return services.audio_service
 
 
-def get_keyword_content_generator() -> KeywordContentGenerator:
+def get_keyword_content_generator(
+    services: ServiceContainer = Depends(get_services),
+) -> KeywordContentGenerator:
     """Dependency for KeywordContentGenerator."""
-    # Note: KeywordContentGenerator will need to be updated separately
-    # to remove local database dependency
-    return KeywordContentGenerator()
+    return services.content_generator
+
+
+def get_generation_queue(
+    services: ServiceContainer = Depends(get_services),
+) -> Optional[GenerationQueue]:
+    """Dependency for the generation job queue (None when disabled)."""
+    return services.generation_queue
+
+
+def get_executors(
+    services: ServiceContainer = Depends(get_services),
+) -> StageExecutors:
+    """Dependency for the shared StageExecutors."""
+    return services.executors
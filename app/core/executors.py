@@ -0,0 +1,139 @@
+"""
+Stage executors for blocking generation work.
+
+Content generation calls blocking SDKs (requests, ElevenLabs, OpenAI, boto3)
+and CPU-heavy image code (rembg). Awaiting them from the event loop through
+these pools keeps the API responsive while a keyword is generated:
+
+- provider:<name>: threads for network-bound calls to one AI provider
+- storage: threads for uploads to Spaces and the sync storage backend
+- image: processes for CPU-bound image work, outside the GIL (each one
+  holds its own copy of the rembg model, several hundred MB)
+
+Each stage has its own pool, so a burst of one kind of work cannot starve
+the others, and none of them uses the loop's default executor that the
+async storage backends rely on for keyword reads. Every provider gets a
+pool of its own because its rate limiter (app.core.rate_limit) waits for
+tokens and 429 backoffs by sleeping in these threads: a throttled Ideogram
+then only holds Ideogram's threads, never those of ElevenLabs or OpenAI.
+"""
+
+import asyncio
+import functools
+import importlib
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+PROVIDER = "provider"
+STORAGE = "storage"
+IMAGE = "image"
+
+
+def provider_stage(provider: str) -> str:
+    """The stage whose pool runs the calls to `provider`."""
+    return f"{PROVIDER}:{provider}"
+
+
+def _init_image_worker() -> None:
+    """
+    Import the app the way the API does, app.core before app.services, so
+    pickled service functions resolve in a fresh worker process.
+    """
+    importlib.import_module("app.core")
+
+
+class StageExecutors:
+    """Separately sized thread and process pools, one per pipeline stage."""
+
+    def __init__(
+        self,
+        provider_threads: int = 8,
+        storage_threads: int = 8,
+        image_processes: int = 1,
+    ):
+        # Threads of each provider's pool, created on its first call
+        self.provider_threads = provider_threads
+        self.sizes = {
+            STORAGE: storage_threads,
+            IMAGE: image_processes or 1,
+        }
+        self._pools: Dict[str, Executor] = {
+            STORAGE: ThreadPoolExecutor(
+                max_workers=storage_threads, thread_name_prefix=STORAGE
+            ),
+        }
+        if image_processes > 0:
+            # Workers start lazily. "spawn" avoids forking a process that
+            # already runs threads.
+            self._pools[IMAGE] = ProcessPoolExecutor(
+                max_workers=image_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_image_worker,
+            )
+        else:
+            # Processes disabled: keep image work off the loop in one thread
+            self._pools[IMAGE] = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=IMAGE
+            )
+        self.in_flight = {stage: 0 for stage in self._pools}
+        self.completed = {stage: 0 for stage in self._pools}
+
+    def _provider_pool(self, stage: str) -> Executor:
+        """The thread pool of a provider stage, created on first use."""
+        pool = self._pools.get(stage)
+        if pool is None:
+            pool = self._pools[stage] = ThreadPoolExecutor(
+                max_workers=self.provider_threads, thread_name_prefix=stage
+            )
+            self.sizes[stage] = self.provider_threads
+            self.in_flight[stage] = 0
+            self.completed[stage] = 0
+        return pool
+
+    async def run(self, stage: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run `fn(*args, **kwargs)` on the pool of `stage` and await its result.
+        For the image stage, `fn` and its arguments must be picklable.
+        """
+        if stage.startswith(f"{PROVIDER}:"):
+            pool = self._provider_pool(stage)
+        else:
+            pool = self._pools[stage]
+        self.in_flight[stage] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, functools.partial(fn, *args, **kwargs)
+            )
+        finally:
+            self.in_flight[stage] -= 1
+            self.completed[stage] += 1
+
+    async def run_provider(
+        self, provider: str, fn: Callable[..., T], *args, **kwargs
+    ) -> T:
+        """Run a blocking call to an AI provider on that provider's own pool."""
+        return await self.run(provider_stage(provider), fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, calls in flight and calls completed per stage."""
+        return {
+            stage: {
+                "workers": self.sizes[stage],
+                "in_flight": self.in_flight[stage],
+                "completed": self.completed[stage],
+            }
+            for stage in list(self._pools)
+        }
+
+    def shutdown(self) -> None:
+        """Stop every pool, dropping queued work without waiting for it."""
+        for stage, pool in list(self._pools.items()):
+            try:
+                pool.shutdown(wait=False, cancel_futures=True)
+            except Exception as e:
+                logger.error(f"Error shutting down {stage} executor: {e}")
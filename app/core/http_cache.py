@@ -0,0 +1,108 @@
+"""
+HTTP cache validators for keyword responses.
+
+ETag and Last-Modified are derived from each keyword's `updated_at` and
+audio ids, so clients and CDNs can revalidate with If-None-Match /
+If-Modified-Since and receive a 304 without a body when nothing changed.
+
+Collections (list pages) are validated by ETag only: deleting a keyword
+changes the page without making its newest `updated_at` any later, so a
+Last-Modified date would wrongly report it unchanged.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request
+
+
+def _field(item: Any, name: str) -> Any:
+    """Read a field from a row dict or a model instance."""
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an `updated_at` value, treating naive timestamps as UTC."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def compute_etag(items: Iterable[Any], variant: str = "") -> str:
+    """
+    Build a weak ETag from the id, `updated_at` and audio ids of each item.
+
+    `variant` distinguishes different representations of the same rows,
+    e.g. a `fields=` projection or the next-page cursor.
+    """
+    digest = hashlib.blake2b(variant.encode(), digest_size=16)
+    for item in items:
+        audio = _field(item, "audio")
+        audio_id = _field(audio, "id") if audio else None
+        digest.update(
+            f"|{_field(item, 'id')}:{_field(item, 'updated_at')}"
+            f":{_field(item, 'audio_id')}:{audio_id}".encode()
+        )
+    return f'W/"{digest.hexdigest()}"'
+
+
+def compute_last_modified(items: Iterable[Any]) -> Optional[datetime]:
+    """Return the most recent `updated_at` among the items, if any."""
+    timestamps = [_parse_timestamp(_field(item, "updated_at")) for item in items]
+    timestamps = [ts for ts in timestamps if ts is not None]
+    return max(timestamps) if timestamps else None
+
+
+def cache_headers(
+    etag: str, last_modified: Optional[datetime], cache_control: str
+) -> Dict[str, str]:
+    """Headers that let clients and CDNs cache and revalidate a response."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """
+    Evaluate the request's conditional headers against the validators.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110), which
+    is ignored without `last_modified`; pass None for collections.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
@@ -0,0 +1,526 @@
+"""
+Durable queue of content generation jobs.
+
+The API enqueues one job per new keyword and a separate worker process
+(python -m app.worker) claims and runs them, so generation survives restarts
+and deploys and does not load the web process. Jobs live in the
+generation_jobs table: SQLite locally (a file shared by the API and the
+worker), Postgres in production (DATABASE_URL). Claiming is atomic, so any
+number of workers can poll the same table.
+
+A job records the status of each pipeline stage. Failed jobs go back to the
+queue with an exponential backoff until max_attempts is reached, and a retry
+only reruns the stages that have not succeeded yet.
+
+Vocabulary batches are rows of generation_batches whose keywords are queued
+as jobs carrying the batch_id; a batch's progress is counted from the
+status of its jobs, so it survives restarts like the jobs themselves.
+"""
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import psycopg2
+from loguru import logger
+from psycopg2.extras import Json, RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+from app.core.config import settings
+from app.models import Keyword
+
+# Pipeline stages of KeywordContentGenerator, tracked per job
+GENERATION_STAGES = ("picture", "voice")
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+# Queued jobs of a cancelled batch
+CANCELLED = "cancelled"
+
+# Stage statuses (plus RUNNING, SUCCEEDED and FAILED)
+PENDING = "pending"
+
+# Failed jobs listed in a batch's progress
+_MAX_REPORTED_ERRORS = 50
+
+_SQLITE_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now')"
+
+SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS generation_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    keyword_id INTEGER NOT NULL,
+    keyword_name TEXT NOT NULL,
+    language TEXT NOT NULL DEFAULT 'en',
+    status TEXT NOT NULL DEFAULT 'queued',
+    stages TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    last_error TEXT,
+    run_at TEXT NOT NULL DEFAULT ({_SQLITE_NOW}),
+    locked_by TEXT,
+    locked_at TEXT,
+    created_at TEXT NOT NULL DEFAULT ({_SQLITE_NOW}),
+    updated_at TEXT NOT NULL DEFAULT ({_SQLITE_NOW}),
+    batch_id INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS generation_batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    total INTEGER NOT NULL,
+    created INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    cancelled_at TEXT,
+    created_at TEXT NOT NULL DEFAULT ({_SQLITE_NOW})
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_generation_jobs_active
+ON generation_jobs(keyword_id) WHERE status IN ('queued', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_queued
+ON generation_jobs(run_at, id) WHERE status = 'queued';
+
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_keyword_id
+ON generation_jobs(keyword_id, id);
+"""
+
+# Created once a file made before batch_id existed has been upgraded
+_SQLITE_BATCH_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_batch_id
+ON generation_jobs(batch_id, status) WHERE batch_id IS NOT NULL
+"""
+
+_SQLITE_STATEMENTS = {
+    # At most one queued or running job per keyword (unique partial index);
+    # a batch adopts the active job of a keyword it includes
+    "enqueue": (
+        "INSERT INTO generation_jobs "
+        "(keyword_id, keyword_name, language, stages, max_attempts, batch_id) "
+        "VALUES (:keyword_id, :keyword_name, :language, :stages, :max_attempts, "
+        ":batch_id) ON CONFLICT (keyword_id) WHERE status IN ('queued', 'running') "
+        "DO UPDATE SET batch_id = coalesce(excluded.batch_id, batch_id)"
+    ),
+    "claim": (
+        "UPDATE generation_jobs SET status = 'running', "
+        f"attempts = attempts + 1, locked_by = :worker, locked_at = {_SQLITE_NOW}, "
+        f"updated_at = {_SQLITE_NOW} "
+        "WHERE id = (SELECT id FROM generation_jobs WHERE status = 'queued' "
+        f"AND run_at <= {_SQLITE_NOW} ORDER BY run_at, id LIMIT 1) "
+        "RETURNING *"
+    ),
+    "set_stage": (
+        "UPDATE generation_jobs SET stages = json_set(stages, '$.' || :stage, "
+        f":state), updated_at = {_SQLITE_NOW} WHERE id = :id"
+    ),
+    "finish": (
+        "UPDATE generation_jobs SET status = :status, last_error = :error, "
+        "locked_by = NULL, locked_at = NULL, "
+        f"run_at = strftime('%Y-%m-%dT%H:%M:%f', 'now', :delay || ' seconds'), "
+        f"updated_at = {_SQLITE_NOW} WHERE id = :id"
+    ),
+    # Jobs of a worker that died mid-run
+    "requeue_stale": (
+        "UPDATE generation_jobs SET status = CASE WHEN attempts >= max_attempts "
+        "THEN 'failed' ELSE 'queued' END, last_error = 'Worker stopped responding', "
+        f"locked_by = NULL, locked_at = NULL, updated_at = {_SQLITE_NOW} "
+        "WHERE status = 'running' AND locked_at < "
+        "strftime('%Y-%m-%dT%H:%M:%f', 'now', '-' || :timeout || ' seconds') "
+        "RETURNING id"
+    ),
+    "latest": (
+        "SELECT * FROM generation_jobs WHERE keyword_id = :keyword_id "
+        "ORDER BY id DESC LIMIT 1"
+    ),
+    "create_batch": (
+        "INSERT INTO generation_batches (name, total, created, skipped) "
+        "VALUES (:name, :total, :created, :skipped) RETURNING *"
+    ),
+    "get_batch": "SELECT * FROM generation_batches WHERE id = :id",
+    "list_batches": ("SELECT * FROM generation_batches ORDER BY id DESC LIMIT :limit"),
+    "batch_counts": (
+        "SELECT status, COUNT(*) AS count, MAX(updated_at) AS updated_at "
+        "FROM generation_jobs WHERE batch_id = :id GROUP BY status"
+    ),
+    "batch_errors": (
+        "SELECT keyword_name AS name, last_error AS error FROM generation_jobs "
+        "WHERE batch_id = :id AND status = 'failed' ORDER BY id LIMIT :limit"
+    ),
+    "cancel_batch": (
+        f"UPDATE generation_batches SET cancelled_at = {_SQLITE_NOW} "
+        "WHERE id = :id AND cancelled_at IS NULL"
+    ),
+    "cancel_batch_jobs": (
+        "UPDATE generation_jobs SET status = 'cancelled', "
+        f"last_error = 'Batch cancelled', updated_at = {_SQLITE_NOW} "
+        "WHERE batch_id = :id AND status = 'queued'"
+    ),
+}
+
+_POSTGRES_STATEMENTS = {
+    "enqueue": (
+        "INSERT INTO generation_jobs "
+        "(keyword_id, keyword_name, language, stages, max_attempts, batch_id) "
+        "VALUES (%(keyword_id)s, %(keyword_name)s, %(language)s, %(stages)s, "
+        "%(max_attempts)s, %(batch_id)s) "
+        "ON CONFLICT (keyword_id) WHERE status IN ('queued', 'running') "
+        "DO UPDATE SET batch_id = "
+        "coalesce(EXCLUDED.batch_id, generation_jobs.batch_id)"
+    ),
+    # SKIP LOCKED lets concurrent workers claim different jobs without waiting
+    "claim": (
+        "UPDATE generation_jobs SET status = 'running', attempts = attempts + 1, "
+        "locked_by = %(worker)s, locked_at = now(), updated_at = now() "
+        "WHERE status = 'queued' AND id = (SELECT id FROM generation_jobs "
+        "WHERE status = 'queued' AND run_at <= now() ORDER BY run_at, id "
+        "LIMIT 1 FOR UPDATE SKIP LOCKED) RETURNING *"
+    ),
+    "set_stage": (
+        "UPDATE generation_jobs SET stages = jsonb_set(stages, ARRAY[%(stage)s], "
+        "to_jsonb(%(state)s::text)), updated_at = now() WHERE id = %(id)s"
+    ),
+    "finish": (
+        "UPDATE generation_jobs SET status = %(status)s, last_error = %(error)s, "
+        "locked_by = NULL, locked_at = NULL, "
+        "run_at = now() + make_interval(secs => %(delay)s), updated_at = now() "
+        "WHERE id = %(id)s"
+    ),
+    "requeue_stale": (
+        "UPDATE generation_jobs SET status = CASE WHEN attempts >= max_attempts "
+        "THEN 'failed' ELSE 'queued' END, last_error = 'Worker stopped responding', "
+        "locked_by = NULL, locked_at = NULL, updated_at = now() "
+        "WHERE status = 'running' "
+        "AND locked_at < now() - make_interval(secs => %(timeout)s) RETURNING id"
+    ),
+    "latest": (
+        "SELECT * FROM generation_jobs WHERE keyword_id = %(keyword_id)s "
+        "ORDER BY id DESC LIMIT 1"
+    ),
+    "create_batch": (
+        "INSERT INTO generation_batches (name, total, created, skipped) "
+        "VALUES (%(name)s, %(total)s, %(created)s, %(skipped)s) RETURNING *"
+    ),
+    "get_batch": "SELECT * FROM generation_batches WHERE id = %(id)s",
+    "list_batches": (
+        "SELECT * FROM generation_batches ORDER BY id DESC LIMIT %(limit)s"
+    ),
+    "batch_counts": (
+        "SELECT status, COUNT(*) AS count, MAX(updated_at) AS updated_at "
+        "FROM generation_jobs WHERE batch_id = %(id)s GROUP BY status"
+    ),
+    "batch_errors": (
+        "SELECT keyword_name AS name, last_error AS error FROM generation_jobs "
+        "WHERE batch_id = %(id)s AND status = 'failed' ORDER BY id "
+        "LIMIT %(limit)s"
+    ),
+    "cancel_batch": (
+        "UPDATE generation_batches SET cancelled_at = now() "
+        "WHERE id = %(id)s AND cancelled_at IS NULL"
+    ),
+    "cancel_batch_jobs": (
+        "UPDATE generation_jobs SET status = 'cancelled', "
+        "last_error = 'Batch cancelled', updated_at = now() "
+        "WHERE batch_id = %(id)s AND status = 'queued'"
+    ),
+}
+
+
+def retry_delay(attempts: int, base_seconds: float, max_seconds: float) -> float:
+    """Exponential backoff: base, 2x base, 4x base, ... capped at max_seconds."""
+    return min(max_seconds, base_seconds * 2 ** max(attempts - 1, 0))
+
+
+class GenerationQueue(ABC):
+    """
+    Job operations shared by both databases. Subclasses provide the SQL
+    dialect and `_execute`.
+    """
+
+    statements: Dict[str, str] = {}
+
+    def __init__(self, max_attempts: int = 5):
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def _execute(self, statement: str, params: Dict[str, Any]) -> List[Dict]:
+        """Run one of `statements` and return its rows as dicts."""
+
+    def _stages(self, stages: Dict[str, str]) -> Any:
+        """Encode the stages column for the database."""
+        return stages
+
+    def close(self) -> None:
+        """Release the database connection(s)."""
+
+    def enqueue(
+        self,
+        keywords: Iterable[Keyword],
+        batch_id: Optional[int] = None,
+        stages: Optional[Dict[int, Iterable[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Queue generation for each keyword and return its job. A keyword that
+        already has a queued or running job keeps it instead of a duplicate;
+        with `batch_id` that job joins the batch.
+
+        `stages` maps keyword ids to the stages to generate; the others are
+        recorded as succeeded. Keywords not in it generate every stage.
+        """
+        stages = stages or {}
+        jobs = []
+        for keyword in keywords:
+            todo = set(stages.get(keyword.id, GENERATION_STAGES))
+            self._execute(
+                "enqueue",
+                {
+                    "keyword_id": keyword.id,
+                    "keyword_name": keyword.name,
+                    "language": keyword.language or "en",
+                    "stages": self._stages(
+                        {
+                            stage: PENDING if stage in todo else SUCCEEDED
+                            for stage in GENERATION_STAGES
+                        }
+                    ),
+                    "max_attempts": self.max_attempts,
+                    "batch_id": batch_id,
+                },
+            )
+            jobs.append(self.latest_for_keyword(keyword.id))
+        return jobs
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Mark the next due job as running for `worker` and return it."""
+        rows = self._execute("claim", {"worker": worker})
+        return rows[0] if rows else None
+
+    def set_stage(self, job_id: int, stage: str, state: str) -> None:
+        """Record the status of one pipeline stage."""
+        self._execute("set_stage", {"id": job_id, "stage": stage, "state": state})
+
+    def complete(self, job_id: int) -> None:
+        """Mark a job as succeeded."""
+        self._finish(job_id, SUCCEEDED)
+
+    def fail(
+        self, job: Dict[str, Any], error: str, delay: Optional[float] = None
+    ) -> bool:
+        """
+        Record a failed attempt. The job is retried after `delay` seconds
+        while attempts remain, and fails for good otherwise or without a
+        delay. Returns whether it will be retried.
+        """
+        retry = delay is not None and job["attempts"] < job["max_attempts"]
+        self._finish(job["id"], QUEUED if retry else FAILED, error, delay or 0.0)
+        return retry
+
+    def _finish(
+        self,
+        job_id: int,
+        status: str,
+        error: Optional[str] = None,
+        delay: float = 0.0,
+    ) -> None:
+        self._execute(
+            "finish",
+            {"id": job_id, "status": status, "error": error, "delay": delay},
+        )
+
+    def requeue_stale(self, timeout_seconds: float) -> int:
+        """Release jobs locked longer than `timeout_seconds` by a lost worker."""
+        rows = self._execute("requeue_stale", {"timeout": timeout_seconds})
+        if rows:
+            logger.warning(f"Requeued {len(rows)} stale generation job(s)")
+        return len(rows)
+
+    def latest_for_keyword(self, keyword_id: int) -> Optional[Dict[str, Any]]:
+        """The most recent job of a keyword, if any."""
+        rows = self._execute("latest", {"keyword_id": keyword_id})
+        return rows[0] if rows else None
+
+    def create_batch(
+        self, name: Optional[str], total: int, created: int = 0, skipped: int = 0
+    ) -> Dict[str, Any]:
+        """Record a vocabulary batch; its jobs are enqueued with its id."""
+        return self._execute(
+            "create_batch",
+            {"name": name, "total": total, "created": created, "skipped": skipped},
+        )[0]
+
+    def cancel_batch(self, batch_id: int) -> None:
+        """Cancel the queued jobs of a batch; running ones are left to finish."""
+        self._execute("cancel_batch", {"id": batch_id})
+        self._execute("cancel_batch_jobs", {"id": batch_id})
+
+    def list_batches(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Progress of the most recent batches, newest first."""
+        return [
+            self._batch_progress(batch)
+            for batch in self._execute("list_batches", {"limit": limit})
+        ]
+
+    def batch_progress(self, batch_id: int) -> Optional[Dict[str, Any]]:
+        """Counts, throughput and estimated time left of a batch, if it exists."""
+        rows = self._execute("get_batch", {"id": batch_id})
+        return self._batch_progress(rows[0]) if rows else None
+
+    def _batch_progress(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        finished_at = None
+        for row in self._execute("batch_counts", {"id": batch["id"]}):
+            counts[row["status"]] = row["count"]
+            if row["status"] in (SUCCEEDED, FAILED):
+                finished_at = max(finished_at or row["updated_at"], row["updated_at"])
+        succeeded = counts.get(SUCCEEDED, 0)
+        failed = counts.get(FAILED, 0)
+        remaining = counts.get(QUEUED, 0) + counts.get(RUNNING, 0)
+        done = succeeded + failed
+        if batch["cancelled_at"]:
+            status = CANCELLED
+        else:
+            status = RUNNING if remaining else "finished"
+
+        started = datetime.fromisoformat(batch["created_at"])
+        if remaining or not finished_at:
+            end = datetime.now(timezone.utc).replace(tzinfo=None)
+        else:
+            end = datetime.fromisoformat(finished_at)
+        elapsed = max((end - started).total_seconds(), 0.0)
+        rate = done / elapsed * 60 if elapsed and done else 0.0
+        return {
+            "id": batch["id"],
+            "name": batch["name"],
+            "status": status,
+            "total": batch["total"],
+            "created": batch["created"],
+            "skipped": batch["skipped"],
+            "jobs": sum(counts.values()),
+            "done": done,
+            "succeeded": succeeded,
+            "failed": failed,
+            "cancelled": counts.get(CANCELLED, 0),
+            "queued": counts.get(QUEUED, 0),
+            "running": counts.get(RUNNING, 0),
+            "remaining": remaining,
+            "elapsed_seconds": round(elapsed, 1),
+            "keywords_per_minute": round(rate, 2),
+            "eta_seconds": round(remaining / rate * 60) if rate else None,
+            "created_at": batch["created_at"],
+            "cancelled_at": batch["cancelled_at"],
+            "errors": self._execute(
+                "batch_errors", {"id": batch["id"], "limit": _MAX_REPORTED_ERRORS}
+            ),
+        }
+
+
+class SQLiteGenerationQueue(GenerationQueue):
+    """Generation queue in a SQLite file shared by the API and the workers."""
+
+    statements = _SQLITE_STATEMENTS
+
+    def __init__(self, database: str, max_attempts: int = 5):
+        super().__init__(max_attempts)
+        # Several processes use the file: WAL lets readers run during writes
+        # and the timeout waits for another process's write lock
+        self.connection = sqlite3.connect(
+            database, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SQLITE_SCHEMA)
+        self._upgrade()
+        self._lock = threading.Lock()
+        logger.info(f"Using SQLite generation queue at {database}")
+
+    def _upgrade(self) -> None:
+        """Add the batch_id column to a queue file created before it existed."""
+        columns = {
+            row["name"]
+            for row in self.connection.execute("PRAGMA table_info(generation_jobs)")
+        }
+        if "batch_id" not in columns:
+            self.connection.execute(
+                "ALTER TABLE generation_jobs ADD COLUMN batch_id INTEGER"
+            )
+        self.connection.execute(_SQLITE_BATCH_INDEX)
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
+
+    def _stages(self, stages: Dict[str, str]) -> Any:
+        return json.dumps(stages)
+
+    def _execute(self, statement: str, params: Dict[str, Any]) -> List[Dict]:
+        with self._lock:
+            rows = [
+                dict(row)
+                for row in self.connection.execute(self.statements[statement], params)
+            ]
+        for row in rows:
+            if "stages" in row:
+                row["stages"] = json.loads(row["stages"])
+        return rows
+
+
+class PostgresGenerationQueue(GenerationQueue):
+    """Generation queue in the generation_jobs table of the Postgres database."""
+
+    statements = _POSTGRES_STATEMENTS
+
+    def __init__(self, dsn: str, max_attempts: int = 5, max_connections: int = 4):
+        super().__init__(max_attempts)
+        self.pool = ThreadedConnectionPool(1, max_connections, dsn)
+        logger.info("Using Postgres generation queue")
+
+    def close(self) -> None:
+        self.pool.closeall()
+
+    def _stages(self, stages: Dict[str, str]) -> Any:
+        return Json(stages)
+
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    def _execute(self, statement: str, params: Dict[str, Any]) -> List[Dict]:
+        with self._connection() as conn:
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(self.statements[statement], params)
+                    rows = cursor.fetchall() if cursor.description else []
+                conn.commit()
+            except psycopg2.Error:
+                conn.rollback()
+                raise
+        return [
+            {
+                column: value.isoformat()
+                if isinstance(value, (datetime, date))
+                else value
+                for column, value in row.items()
+            }
+            for row in rows
+        ]
+
+
+def create_generation_queue() -> GenerationQueue:
+    """Create the generation queue configured in Settings."""
+    if settings.GENERATION_QUEUE_BACKEND == "postgres":
+        return PostgresGenerationQueue(
+            settings.DATABASE_URL, max_attempts=settings.GENERATION_MAX_ATTEMPTS
+        )
+    return SQLiteGenerationQueue(
+        settings.GENERATION_QUEUE_SQLITE_PATH,
+        max_attempts=settings.GENERATION_MAX_ATTEMPTS,
+    )
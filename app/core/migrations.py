@@ -0,0 +1,151 @@
+"""
+Schema migration runner.
+
+Schema changes ship as numbered SQL files in migrations/ at the repository
+root (0001_baseline.sql, 0002_...). Pending files are applied in order over
+a direct Postgres connection (DATABASE_URL), each in its own transaction,
+and recorded in the schema_migrations table so every file runs once per
+database. An advisory lock keeps concurrent deploys from racing.
+
+    python -m app.core.migrations            # apply pending migrations
+    python -m app.core.migrations --status   # list applied and pending ones
+
+With RUN_MIGRATIONS_ON_STARTUP the API applies them when it starts.
+"""
+
+import argparse
+import re
+from pathlib import Path
+from typing import List, NamedTuple, Set
+
+import psycopg2
+from loguru import logger
+
+from app.core.config import settings
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+# Arbitrary key for pg_advisory_lock, shared by every runner of this schema
+_LOCK_KEY = 720_417_001
+
+_FILENAME_PATTERN = re.compile(r"^(?P<version>\d+)_(?P<name>\w+)\.sql$")
+
+
+class Migration(NamedTuple):
+    """One SQL migration file."""
+
+    version: str
+    name: str
+    path: Path
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Migration files in `directory`, ordered by version."""
+    migrations = []
+    for path in directory.glob("*.sql"):
+        match = _FILENAME_PATTERN.match(path.name)
+        if not match:
+            raise ValueError(f"Invalid migration file name: {path.name}")
+        migrations.append(Migration(match["version"], match["name"], path))
+    migrations.sort(key=lambda migration: int(migration.version))
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def _applied_versions(cursor) -> Set[str]:
+    """Versions already recorded in MIGRATIONS_TABLE, creating it if needed."""
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+        "version VARCHAR PRIMARY KEY, "
+        "name VARCHAR NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    )
+    cursor.execute(f"SELECT version FROM {MIGRATIONS_TABLE}")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def pending(dsn: str, directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Migrations in `directory` not yet applied to the database."""
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cursor:
+            applied = _applied_versions(cursor)
+        conn.commit()
+    finally:
+        conn.close()
+    return [m for m in discover(directory) if m.version not in applied]
+
+
+def migrate(dsn: str, directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """
+    Apply every pending migration in order and return the ones applied.
+
+    Each migration commits together with its schema_migrations row, so a
+    failing file leaves the database at the previous version and raises.
+    """
+    applied_now = []
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cursor:
+            # Session-level lock, held across the per-migration transactions
+            cursor.execute("SELECT pg_advisory_lock(%s)", (_LOCK_KEY,))
+            applied = _applied_versions(cursor)
+            conn.commit()
+            for migration in discover(directory):
+                if migration.version in applied:
+                    continue
+                logger.info(f"Applying migration {migration.path.name}")
+                try:
+                    cursor.execute(migration.path.read_text())
+                    cursor.execute(
+                        f"INSERT INTO {MIGRATIONS_TABLE} (version, name) "
+                        "VALUES (%s, %s)",
+                        (migration.version, migration.name),
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    logger.error(f"Migration {migration.path.name} failed")
+                    raise
+                applied_now.append(migration)
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (_LOCK_KEY,))
+            conn.commit()
+    finally:
+        conn.close()
+
+    if applied_now:
+        logger.info(f"Applied {len(applied_now)} migration(s)")
+    else:
+        logger.info("Database schema is up to date")
+    return applied_now
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply database migrations.")
+    parser.add_argument(
+        "--status", action="store_true", help="list applied and pending migrations"
+    )
+    parser.add_argument(
+        "--database-url",
+        default=settings.DATABASE_URL,
+        help="Postgres connection string (default: DATABASE_URL)",
+    )
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("DATABASE_URL is not set")
+
+    if args.status:
+        waiting = pending(args.database_url)
+        for migration in discover():
+            state = "pending" if migration in waiting else "applied"
+            print(f"{migration.path.name:<50} {state}")
+        return
+    migrate(args.database_url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,701 @@
+"""
+Direct Postgres storage backend.
+
+Talks to the database over a pooled psycopg2 connection instead of going
+through PostgREST, which removes the HTTPS hop, the JSON round trip and the
+per-request auth check. The hot keyword reads (by-name lookup, keyword+audio
+join and list pages) run as server-side prepared statements, planned once per
+connection. Select it with STORAGE_BACKEND=postgres and DATABASE_URL. Rows,
+embedding and errors match the Supabase backend in app.core.db, so services
+do not know which backend they use.
+
+Prepared statements live in the server session, so they need a direct or
+session-pooled connection. Behind Supabase's transaction pooler (port 6543)
+consecutive transactions may run on different server sessions, so the
+statements are sent as plain queries there instead. A statement that went
+stale (a schema change altered its result type, or the session lost it) is
+prepared again and retried once.
+"""
+
+import asyncio
+import re
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+from loguru import logger
+from psycopg2 import sql
+from psycopg2.extensions import connection as PGConnection
+from psycopg2.extensions import parse_dsn
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+from app.core.storage import Embedding, api_error, nest_embedded, parse_embedded
+
+# The embedding KeywordService uses for keyword+audio reads; served by a join
+KEYWORD_AUDIO_EMBED = "audio:audio_files!fk_audio(*)"
+
+_KEYWORD_AUDIO_SELECT = """
+SELECT k.*, CASE WHEN a.id IS NULL THEN NULL ELSE to_jsonb(a) END AS audio
+FROM keywords k LEFT JOIN audio_files a ON a.id = k.audio_id
+"""
+
+# Hot statements, prepared on each pooled connection the first time it is used
+PREPARED_STATEMENTS = {
+    "keyword_by_name": "SELECT * FROM keywords WHERE name = $1 LIMIT 1",
+    "keyword_with_audio_by_id": f"{_KEYWORD_AUDIO_SELECT} WHERE k.id = $1",
+    "keyword_with_audio_by_name": f"{_KEYWORD_AUDIO_SELECT} WHERE k.name = $1",
+    "keyword_page": "SELECT * FROM keywords WHERE id > $1 ORDER BY id LIMIT $2",
+    "keyword_page_with_audio": (
+        f"{_KEYWORD_AUDIO_SELECT} WHERE k.id > $1 ORDER BY k.id LIMIT $2"
+    ),
+    "keyword_offset_page": "SELECT * FROM keywords ORDER BY id LIMIT $1 OFFSET $2",
+}
+
+# The same statements with named psycopg2 parameters, for connections that
+# cannot use PREPARE
+_PLAIN_STATEMENTS = {
+    name: re.sub(r"\$(\d+)", r"%(\1)s", statement)
+    for name, statement in PREPARED_STATEMENTS.items()
+}
+
+# SQLSTATEs of a prepared statement that must be prepared again:
+# feature_not_supported ("cached plan must not change result type" after a
+# schema change) and invalid_sql_statement_name (it no longer exists)
+_STALE_PREPARED_CODES = {"0A000", "26000"}
+
+# Port of Supabase's transaction pooler (Supavisor / PgBouncer)
+_TRANSACTION_POOLER_PORT = "6543"
+
+
+def uses_transaction_pooler(dsn: str) -> bool:
+    """Whether `dsn` points at a transaction pooler, where PREPARE breaks."""
+    try:
+        return parse_dsn(dsn).get("port") == _TRANSACTION_POOLER_PORT
+    except psycopg2.ProgrammingError:
+        return False
+
+
+class _PreparedConnection(PGConnection):
+    """
+    psycopg2 connection with an all-or-nothing `prepared` flag, set once every
+    statement in PREPARED_STATEMENTS has been prepared on it. Statements are
+    not tracked one by one: a stale one makes _prepare deallocate and prepare
+    them all again.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = False
+
+
+def _to_json_value(value: Any) -> Any:
+    """Render a column value the way PostgREST's JSON would."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _to_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a RealDictRow to a plain dict of JSON-style values."""
+    return {column: _to_json_value(value) for column, value in row.items()}
+
+
+def _is_full_select(columns: Optional[List[str]]) -> bool:
+    """Whether `columns` selects every column, as the prepared statements do."""
+    return not columns or columns == ["*"]
+
+
+class PostgresCRUD:
+    """CRUD operations on Postgres over a pooled direct connection."""
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        prepared_statements: Optional[bool] = None,
+    ):
+        self.pool = ThreadedConnectionPool(
+            min_size, max_size, dsn, connection_factory=_PreparedConnection
+        )
+        # ThreadedConnectionPool raises when exhausted; block callers instead
+        self._slots = threading.BoundedSemaphore(max_size)
+        # Column names per table, cached for the life of the process: schema
+        # migrations must finish before the app starts (fly.toml's
+        # release_command runs them before a deploy)
+        self._columns: Dict[str, List[str]] = {}
+        # None: prepare unless the DSN points at a transaction pooler
+        if prepared_statements is None:
+            prepared_statements = not uses_transaction_pooler(dsn)
+        self.prepared_statements = prepared_statements
+        logger.info(
+            f"Using direct Postgres storage backend (pool {min_size}-{max_size}, "
+            f"prepared statements {'on' if prepared_statements else 'off'})"
+        )
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.pool.closeall()
+
+    @contextmanager
+    def _connection(self) -> Iterator[_PreparedConnection]:
+        """Borrow a connection for one transaction, committed on success."""
+        with self._slots:
+            conn = self.pool.getconn()
+            try:
+                if self.prepared_statements and not conn.prepared:
+                    self._prepare(conn)
+                yield conn
+                conn.commit()
+            except BaseException:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                # Broken connections are discarded rather than handed out again
+                self.pool.putconn(conn, close=bool(conn.closed))
+
+    def _prepare(self, conn: _PreparedConnection) -> None:
+        """PREPARE the hot statements, replacing any the session still holds."""
+        with conn.cursor() as cursor:
+            cursor.execute("DEALLOCATE ALL")
+            for name, statement in PREPARED_STATEMENTS.items():
+                cursor.execute(f"PREPARE {name} AS {statement}")
+        # Committed on its own so a failing caller cannot roll them back
+        conn.commit()
+        conn.prepared = True
+
+    @staticmethod
+    def _fetch(conn: PGConnection, query: Any, params: Any) -> List[Dict[str, Any]]:
+        """Run one statement on `conn` and return its rows as dicts."""
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            if cursor.description is None:
+                return []
+            return [_to_row(row) for row in cursor.fetchall()]
+
+    def _execute(self, query: Any, params: Any = None) -> List[Dict[str, Any]]:
+        """Run one statement and return its rows as dicts."""
+        try:
+            with self._connection() as conn:
+                return self._fetch(conn, query, params)
+        except psycopg2.Error as e:
+            raise api_error(e.pgcode or "08000", str(e).strip()) from e
+
+    def _execute_prepared(self, name: str, *params: Any) -> List[Dict[str, Any]]:
+        """
+        Run one of PREPARED_STATEMENTS with positional parameters, as a plain
+        query when prepared statements are off.
+        """
+        if not self.prepared_statements:
+            return self._execute(
+                _PLAIN_STATEMENTS[name],
+                {str(index): value for index, value in enumerate(params, start=1)},
+            )
+        query = f"EXECUTE {name} ({', '.join('%s' for _ in params)})"
+        try:
+            with self._connection() as conn:
+                try:
+                    return self._fetch(conn, query, params)
+                except psycopg2.Error as e:
+                    if e.pgcode not in _STALE_PREPARED_CODES:
+                        raise
+                    logger.warning(
+                        f"Preparing statements again after {e.pgcode}: {str(e).strip()}"
+                    )
+                    conn.rollback()
+                    self._prepare(conn)
+                    return self._fetch(conn, query, params)
+        except psycopg2.Error as e:
+            raise api_error(e.pgcode or "08000", str(e).strip()) from e
+
+    def _table_columns(self, table: str) -> List[str]:
+        """Column names of `table`, which also validates the table name."""
+        if table not in self._columns:
+            rows = self._execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = 'public' AND table_name = %s "
+                "ORDER BY ordinal_position",
+                (table,),
+            )
+            if not rows:
+                raise api_error("42P01", f'relation "{table}" does not exist')
+            self._columns[table] = [row["column_name"] for row in rows]
+        return self._columns[table]
+
+    def _column(self, table: str, column: str) -> sql.Identifier:
+        """Quote a column name after checking it exists on `table`."""
+        if column not in self._table_columns(table):
+            raise api_error("42703", f"column {table}.{column} does not exist")
+        return sql.Identifier(column)
+
+    def _select_list(self, table: str, columns: Optional[List[str]]) -> sql.Composable:
+        """SQL select list for `columns` (all columns when None)."""
+        if _is_full_select(columns):
+            return sql.SQL("*")
+        return sql.SQL(", ").join(self._column(table, column) for column in columns)
+
+    def _select(
+        self,
+        table: str,
+        where: Optional[sql.Composable] = None,
+        params: Any = (),
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+        suffix: sql.Composable = sql.SQL(""),
+    ) -> List[Dict[str, Any]]:
+        """SELECT rows from `table` and attach the `embedded` resource."""
+        embed = parse_embedded(table, embedded) if embedded else None
+        select_columns = columns
+        if embed and columns and embed.column not in columns:
+            # The join needs the foreign key even if the caller did not ask
+            select_columns = [*columns, embed.column]
+
+        self._table_columns(table)
+        query = sql.SQL("SELECT {} FROM {}").format(
+            self._select_list(table, select_columns), sql.Identifier(table)
+        )
+        if where is not None:
+            query += sql.SQL(" WHERE ") + where
+        rows = self._execute(query + sql.SQL(" ") + suffix, params)
+
+        if embed:
+            self._attach_embedded(rows, embed)
+            if select_columns is not columns:
+                for row in rows:
+                    row.pop(embed.column, None)
+        return rows
+
+    def _attach_embedded(self, rows: List[Dict[str, Any]], embed: Embedding) -> None:
+        """Fetch the related rows for `rows` in one query and nest them."""
+        keys = list({row[embed.column] for row in rows} - {None})
+        related: List[Dict[str, Any]] = []
+        if keys:
+            related = self._select(
+                embed.table,
+                sql.SQL("{} = ANY(%s)").format(self._column(embed.table, embed.remote)),
+                (keys,),
+                columns=embed.related_columns(),
+                suffix=sql.SQL("ORDER BY id"),
+            )
+        nest_embedded(rows, embed, related)
+
+    def _values(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate the column names of `data`."""
+        for column in data:
+            self._column(table, column)
+        return data
+
+    def create(self, table: str, data: dict) -> Dict[str, Any]:
+        """Create a new record in the specified table."""
+        values = self._values(table, data)
+        query = sql.SQL("INSERT INTO {} ({}) VALUES ({}) RETURNING *").format(
+            sql.Identifier(table),
+            sql.SQL(", ").join(map(sql.Identifier, values)),
+            sql.SQL(", ").join(map(sql.Placeholder, values)),
+        )
+        rows = self._execute(query, values)
+        return rows[0] if rows else {}
+
+    def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str,
+        ignore_duplicates: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert many records in one statement. See SupabaseCRUD.upsert_many.
+        Only inserted (or, without `ignore_duplicates`, updated) rows return.
+        """
+        if not rows:
+            return []
+        columns = list(self._values(table, rows[0]))
+        for row in rows:
+            self._values(table, row)
+        if ignore_duplicates:
+            action = sql.SQL("DO NOTHING")
+        else:
+            action = sql.SQL("DO UPDATE SET {}").format(
+                sql.SQL(", ").join(
+                    sql.SQL("{0} = excluded.{0}").format(sql.Identifier(column))
+                    for column in columns
+                )
+            )
+        row_sql = sql.SQL("({})").format(
+            sql.SQL(", ").join(sql.Placeholder() for _ in columns)
+        )
+        query = sql.SQL(
+            "INSERT INTO {} ({}) VALUES {} ON CONFLICT ({}) {} RETURNING *"
+        ).format(
+            sql.Identifier(table),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+            sql.SQL(", ").join(row_sql for _ in rows),
+            self._column(table, on_conflict),
+            action,
+        )
+        params = [row.get(column) for row in rows for column in columns]
+        return self._execute(query, params)
+
+    def read(
+        self, table: str, id: int, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its ID."""
+        rows = self._select(table, sql.SQL("id = %s"), (id,), columns)
+        return rows[0] if rows else None
+
+    def update(self, table: str, id: int, data: dict) -> Optional[Dict[str, Any]]:
+        """Update a record by its ID."""
+        values = self._values(table, data)
+        if not values:
+            return self.read(table, id)
+        query = sql.SQL("UPDATE {} SET {} WHERE id = %(_id)s RETURNING *").format(
+            sql.Identifier(table),
+            sql.SQL(", ").join(
+                sql.SQL("{} = {}").format(sql.Identifier(c), sql.Placeholder(c))
+                for c in values
+            ),
+        )
+        rows = self._execute(query, {**values, "_id": id})
+        return rows[0] if rows else None
+
+    def delete(self, table: str, id: int) -> bool:
+        """Delete a record by its ID."""
+        self._table_columns(table)
+        query = sql.SQL("DELETE FROM {} WHERE id = %s RETURNING id").format(
+            sql.Identifier(table)
+        )
+        return len(self._execute(query, (id,))) > 0
+
+    def read_all(
+        self,
+        table: str,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records with pagination."""
+        if table == "keywords" and _is_full_select(columns):
+            return self._execute_prepared("keyword_offset_page", limit, offset)
+        return self._select(
+            table,
+            columns=columns,
+            params=(limit, offset),
+            suffix=sql.SQL("ORDER BY id LIMIT %s OFFSET %s"),
+        )
+
+    def read_page(
+        self,
+        table: str,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records ordered by id using keyset pagination."""
+        if table == "keywords" and _is_full_select(columns):
+            # Ids are SERIAL, so 0 sorts before every row
+            if embedded is None:
+                return self._execute_prepared("keyword_page", after_id or 0, limit)
+            if embedded == KEYWORD_AUDIO_EMBED:
+                return self._execute_prepared(
+                    "keyword_page_with_audio", after_id or 0, limit
+                )
+
+        where, params = None, []
+        if after_id is not None:
+            where, params = sql.SQL("id > %s"), [after_id]
+        return self._select(
+            table,
+            where,
+            [*params, limit],
+            columns,
+            embedded,
+            suffix=sql.SQL("ORDER BY id LIMIT %s"),
+        )
+
+    def read_changed_since(
+        self,
+        table: str,
+        column: str,
+        since: str,
+        limit: int = 100,
+        after: Optional[Tuple[str, Any]] = None,
+        key: str = "id",
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records changed since a timestamp, ordered for keyset paging."""
+        column_sql, key_sql = self._column(table, column), self._column(table, key)
+        where, params = sql.SQL("{} >= %s").format(column_sql), [since]
+        if after is not None:
+            where += sql.SQL(" AND ({0}, {1}) > (%s, %s)").format(column_sql, key_sql)
+            params += [after[0], after[1]]
+        return self._select(
+            table,
+            where,
+            [*params, limit],
+            columns,
+            embedded,
+            suffix=sql.SQL("ORDER BY {}, {} LIMIT %s").format(column_sql, key_sql),
+        )
+
+    def read_filtered(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records filtered by a column value."""
+        return self._select(
+            table,
+            sql.SQL("{} = %s").format(self._column(table, column)),
+            (value,),
+            columns,
+        )
+
+    def read_by_name(
+        self, table: str, name: str, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its name."""
+        if table == "keywords" and _is_full_select(columns):
+            rows = self._execute_prepared("keyword_by_name", name)
+        else:
+            rows = self.read_filtered(table, "name", name, columns)
+        return rows[0] if rows else None
+
+    def read_with_embedded(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        embedded: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single record together with an embedded related resource."""
+        if (
+            table == "keywords"
+            and column in ("id", "name")
+            and embedded == KEYWORD_AUDIO_EMBED
+            and _is_full_select(columns)
+        ):
+            rows = self._execute_prepared(f"keyword_with_audio_by_{column}", value)
+        else:
+            rows = self._select(
+                table,
+                sql.SQL("{} = %s").format(self._column(table, column)),
+                (value,),
+                columns,
+                embedded,
+                suffix=sql.SQL("LIMIT 1"),
+            )
+        return rows[0] if rows else None
+
+    def read_in(
+        self,
+        table: str,
+        column: str,
+        values: List[Any],
+        embedded: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records whose `column` is one of `values`."""
+        if not values:
+            return []
+        return self._select(
+            table,
+            sql.SQL("{} = ANY(%s)").format(self._column(table, column)),
+            (list(values),),
+            columns,
+            embedded,
+        )
+
+    def rpc(
+        self,
+        function: str,
+        params: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Call a Postgres function that returns rows, with named arguments."""
+        arguments = sql.SQL(", ").join(
+            sql.SQL("{} => {}").format(sql.Identifier(name), sql.Placeholder(name))
+            for name in params
+        )
+        query = sql.SQL("SELECT * FROM {}({})").format(
+            sql.Identifier(function), arguments
+        )
+        rows = self._execute(query, params)
+        if embedded:
+            # Functions in create_tables.sql return keywords rows
+            embed = parse_embedded("keywords", embedded)
+            self._attach_embedded(rows, embed)
+        if not _is_full_select(columns):
+            keep = {*columns, embed.alias} if embedded else set(columns)
+            rows = [{k: v for k, v in row.items() if k in keep} for row in rows]
+        return rows
+
+    def get_related(
+        self, table: str, id: int, related_table: str, foreign_key: str
+    ) -> List[Dict[str, Any]]:
+        """Get related records from another table."""
+        return self.read_filtered(related_table, foreign_key, id)
+
+
+class AsyncPostgresCRUD:
+    """
+    Coroutine interface over a PostgresCRUD.
+
+    psycopg2 is blocking, so each call runs in a worker thread; the
+    connection pool bounds how many run against the database at once.
+    """
+
+    def __init__(self, crud: PostgresCRUD):
+        self.crud = crud
+
+    async def create(self, table: str, data: dict) -> Dict[str, Any]:
+        """Create a new record in the specified table."""
+        return await asyncio.to_thread(self.crud.create, table, data)
+
+    async def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str,
+        ignore_duplicates: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Insert many records in one statement. See SupabaseCRUD.upsert_many."""
+        return await asyncio.to_thread(
+            self.crud.upsert_many, table, rows, on_conflict, ignore_duplicates
+        )
+
+    async def read(
+        self, table: str, id: int, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its ID."""
+        return await asyncio.to_thread(self.crud.read, table, id, columns)
+
+    async def update(self, table: str, id: int, data: dict) -> Optional[Dict[str, Any]]:
+        """Update a record by its ID."""
+        return await asyncio.to_thread(self.crud.update, table, id, data)
+
+    async def delete(self, table: str, id: int) -> bool:
+        """Delete a record by its ID."""
+        return await asyncio.to_thread(self.crud.delete, table, id)
+
+    async def read_all(
+        self,
+        table: str,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records with pagination."""
+        return await asyncio.to_thread(
+            self.crud.read_all, table, limit, offset, columns
+        )
+
+    async def read_page(
+        self,
+        table: str,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records ordered by id using keyset pagination."""
+        return await asyncio.to_thread(
+            self.crud.read_page, table, limit, after_id, columns, embedded
+        )
+
+    async def read_changed_since(
+        self,
+        table: str,
+        column: str,
+        since: str,
+        limit: int = 100,
+        after: Optional[Tuple[str, Any]] = None,
+        key: str = "id",
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records changed since a timestamp, ordered for keyset paging."""
+        return await asyncio.to_thread(
+            self.crud.read_changed_since,
+            table,
+            column,
+            since,
+            limit,
+            after,
+            key,
+            columns,
+            embedded,
+        )
+
+    async def read_filtered(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records filtered by a column value."""
+        return await asyncio.to_thread(
+            self.crud.read_filtered, table, column, value, columns
+        )
+
+    async def read_by_name(
+        self, table: str, name: str, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its name."""
+        return await asyncio.to_thread(self.crud.read_by_name, table, name, columns)
+
+    async def read_with_embedded(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        embedded: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single record together with an embedded related resource."""
+        return await asyncio.to_thread(
+            self.crud.read_with_embedded, table, column, value, embedded, columns
+        )
+
+    async def read_in(
+        self,
+        table: str,
+        column: str,
+        values: List[Any],
+        embedded: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records whose `column` is one of `values`."""
+        return await asyncio.to_thread(
+            self.crud.read_in, table, column, values, embedded, columns
+        )
+
+    async def rpc(
+        self,
+        function: str,
+        params: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Call a Postgres function that returns rows. See PostgresCRUD.rpc."""
+        return await asyncio.to_thread(
+            self.crud.rpc, function, params, columns, embedded
+        )
+
+    async def get_related(
+        self, table: str, id: int, related_table: str, foreign_key: str
+    ) -> List[Dict[str, Any]]:
+        """Get related records from another table."""
+        return await asyncio.to_thread(
+            self.crud.get_related, table, id, related_table, foreign_key
+        )
@@ -0,0 +1,296 @@
+"""
+Per-provider rate limiting for the AI provider APIs.
+
+Every call to Ideogram, OpenAI and ElevenLabs goes through the process-wide
+registry returned by get_rate_limiters(). Each provider has:
+
+- a token bucket (requests_per_minute, burst) spacing out requests
+- a concurrency limit (GENERATION_PROVIDER_CONCURRENCY) on calls in flight
+
+A call rejected with HTTP 429 blocks the provider for its Retry-After (or
+an exponential backoff when it has none), halves the provider's rate and is
+retried up to PROVIDER_RATE_LIMIT_RETRIES times. Successful calls raise the
+rate back towards the configured one. Provider calls are blocking SDK calls
+run in worker threads, so the limiters are thread-safe and wait by sleeping;
+each provider's calls run on a thread pool of their own (see
+app.core.executors), so only that provider's threads sleep.
+
+Limiters are per process: the API and each queue worker hold their own.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, TypeVar
+
+from loguru import logger
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Share of the configured rate the rate can drop to after repeated 429s,
+# and the share of it regained per successful call
+_MIN_RATE_FACTOR = 0.1
+_RECOVERY_FACTOR = 0.05
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (seconds or an HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def throttle_delay(error: BaseException) -> Optional[float]:
+    """
+    For an HTTP 429 error of requests, OpenAI or ElevenLabs, the seconds the
+    provider asked to wait (0 when it did not say); None for other errors.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(
+        response, "status_code", None
+    )
+    if status != 429:
+        return None
+    headers: Mapping[str, str] = (
+        getattr(error, "headers", None) or getattr(response, "headers", None) or {}
+    )
+    headers = {key.lower(): value for key, value in headers.items()}
+    if headers.get("retry-after-ms"):
+        delay = parse_retry_after(headers["retry-after-ms"])
+        if delay is not None:
+            return delay / 1000
+    return parse_retry_after(headers.get("retry-after")) or 0.0
+
+
+class ProviderLimiter:
+    """Token bucket, concurrency limit and 429 backoff of one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+    ):
+        self.name = name
+        # Requests per second; None leaves the provider unthrottled until a 429
+        self.max_rate = requests_per_minute / 60 if requests_per_minute else None
+        self.rate = self.max_rate
+        self.capacity = float(burst or 1)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._tokens = self.capacity
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(concurrency) if concurrency else None
+        # Metrics
+        self.calls = 0
+        self.throttled = 0
+        self.waiting = 0
+        self.in_flight = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _take_token(self) -> float:
+        """Take a token if one is free; otherwise return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self.rate is None:
+                return 0.0
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._refilled_at) * self.rate
+            )
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    @contextmanager
+    def acquire(self) -> Iterator[None]:
+        """Wait for a free slot and a token, and hold the slot while in use."""
+        started = time.monotonic()
+        with self._lock:
+            self.waiting += 1
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            while (delay := self._take_token()) > 0:
+                time.sleep(delay)
+            waited = time.monotonic() - started
+            with self._lock:
+                self.waiting -= 1
+                self.in_flight += 1
+                self.calls += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        except BaseException:
+            with self._lock:
+                self.waiting -= 1
+            if self._slots is not None:
+                self._slots.release()
+            raise
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            if self._slots is not None:
+                self._slots.release()
+
+    def _backoff(self, delay: float, attempt: int) -> float:
+        """Block the provider after a 429 and halve its rate."""
+        if not delay:
+            delay = min(
+                self.backoff_max_seconds, self.backoff_base_seconds * 2**attempt
+            )
+            delay += random.uniform(0, delay / 4)
+        with self._lock:
+            self.throttled += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._tokens = 0.0
+            if self.rate is not None:
+                self.rate = max(self.max_rate * _MIN_RATE_FACTOR, self.rate / 2)
+        return delay
+
+    def _recover(self) -> None:
+        """Raise the rate back towards the configured one after a success."""
+        if self.rate is not None and self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(
+                    self.max_rate, self.rate + self.max_rate * _RECOVERY_FACTOR
+                )
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Call `fn(*args, **kwargs)` within the limits, retrying it after a 429.
+        Other errors, and a 429 once the retries are used up, are raised.
+        """
+        attempt = 0
+        while True:
+            with self.acquire():
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    delay = throttle_delay(e)
+                    if delay is None:
+                        raise
+                    delay = self._backoff(delay, attempt)
+                    if attempt >= self.max_retries:
+                        logger.error(f"{self.name} rate limited, giving up: {e}")
+                        raise
+                    logger.warning(
+                        f"{self.name} rate limited, retrying in {delay:.1f}s "
+                        f"(attempt {attempt + 1}/{self.max_retries})"
+                    )
+                else:
+                    self._recover()
+                    return result
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limits, calls and time spent waiting for a slot or token."""
+        with self._lock:
+            blocked_for = max(0.0, self._blocked_until - time.monotonic())
+            return {
+                "requests_per_minute": (
+                    round(self.rate * 60, 2) if self.rate is not None else None
+                ),
+                "configured_requests_per_minute": (
+                    round(self.max_rate * 60, 2) if self.max_rate is not None else None
+                ),
+                "concurrency": self.concurrency,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "blocked_for_seconds": round(blocked_for, 2),
+                "wait_seconds_total": round(self.wait_seconds_total, 3),
+                "wait_seconds_avg": (
+                    round(self.wait_seconds_total / self.calls, 3)
+                    if self.calls
+                    else 0.0
+                ),
+                "wait_seconds_max": round(self.wait_seconds_max, 3),
+            }
+
+
+class RateLimiterRegistry:
+    """The ProviderLimiter of every provider, created on first use."""
+
+    def __init__(
+        self,
+        rate_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        max_retries: int = 3,
+        backoff_max_seconds: float = 60.0,
+    ):
+        self.rate_limits = rate_limits or {}
+        self.concurrency = concurrency or {}
+        self.max_retries = max_retries
+        self.backoff_max_seconds = backoff_max_seconds
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> ProviderLimiter:
+        """The limiter of `provider`; unconfigured providers only back off."""
+        with self._lock:
+            limiter = self._limiters.get(provider)
+            if limiter is None:
+                limits = self.rate_limits.get(provider, {})
+                limiter = self._limiters[provider] = ProviderLimiter(
+                    provider,
+                    requests_per_minute=limits.get("requests_per_minute"),
+                    burst=limits.get("burst"),
+                    concurrency=self.concurrency.get(provider),
+                    max_retries=self.max_retries,
+                    backoff_max_seconds=self.backoff_max_seconds,
+                )
+            return limiter
+
+    def call(self, provider: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Call `fn(*args, **kwargs)` through the limiter of `provider`."""
+        return self.get(provider).call(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Stats of every provider called so far."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.name: limiter.stats() for limiter in limiters}
+
+
+_registry: Optional[RateLimiterRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiters() -> RateLimiterRegistry:
+    """The process-wide registry, built from the settings on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = RateLimiterRegistry(
+                settings.PROVIDER_RATE_LIMITS,
+                settings.GENERATION_PROVIDER_CONCURRENCY,
+                max_retries=settings.PROVIDER_RATE_LIMIT_RETRIES,
+                backoff_max_seconds=settings.PROVIDER_BACKOFF_MAX_SECONDS,
+            )
+        return _registry
@@ -0,0 +1,45 @@
+"""
+Fast JSON encoding for hot read paths.
+
+FastAPI validates a returned value against the route's response_model, dumps
+it to Python objects with jsonable_encoder and then encodes those again with
+json.dumps. For rows that come straight from Supabase, a precompiled
+TypeAdapter validates and encodes them in pydantic-core in one pass, and
+returning the bytes as a Response skips FastAPI's own validation entirely.
+"""
+
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def encode_json(content: Any, adapter: Optional[TypeAdapter] = None) -> bytes:
+    """
+    Encode `content` to JSON bytes.
+
+    With an `adapter`, content is validated and shaped by its schema first,
+    exactly like a response_model would; without one it is encoded as-is
+    (used for `fields=` projections, which do not satisfy the schema).
+    """
+    if adapter is None:
+        return to_json(content)
+    return adapter.dump_json(adapter.validate_python(content))
+
+
+def fast_json_response(
+    content: Any,
+    adapter: Optional[TypeAdapter] = None,
+    headers: Optional[Dict[str, str]] = None,
+    status_code: int = 200,
+) -> Response:
+    """Return `content` as an already-encoded JSON response."""
+    return Response(
+        content=encode_json(content, adapter),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE,
+    )
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls for the same key into one execution.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same result (or exception) instead of starting their
+    own. The result object is shared, so callers must not mutate it. Keys
+    are forgotten as soon as the call finishes: this deduplicates, it does
+    not cache.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of `fn()`, sharing an in-flight call for `key`."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.coalesced += 1
+        # Shielded so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop `key` once its call is done, unless a newer call replaced it."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        """
+        Stop sharing the calls in flight; later callers start new ones. Used
+        after writes, so nobody joins a read that may predate the write.
+        """
+        self._inflight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call counters and the number of calls in flight."""
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": (
+                round(self.coalesced / self.calls, 4) if self.calls else 0.0
+            ),
+        }
@@ -0,0 +1,638 @@
+"""
+In-process SQLite storage backend.
+
+Implements the same CRUD, filtering, keyset pagination, embedding and RPC
+semantics as the Supabase backend in app.core.db, without a network hop, so
+the API can run locally and be load-tested deterministically. Select it with
+STORAGE_BACKEND=sqlite. Constraint violations are raised as postgrest.APIError
+carrying the Postgres error code, so callers handle both backends alike.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.core.storage import Embedding, api_error, nest_embedded, parse_embedded
+from app.core.trigram import similarity, trigrams
+
+# Trigger bodies keeping keyword_audio_lookup in step with its sources
+_SYNC_KEYWORD_LOOKUP = """INSERT INTO keyword_audio_lookup (
+        id, name, language, pictogram_url, audio_id,
+        voice_man_url, voice_woman_url, updated_at
+    )
+    VALUES (
+        NEW.id, NEW.name, NEW.language, NEW.pictogram_url, NEW.audio_id,
+        (SELECT voice_man FROM audio_files WHERE id = NEW.audio_id),
+        (SELECT voice_woman FROM audio_files WHERE id = NEW.audio_id),
+        NEW.updated_at
+    )
+    ON CONFLICT (id) DO UPDATE SET
+        name = excluded.name,
+        language = excluded.language,
+        pictogram_url = excluded.pictogram_url,
+        audio_id = excluded.audio_id,
+        voice_man_url = excluded.voice_man_url,
+        voice_woman_url = excluded.voice_woman_url,
+        updated_at = excluded.updated_at;"""
+
+_SYNC_AUDIO_LOOKUP = """UPDATE keyword_audio_lookup
+    SET voice_man_url = NEW.voice_man,
+        voice_woman_url = NEW.voice_woman,
+        updated_at = max(updated_at, strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+    WHERE audio_id = NEW.id;"""
+
+# SQLite flavour of create_tables.sql. AUTOINCREMENT keeps ids from being
+# reused after deletes, like SERIAL, which delta sync tombstones rely on.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT,
+    pictogram_url TEXT,
+    language TEXT NOT NULL DEFAULT 'en',
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+    audio_id INTEGER REFERENCES audio_files(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_keywords_updated_at_id ON keywords(updated_at, id);
+
+CREATE TABLE IF NOT EXISTS audio_files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    voice_man TEXT,
+    voice_woman TEXT,
+    keyword_id INTEGER NOT NULL REFERENCES keywords(id),
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_audio_files_keyword_id ON audio_files(keyword_id);
+
+CREATE TABLE IF NOT EXISTS keyword_audio_lookup (
+    id INTEGER PRIMARY KEY REFERENCES keywords(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    language TEXT NOT NULL,
+    pictogram_url TEXT,
+    audio_id INTEGER,
+    voice_man_url TEXT,
+    voice_woman_url TEXT,
+    updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_keyword_audio_lookup_by_name
+ON keyword_audio_lookup(name);
+
+CREATE INDEX IF NOT EXISTS idx_keyword_audio_lookup_audio_id
+ON keyword_audio_lookup(audio_id);
+
+-- keyword_audio_lookup maintenance, as the Postgres triggers do
+CREATE TRIGGER IF NOT EXISTS keywords_insert_audio_lookup
+AFTER INSERT ON keywords
+BEGIN
+    {sync_keyword}
+END;
+
+CREATE TRIGGER IF NOT EXISTS keywords_update_audio_lookup
+AFTER UPDATE ON keywords
+BEGIN
+    {sync_keyword}
+END;
+
+-- Recreated so database files from before the updated_at bump get it
+DROP TRIGGER IF EXISTS audio_files_insert_audio_lookup;
+DROP TRIGGER IF EXISTS audio_files_update_audio_lookup;
+
+CREATE TRIGGER IF NOT EXISTS audio_files_insert_audio_lookup
+AFTER INSERT ON audio_files
+BEGIN
+    {sync_audio}
+END;
+
+CREATE TRIGGER IF NOT EXISTS audio_files_update_audio_lookup
+AFTER UPDATE ON audio_files
+BEGIN
+    {sync_audio}
+END;
+
+CREATE TABLE IF NOT EXISTS keyword_tombstones (
+    keyword_id INTEGER PRIMARY KEY,
+    deleted_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_keyword_tombstones_deleted_at
+ON keyword_tombstones(deleted_at, keyword_id);
+""".format(sync_keyword=_SYNC_KEYWORD_LOOKUP, sync_audio=_SYNC_AUDIO_LOOKUP)
+
+# SQLite integrity error messages -> Postgres error codes
+_INTEGRITY_CODES = {
+    "UNIQUE": "23505",
+    "FOREIGN KEY": "23503",
+    "NOT NULL": "23502",
+}
+
+# Minimum trigram similarity for fuzzy name matches (pg_trgm's default)
+SIMILARITY_THRESHOLD = 0.3
+
+
+def _like_pattern(text: str) -> str:
+    """Escape LIKE wildcards so `text` matches literally (ESCAPE '\\')."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _trigram_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """SQL similarity() function, computed like pg_trgm."""
+    if a is None or b is None:
+        return 0.0
+    return similarity(trigrams(a), trigrams(b))
+
+
+class SQLiteCRUD:
+    """CRUD operations on an in-process SQLite database."""
+
+    def __init__(self, database: str = ":memory:"):
+        # One connection shared by the event loop and worker threads; the
+        # lock serializes statements, which SQLite does internally anyway
+        self.connection = sqlite3.connect(
+            database, check_same_thread=False, isolation_level=None
+        )
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.create_function(
+            "similarity", 2, _trigram_similarity, deterministic=True
+        )
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._columns: Dict[str, List[str]] = {}
+        self._functions: Dict[str, Callable[[Dict[str, Any]], Tuple[str, Dict]]] = {
+            "search_keywords": self._search_keywords_sql,
+        }
+        logger.info(f"Using SQLite storage backend at {database}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self.connection.close()
+
+    def _execute(self, sql: str, params: Any = ()) -> List[Dict[str, Any]]:
+        """Run one statement and return its rows as dicts."""
+        with self._lock:
+            try:
+                return [dict(row) for row in self.connection.execute(sql, params)]
+            except sqlite3.IntegrityError as e:
+                message = str(e)
+                code = next(
+                    (c for k, c in _INTEGRITY_CODES.items() if message.startswith(k)),
+                    "23000",
+                )
+                raise api_error(code, message) from e
+            except sqlite3.OperationalError as e:
+                raise api_error("42000", str(e)) from e
+
+    def _table_columns(self, table: str) -> List[str]:
+        """Column names of `table`, which also validates the table name."""
+        if table not in self._columns:
+            rows = self._execute(
+                "SELECT name FROM pragma_table_info(?) ORDER BY cid", (table,)
+            )
+            if not rows:
+                raise api_error("42P01", f'relation "{table}" does not exist')
+            self._columns[table] = [row["name"] for row in rows]
+        return self._columns[table]
+
+    def _column(self, table: str, column: str) -> str:
+        """Quote a column name after checking it exists on `table`."""
+        if column not in self._table_columns(table):
+            raise api_error("42703", f"column {table}.{column} does not exist")
+        return f'"{column}"'
+
+    def _select_list(self, table: str, columns: Optional[List[str]]) -> str:
+        """SQL select list for `columns` (all columns when None)."""
+        if not columns or columns == ["*"]:
+            return "*"
+        return ", ".join(self._column(table, column) for column in columns)
+
+    def _values(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate column names and adapt values for SQLite."""
+        values = {}
+        for column, value in data.items():
+            self._column(table, column)
+            values[column] = value.isoformat() if isinstance(value, datetime) else value
+        return values
+
+    def _select(
+        self,
+        table: str,
+        where: str = "",
+        params: Any = (),
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+        suffix: str = "",
+    ) -> List[Dict[str, Any]]:
+        """SELECT rows from `table` and attach the `embedded` resource."""
+        embed = parse_embedded(table, embedded) if embedded else None
+        select_columns = columns
+        if embed and columns and embed.column not in columns:
+            # The join needs the foreign key even if the caller did not ask
+            select_columns = [*columns, embed.column]
+
+        sql = f'SELECT {self._select_list(table, select_columns)} FROM "{table}"'
+        if where:
+            sql += f" WHERE {where}"
+        rows = self._execute(f"{sql} {suffix}".strip(), params)
+
+        if embed:
+            self._attach_embedded(rows, embed)
+            if select_columns is not columns:
+                for row in rows:
+                    row.pop(embed.column, None)
+        return rows
+
+    def _attach_embedded(self, rows: List[Dict[str, Any]], embed: Embedding) -> None:
+        """Fetch the related rows for `rows` in one query and nest them."""
+        keys = list({row[embed.column] for row in rows} - {None})
+        related: List[Dict[str, Any]] = []
+        if keys:
+            remote = self._column(embed.table, embed.remote)
+            placeholders = ", ".join("?" for _ in keys)
+            related = self._select(
+                embed.table,
+                f"{remote} IN ({placeholders})",
+                keys,
+                columns=embed.related_columns(),
+                suffix='ORDER BY "id"',
+            )
+        nest_embedded(rows, embed, related)
+
+    def create(self, table: str, data: dict) -> Dict[str, Any]:
+        """Create a new record in the specified table."""
+        values = self._values(table, data)
+        columns = ", ".join(f'"{column}"' for column in values)
+        placeholders = ", ".join(f":{column}" for column in values)
+        rows = self._execute(
+            f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders}) RETURNING *',
+            values,
+        )
+        return rows[0] if rows else {}
+
+    def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str,
+        ignore_duplicates: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert many records in one transaction. See SupabaseCRUD.upsert_many.
+        Only inserted (or, without `ignore_duplicates`, updated) rows return.
+        """
+        if not rows:
+            return []
+        conflict = self._column(table, on_conflict)
+        results = []
+        with self._lock:
+            self.connection.execute("BEGIN")
+            try:
+                for row in rows:
+                    values = self._values(table, row)
+                    columns = ", ".join(f'"{column}"' for column in values)
+                    placeholders = ", ".join(f":{column}" for column in values)
+                    if ignore_duplicates:
+                        action = "DO NOTHING"
+                    else:
+                        updates = ", ".join(
+                            f'"{column}" = excluded."{column}"' for column in values
+                        )
+                        action = f"DO UPDATE SET {updates}"
+                    results += self._execute(
+                        f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders}) '
+                        f"ON CONFLICT ({conflict}) {action} RETURNING *",
+                        values,
+                    )
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+        return results
+
+    def read(
+        self, table: str, id: int, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its ID."""
+        rows = self._select(table, '"id" = ?', (id,), columns)
+        return rows[0] if rows else None
+
+    def update(self, table: str, id: int, data: dict) -> Optional[Dict[str, Any]]:
+        """Update a record by its ID."""
+        values = self._values(table, data)
+        if not values:
+            return self.read(table, id)
+        assignments = ", ".join(f'"{column}" = :{column}' for column in values)
+        rows = self._execute(
+            f'UPDATE "{table}" SET {assignments} WHERE "id" = :_id RETURNING *',
+            {**values, "_id": id},
+        )
+        return rows[0] if rows else None
+
+    def delete(self, table: str, id: int) -> bool:
+        """Delete a record by its ID."""
+        self._table_columns(table)
+        rows = self._execute(f'DELETE FROM "{table}" WHERE "id" = ? RETURNING *', (id,))
+        return len(rows) > 0
+
+    def read_all(
+        self,
+        table: str,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records with pagination."""
+        return self._select(
+            table, columns=columns, params=(limit, offset), suffix="LIMIT ? OFFSET ?"
+        )
+
+    def read_page(
+        self,
+        table: str,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records ordered by id using keyset pagination."""
+        where, params = ('"id" > ?', [after_id]) if after_id is not None else ("", [])
+        return self._select(
+            table,
+            where,
+            [*params, limit],
+            columns,
+            embedded,
+            suffix='ORDER BY "id" LIMIT ?',
+        )
+
+    def read_changed_since(
+        self,
+        table: str,
+        column: str,
+        since: str,
+        limit: int = 100,
+        after: Optional[Tuple[str, Any]] = None,
+        key: str = "id",
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records changed since a timestamp, ordered for keyset paging."""
+        column_sql, key_sql = self._column(table, column), self._column(table, key)
+        where, params = f"{column_sql} >= ?", [since]
+        if after is not None:
+            where += f" AND ({column_sql} > ? OR ({column_sql} = ? AND {key_sql} > ?))"
+            params += [after[0], after[0], after[1]]
+        return self._select(
+            table,
+            where,
+            [*params, limit],
+            columns,
+            embedded,
+            suffix=f"ORDER BY {column_sql}, {key_sql} LIMIT ?",
+        )
+
+    def read_filtered(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records filtered by a column value."""
+        return self._select(
+            table, f"{self._column(table, column)} = ?", (value,), columns
+        )
+
+    def read_by_name(
+        self, table: str, name: str, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its name."""
+        rows = self.read_filtered(table, "name", name, columns)
+        return rows[0] if rows else None
+
+    def read_with_embedded(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        embedded: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single record together with an embedded related resource."""
+        rows = self._select(
+            table,
+            f"{self._column(table, column)} = ?",
+            (value,),
+            columns,
+            embedded,
+            suffix="LIMIT 1",
+        )
+        return rows[0] if rows else None
+
+    def read_in(
+        self,
+        table: str,
+        column: str,
+        values: List[Any],
+        embedded: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records whose `column` is one of `values`."""
+        if not values:
+            return []
+        placeholders = ", ".join("?" for _ in values)
+        return self._select(
+            table,
+            f"{self._column(table, column)} IN ({placeholders})",
+            list(values),
+            columns,
+            embedded,
+        )
+
+    def rpc(
+        self,
+        function: str,
+        params: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Call one of the Postgres functions from create_tables.sql, which are
+        re-implemented here as parameterized queries on the keywords table.
+        """
+        if function not in self._functions:
+            raise api_error(
+                "PGRST202", f"Could not find the function public.{function}"
+            )
+        where, query_params, suffix = self._functions[function](params)
+        return self._select("keywords", where, query_params, columns, embedded, suffix)
+
+    def _search_keywords_sql(self, params: Dict[str, Any]) -> Tuple[str, Dict, str]:
+        """search_keywords(): substring, trigram and description matches."""
+        term = params["search_query"].lower()
+        query_params = {
+            "term": term,
+            "pattern": _like_pattern(term),
+            "language": params.get("search_language"),
+            "threshold": SIMILARITY_THRESHOLD,
+            "max_results": params.get("max_results", 20),
+        }
+        where = (
+            "(:language IS NULL OR language = :language) AND ("
+            "lower(name) LIKE '%' || :pattern || '%' ESCAPE '\\' "
+            "OR similarity(lower(name), :term) >= :threshold "
+            "OR lower(coalesce(description, '')) LIKE '%' || :pattern || '%' "
+            "ESCAPE '\\')"
+        )
+        suffix = (
+            "ORDER BY lower(name) = :term DESC, "
+            "lower(name) LIKE :pattern || '%' ESCAPE '\\' DESC, "
+            "similarity(lower(name), :term) DESC, name "
+            "LIMIT :max_results"
+        )
+        return where, query_params, suffix
+
+    def get_related(
+        self, table: str, id: int, related_table: str, foreign_key: str
+    ) -> List[Dict[str, Any]]:
+        """Get related records from another table."""
+        return self.read_filtered(related_table, foreign_key, id)
+
+
+class AsyncSQLiteCRUD:
+    """
+    Coroutine interface over a SQLiteCRUD.
+
+    Statements run inline on the event loop: an in-process SQLite query is
+    faster than a thread hand-off. Shares the database with the sync
+    backend, so the API and the background generator see the same rows.
+    """
+
+    def __init__(self, crud: SQLiteCRUD):
+        self.crud = crud
+
+    async def create(self, table: str, data: dict) -> Dict[str, Any]:
+        """Create a new record in the specified table."""
+        return self.crud.create(table, data)
+
+    async def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str,
+        ignore_duplicates: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Insert many records in one transaction. See SupabaseCRUD.upsert_many."""
+        return self.crud.upsert_many(table, rows, on_conflict, ignore_duplicates)
+
+    async def read(
+        self, table: str, id: int, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its ID."""
+        return self.crud.read(table, id, columns)
+
+    async def update(self, table: str, id: int, data: dict) -> Optional[Dict[str, Any]]:
+        """Update a record by its ID."""
+        return self.crud.update(table, id, data)
+
+    async def delete(self, table: str, id: int) -> bool:
+        """Delete a record by its ID."""
+        return self.crud.delete(table, id)
+
+    async def read_all(
+        self,
+        table: str,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records with pagination."""
+        return self.crud.read_all(table, limit, offset, columns)
+
+    async def read_page(
+        self,
+        table: str,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records ordered by id using keyset pagination."""
+        return self.crud.read_page(table, limit, after_id, columns, embedded)
+
+    async def read_changed_since(
+        self,
+        table: str,
+        column: str,
+        since: str,
+        limit: int = 100,
+        after: Optional[Tuple[str, Any]] = None,
+        key: str = "id",
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records changed since a timestamp, ordered for keyset paging."""
+        return self.crud.read_changed_since(
+            table, column, since, limit, after, key, columns, embedded
+        )
+
+    async def read_filtered(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get records filtered by a column value."""
+        return self.crud.read_filtered(table, column, value, columns)
+
+    async def read_by_name(
+        self, table: str, name: str, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a record by its name."""
+        return self.crud.read_by_name(table, name, columns)
+
+    async def read_with_embedded(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        embedded: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single record together with an embedded related resource."""
+        return self.crud.read_with_embedded(table, column, value, embedded, columns)
+
+    async def read_in(
+        self,
+        table: str,
+        column: str,
+        values: List[Any],
+        embedded: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get all records whose `column` is one of `values`."""
+        return self.crud.read_in(table, column, values, embedded, columns)
+
+    async def rpc(
+        self,
+        function: str,
+        params: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Call a Postgres function from create_tables.sql. See SQLiteCRUD.rpc."""
+        return self.crud.rpc(function, params, columns, embedded)
+
+    async def get_related(
+        self, table: str, id: int, related_table: str, foreign_key: str
+    ) -> List[Dict[str, Any]]:
+        """Get related records from another table."""
+        return self.crud.get_related(table, id, related_table, foreign_key)
@@ -0,0 +1,293 @@
+"""
+Storage backend protocols.
+
+Services depend on these instead of a concrete client, so the Supabase
+PostgREST backend (app.core.db) can be swapped for the direct Postgres
+(app.core.postgres_db) or in-process SQLite (app.core.sqlite_db) backend
+through Settings.STORAGE_BACKEND. Every backend
+returns rows as plain dicts, embeds related rows the way PostgREST does and
+raises postgrest.APIError with the Postgres error code on constraint
+violations.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol, Tuple
+
+from postgrest import APIError
+
+# Named foreign keys usable as embedding hints: name -> (table, column,
+# referenced table). Mirrors the constraints in create_tables.sql.
+FOREIGN_KEYS = {
+    "fk_audio": ("keywords", "audio_id", "audio_files"),
+    "fk_keyword": ("audio_files", "keyword_id", "keywords"),
+}
+
+# PostgREST embedding syntax: alias:table!hint(columns)
+_EMBED_PATTERN = re.compile(
+    r"^\s*(?:(?P<alias>\w+):)?(?P<table>\w+)!(?P<hint>\w+)\((?P<columns>[^)]*)\)\s*$"
+)
+
+
+def utc_timestamp() -> str:
+    """
+    The current time as written to the TIMESTAMP columns: naive UTC in ISO
+    8601, whatever the host's time zone, like the columns' defaults.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def api_error(code: str, message: str) -> APIError:
+    """Build the APIError PostgREST would have returned for a Postgres error."""
+    return APIError({"code": code, "message": message, "details": None, "hint": None})
+
+
+class Embedding(NamedTuple):
+    """A resolved embedding: nest `table` rows under `alias`."""
+
+    alias: str
+    table: str
+    columns: List[str]
+    # Column of the parent row matched against `remote` on the related table
+    column: str
+    remote: str
+    # True when many related rows point at the parent (nested as a list)
+    many: bool
+
+    def related_columns(self) -> Optional[List[str]]:
+        """Columns to fetch from the related table (None for all)."""
+        if not self.columns or self.columns == ["*"]:
+            return None
+        if self.remote in self.columns:
+            return self.columns
+        return [*self.columns, self.remote]
+
+
+def parse_embedded(table: str, embedded: str) -> Embedding:
+    """
+    Resolve a PostgREST embedding like `audio:audio_files!fk_audio(*)` for
+    backends that do not speak PostgREST. Only FK-hinted embeddings are
+    supported, which is all the services use.
+    """
+    match = _EMBED_PATTERN.match(embedded)
+    if not match or match["hint"] not in FOREIGN_KEYS:
+        raise api_error("PGRST200", f"Could not resolve embedding {embedded}")
+
+    fk_table, fk_column, referenced = FOREIGN_KEYS[match["hint"]]
+    related = match["table"]
+    columns = [c.strip() for c in match["columns"].split(",") if c.strip()]
+    if fk_table == table and referenced == related:
+        # Many-to-one: this row's column points at the related row's id
+        return Embedding(
+            match["alias"] or related, related, columns, fk_column, "id", False
+        )
+    if fk_table == related and referenced == table:
+        # One-to-many: related rows point back at this row's id
+        return Embedding(
+            match["alias"] or related, related, columns, "id", fk_column, True
+        )
+    raise api_error("PGRST200", f"Could not resolve embedding {embedded}")
+
+
+def nest_embedded(
+    rows: List[Dict[str, Any]], embedding: Embedding, related: List[Dict[str, Any]]
+) -> None:
+    """Attach the fetched `related` rows to their parent `rows` in place."""
+    if embedding.many:
+        grouped: Dict[Any, List[Dict[str, Any]]] = {}
+        for item in related:
+            grouped.setdefault(item[embedding.remote], []).append(item)
+        for row in rows:
+            row[embedding.alias] = grouped.get(row[embedding.column], [])
+    else:
+        by_key = {item[embedding.remote]: item for item in related}
+        for row in rows:
+            row[embedding.alias] = by_key.get(row[embedding.column])
+
+
+class StorageBackend(Protocol):
+    """Blocking CRUD operations, as implemented by SupabaseCRUD."""
+
+    def create(self, table: str, data: dict) -> Dict[str, Any]: ...
+
+    def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str,
+        ignore_duplicates: bool = True,
+    ) -> List[Dict[str, Any]]: ...
+
+    def read(
+        self, table: str, id: int, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def update(self, table: str, id: int, data: dict) -> Optional[Dict[str, Any]]: ...
+
+    def delete(self, table: str, id: int) -> bool: ...
+
+    def read_all(
+        self,
+        table: str,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    def read_page(
+        self,
+        table: str,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    def read_changed_since(
+        self,
+        table: str,
+        column: str,
+        since: str,
+        limit: int = 100,
+        after: Optional[Tuple[str, Any]] = None,
+        key: str = "id",
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    def read_filtered(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    def read_by_name(
+        self, table: str, name: str, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def read_with_embedded(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        embedded: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]: ...
+
+    def read_in(
+        self,
+        table: str,
+        column: str,
+        values: List[Any],
+        embedded: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    def rpc(
+        self,
+        function: str,
+        params: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    def get_related(
+        self, table: str, id: int, related_table: str, foreign_key: str
+    ) -> List[Dict[str, Any]]: ...
+
+
+class AsyncStorageBackend(Protocol):
+    """The StorageBackend operations as coroutines, as in AsyncSupabaseCRUD."""
+
+    async def create(self, table: str, data: dict) -> Dict[str, Any]: ...
+
+    async def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str,
+        ignore_duplicates: bool = True,
+    ) -> List[Dict[str, Any]]: ...
+
+    async def read(
+        self, table: str, id: int, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]: ...
+
+    async def update(
+        self, table: str, id: int, data: dict
+    ) -> Optional[Dict[str, Any]]: ...
+
+    async def delete(self, table: str, id: int) -> bool: ...
+
+    async def read_all(
+        self,
+        table: str,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    async def read_page(
+        self,
+        table: str,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    async def read_changed_since(
+        self,
+        table: str,
+        column: str,
+        since: str,
+        limit: int = 100,
+        after: Optional[Tuple[str, Any]] = None,
+        key: str = "id",
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    async def read_filtered(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    async def read_by_name(
+        self, table: str, name: str, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]: ...
+
+    async def read_with_embedded(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        embedded: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]: ...
+
+    async def read_in(
+        self,
+        table: str,
+        column: str,
+        values: List[Any],
+        embedded: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    async def rpc(
+        self,
+        function: str,
+        params: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        embedded: Optional[str] = None,
+    ) -> List[Dict[str, Any]]: ...
+
+    async def get_related(
+        self, table: str, id: int, related_table: str, foreign_key: str
+    ) -> List[Dict[str, Any]]: ...
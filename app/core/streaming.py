@@ -0,0 +1,49 @@
+"""
+Helpers for streaming large responses.
+
+Rows are serialized as newline-delimited JSON and flushed in fixed-size
+chunks, optionally gzip-compressed on the fly, so memory stays bounded by
+one chunk regardless of how many rows are streamed.
+"""
+
+import json
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Dict
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Bytes buffered before a chunk is handed to the response
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+async def ndjson_chunks(
+    rows: AsyncIterable[Dict[str, Any]], chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Serialize rows as NDJSON, grouping lines into chunks of ~`chunk_size`."""
+    buffer = bytearray()
+    async for row in rows:
+        buffer += json.dumps(row, separators=(",", ":"), default=str).encode()
+        buffer += b"\n"
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def gzip_chunks(
+    chunks: AsyncIterable[bytes], level: int = 6
+) -> AsyncIterator[bytes]:
+    """
+    Gzip-compress a byte stream incrementally.
+
+    Each input chunk is sync-flushed so compressed bytes reach the client as
+    soon as the chunk is produced rather than when the stream ends.
+    """
+    # wbits=31 selects the gzip container instead of raw zlib
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,31 @@
+"""
+pg_trgm-style trigram similarity.
+
+Shared by the in-process keyword search index (app.services.keyword_search)
+and the SQLite backend's similarity() SQL function, so both rank typos the
+way the search_keywords Postgres function does.
+"""
+
+from typing import Set
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word padded like pg_trgm ("  word ")."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def inner_trigrams(text: str) -> Set[str]:
+    """Unpadded trigrams, which every string containing `text` must have."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
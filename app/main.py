@@ -1,18 +1,27 @@
+import asyncio
 import json
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import keyword_router, pictogram_router, voice_router
+from app.api import admin_router, keyword_router, pictogram_router, voice_router
 from app.core.config import settings
+from app.core.container import ServiceContainer
+from app.core.migrations import migrate
+from app.core.pagination import NEXT_CURSOR_HEADER
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Run startup events
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        await asyncio.to_thread(migrate, settings.DATABASE_URL)
+    app.state.services = await ServiceContainer.create()
+    await app.state.services.start()
     yield
     # Run shutdown events
+    await app.state.services.aclose()
 
 
 def create_application() -> FastAPI:
@@ -40,6 +49,7 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],
     )
 
     return application
@@ -49,6 +59,7 @@ app = create_application()
 
 # Include routers
 app.include_router(keyword_router, prefix=settings.API_V1_STR)
+app.include_router(admin_router, prefix=settings.API_V1_STR)
 app.include_router(pictogram_router)
 app.include_router(voice_router)
 # app.include_router(image_router)
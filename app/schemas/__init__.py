@@ -1,22 +1,44 @@
 from .audio import AudioBase, AudioCreate, AudioRead, AudioUpdate
+from .generation import GenerationJobRead
 from .keyword import (
     KeywordBase,
+    KeywordBulkCreate,
+    KeywordBulkCreateResponse,
+    KeywordBulkItemResult,
     KeywordCreate,
     KeywordRead,
     KeywordReadDetailed,
     KeywordUpdate,
 )
-from .keyword_audio import KeywordAudioResponse
+from .keyword_audio import (
+    KeywordAudioBatchItem,
+    KeywordAudioBatchRequest,
+    KeywordAudioBatchResponse,
+    KeywordAudioResponse,
+    KeywordChange,
+    KeywordChangesResponse,
+    KeywordSearchHit,
+)
 
 __all__ = [
     "AudioBase",
     "AudioCreate",
     "AudioRead",
     "AudioUpdate",
+    "GenerationJobRead",
     "KeywordBase",
     "KeywordCreate",
+    "KeywordBulkCreate",
+    "KeywordBulkCreateResponse",
+    "KeywordBulkItemResult",
     "KeywordRead",
     "KeywordReadDetailed",
     "KeywordUpdate",
     "KeywordAudioResponse",
+    "KeywordAudioBatchItem",
+    "KeywordAudioBatchRequest",
+    "KeywordAudioBatchResponse",
+    "KeywordChange",
+    "KeywordChangesResponse",
+    "KeywordSearchHit",
 ]
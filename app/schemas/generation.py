@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Dict, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class GenerationJobRead(BaseModel):
+    """Status of a keyword's latest content generation job."""
+
+    id: int
+    keyword_id: int
+    keyword_name: str
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    # Status of each pipeline stage: pending, running, succeeded or failed
+    stages: Dict[str, str]
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    # When a queued job becomes due (later than created_at for retries)
+    run_at: datetime
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": 12,
+                "keyword_id": 7,
+                "keyword_name": "TV",
+                "status": "queued",
+                "stages": {"picture": "failed", "voice": "succeeded"},
+                "attempts": 1,
+                "max_attempts": 5,
+                "last_error": "picture: No pictures found for keyword: TV",
+                "run_at": "2025-05-02T11:31:00.000000",
+                "created_at": "2025-05-02T11:30:00.000000",
+                "updated_at": "2025-05-02T11:30:30.000000",
+            }
+        }
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -61,3 +61,31 @@ class KeywordReadDetailed(KeywordRead):
                 data["audio"] = None
 
         return data
+
+
+class KeywordBulkCreate(BaseModel):
+    """
+    Request schema for creating many keywords at once.
+
+    Items are validated one by one against KeywordCreate, so a malformed
+    item is reported as failed instead of rejecting the whole request.
+    """
+
+    items: List[Dict[str, Any]]
+
+
+class KeywordBulkItemResult(BaseModel):
+    """Outcome for one item of a bulk create, in request order."""
+
+    index: int
+    name: Optional[str] = None
+    status: Literal["created", "existing", "failed"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class KeywordBulkCreateResponse(BaseModel):
+    results: List[KeywordBulkItemResult]
+    created: int
+    existing: int
+    failed: int
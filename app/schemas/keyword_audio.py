@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -30,3 +31,53 @@ class KeywordAudioResponse(BaseModel):
                 "voice_woman_url": "https://faac.fra1.cdn.digitaloceanspaces.com/voice_clips/TV_woman.mp3",
             }
         }
+
+
+class KeywordAudioBatchRequest(BaseModel):
+    """Request schema for resolving many keyword names in one call."""
+
+    names: List[str]
+    language: Optional[str] = None
+
+    class Config:
+        json_schema_extra = {"example": {"names": ["TV", "eat", "drink"]}}
+
+
+class KeywordAudioBatchItem(BaseModel):
+    """One resolved name in a batch lookup; `keyword` is None on a miss."""
+
+    name: str
+    found: bool
+    keyword: Optional[KeywordAudioResponse] = None
+
+
+class KeywordAudioBatchResponse(BaseModel):
+    """Batch lookup results in request order, plus the names that were missed."""
+
+    results: List[KeywordAudioBatchItem]
+    missing: List[str]
+
+
+class KeywordChange(KeywordAudioResponse):
+    """A keyword upserted since the last sync, with its audio URLs."""
+
+    updated_at: datetime
+
+
+class KeywordChangesResponse(BaseModel):
+    """
+    One page of a delta sync. Apply `upserted` then drop the `deleted` ids;
+    follow `next_cursor` until it is None, then keep `next_since`.
+    """
+
+    upserted: List[KeywordChange]
+    deleted: List[int]
+    next_since: datetime
+    next_cursor: Optional[str] = None
+
+
+class KeywordSearchHit(KeywordAudioResponse):
+    """A search result with its relevance score and how the name matched."""
+
+    score: float
+    match: Literal["exact", "prefix", "substring", "fuzzy", "description"]
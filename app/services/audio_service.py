@@ -1,14 +1,20 @@
-from datetime import datetime
 from typing import List, Optional
 
+from supabase import Client
+
+from app.core.storage import StorageBackend, utc_timestamp
 from app.models import Audio
 from app.schemas import AudioCreate, AudioUpdate
 from app.services.base_service import SupabaseService
 
 
 class AudioService(SupabaseService):
-    def __init__(self):
-        super().__init__(table_name="audio_files", model_class=Audio)
+    def __init__(
+        self, client: Optional[Client] = None, crud: Optional[StorageBackend] = None
+    ):
+        super().__init__(
+            table_name="audio_files", model_class=Audio, client=client, crud=crud
+        )
 
     def create(self, audio: AudioCreate) -> Optional[Audio]:
         """Create a new audio record in Supabase."""
@@ -16,7 +22,7 @@ class AudioService(SupabaseService):
         audio_data = audio.model_dump()
 
         # Add timestamp field
-        audio_data["created_at"] = datetime.now().isoformat()
+        audio_data["created_at"] = utc_timestamp()
 
         # Create in Supabase
         return super().create(audio_data)
@@ -45,17 +51,14 @@ class AudioService(SupabaseService):
         self, keyword_id: int, language_id: int
     ) -> List[Audio]:
         """Get all audio records for a specific keyword and language from Supabase."""
-        # This requires a more complex query that filters on two conditions
-        # We'll use the raw Supabase client for this
-        result = (
-            self.supabase_client.table("audio_files")
-            .select("*")
-            .eq("keyword_id", keyword_id)
-            .eq("language_id", language_id)
-            .execute()
+        # Filter on the keyword in the backend and on the language here, so
+        # this works with any storage backend
+        rows = self.supabase_crud.read_filtered(
+            self.table_name, "keyword_id", keyword_id
+        )
+        return self._convert_list_to_models(
+            [row for row in rows if row.get("language_id") == language_id]
         )
-
-        return self._convert_list_to_models(result.data)
 
     def update(self, audio_id: int, audio_update: AudioUpdate) -> Optional[Audio]:
         """Update an audio record by its ID in Supabase."""
@@ -1,8 +1,10 @@
 from typing import Any, Dict, List, Optional, Type, TypeVar
 
 from sqlmodel import SQLModel
+from supabase import AsyncClient, Client
 
-from app.core import SupabaseCRUD, get_supabase_client
+from app.core import AsyncSupabaseCRUD, SupabaseCRUD, get_supabase_client
+from app.core.storage import AsyncStorageBackend, StorageBackend
 
 T = TypeVar("T", bound=SQLModel)
 
@@ -10,11 +12,20 @@ T = TypeVar("T", bound=SQLModel)
 class SupabaseService:
     """Base service class for Supabase operations."""
 
-    def __init__(self, table_name: str, model_class: Type[T]):
+    def __init__(
+        self,
+        table_name: str,
+        model_class: Type[T],
+        client: Optional[Client] = None,
+        crud: Optional[StorageBackend] = None,
+    ):
         self.table_name = table_name
         self.model_class = model_class
-        self.supabase_client = get_supabase_client()
-        self.supabase_crud = SupabaseCRUD(self.supabase_client)
+        if crud is None:
+            # Reuse the shared client when given; otherwise open a dedicated one
+            crud = SupabaseCRUD(client or get_supabase_client())
+        # Named for the default backend; any StorageBackend works
+        self.supabase_crud = crud
 
     def _convert_to_model(self, data: Dict[str, Any]) -> Optional[T]:
         """Convert dictionary data to a model instance."""
@@ -48,6 +59,14 @@ class SupabaseService:
         )
         return self._convert_list_to_models(results)
 
+    def list_rows(
+        self, limit: int = 100, offset: int = 0, columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get a page of raw records, optionally restricted to `columns`."""
+        return self.supabase_crud.read_all(
+            self.table_name, limit=limit, offset=offset, columns=columns
+        )
+
     def update(self, id: int, data: Dict[str, Any]) -> Optional[T]:
         """Update a record by its ID."""
         result = self.supabase_crud.update(self.table_name, id, data)
@@ -76,3 +95,79 @@ class SupabaseService:
         if not related_model_class:
             return results
         return [related_model_class.model_validate(item) for item in results if item]
+
+
+class AsyncSupabaseService:
+    """
+    Base service class for async Supabase operations.
+
+    Mirrors SupabaseService, but awaits the async Supabase client so that
+    requests scale with the event loop instead of the worker thread pool.
+    The client must be created up front (see get_async_supabase_client),
+    unless another AsyncStorageBackend is passed as `crud`.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        model_class: Type[T],
+        client: Optional[AsyncClient] = None,
+        crud: Optional[AsyncStorageBackend] = None,
+    ):
+        self.table_name = table_name
+        self.model_class = model_class
+        self.supabase_crud = crud or AsyncSupabaseCRUD(client)
+
+    def _convert_to_model(self, data: Dict[str, Any]) -> Optional[T]:
+        """Convert dictionary data to a model instance."""
+        if not data:
+            return None
+        return self.model_class.model_validate(data)
+
+    def _convert_list_to_models(self, data_list: List[Dict[str, Any]]) -> List[T]:
+        """Convert a list of dictionaries to model instances."""
+        return [self._convert_to_model(item) for item in data_list if item]
+
+    async def create(self, data: Dict[str, Any]) -> Optional[T]:
+        """Create a new record."""
+        result = await self.supabase_crud.create(self.table_name, data)
+        return self._convert_to_model(result)
+
+    async def get_by_id(self, id: int) -> Optional[T]:
+        """Get a record by its ID."""
+        result = await self.supabase_crud.read(self.table_name, id)
+        return self._convert_to_model(result)
+
+    async def get_by_name(self, name: str) -> Optional[T]:
+        """Get a record by its name."""
+        result = await self.supabase_crud.read_by_name(self.table_name, name)
+        return self._convert_to_model(result)
+
+    async def list(self, limit: int = 100, offset: int = 0) -> List[T]:
+        """Get a list of records with pagination."""
+        results = await self.supabase_crud.read_all(
+            self.table_name, limit=limit, offset=offset
+        )
+        return self._convert_list_to_models(results)
+
+    async def list_rows(
+        self, limit: int = 100, offset: int = 0, columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get a page of raw records, optionally restricted to `columns`."""
+        return await self.supabase_crud.read_all(
+            self.table_name, limit=limit, offset=offset, columns=columns
+        )
+
+    async def update(self, id: int, data: Dict[str, Any]) -> Optional[T]:
+        """Update a record by its ID."""
+        result = await self.supabase_crud.update(self.table_name, id, data)
+        return self._convert_to_model(result)
+
+    async def delete(self, id: int) -> bool:
+        """Delete a record by its ID."""
+        return await self.supabase_crud.delete(self.table_name, id)
+
+    async def get_by_field(self, field: str, value: Any) -> List[T]:
+        """Get records filtered by a field value."""
+        results = await self.supabase_crud.read_filtered(self.table_name, field, value)
+        return self._convert_list_to_models(results)
@@ -7,6 +7,7 @@ import openai
 from loguru import logger
 
 from app.core import settings
+from app.core.rate_limit import get_rate_limiters
 
 
 class ImageJudge:
@@ -118,7 +119,7 @@ class ImageJudge:
                 }
             )
             content.append(
-                {"type": "input_text", "text": f"Image {i+1}: {image_paths[i].name}"}
+                {"type": "input_text", "text": f"Image {i + 1}: {image_paths[i].name}"}
             )
 
         # Add the final question
@@ -132,8 +133,11 @@ class ImageJudge:
 
         try:
             # Using the new responses API format
-            response = self.client.responses.create(
-                model=self.model, input=[{"role": "user", "content": content}]
+            response = get_rate_limiters().call(
+                "openai",
+                self.client.responses.create,
+                model=self.model,
+                input=[{"role": "user", "content": content}],
             )
 
             # Extract the result from the API response
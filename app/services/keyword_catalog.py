@@ -0,0 +1,298 @@
+"""
+Preloaded in-memory keyword catalog.
+
+The catalog is small enough to hold in every API process: all keywords with
+their voice URLs are loaded at startup into compact `__slots__` records
+indexed by name and id, and a background task applies the delta-sync change
+stream (upserts by updated_at, deletes from tombstones) every few seconds.
+Audio lookups are then answered from memory without a network call, except
+for keywords still waiting for generated content, which are read from
+storage until the refresh brings them in complete.
+
+Each refresh re-reads an overlap window before its position, so a write
+that committed late with an earlier updated_at (or on a host whose clock
+is behind) is still applied; entries already at that updated_at are
+skipped. A periodic full reload bounds whatever the stream still misses.
+
+Only audio lookups are served from the catalog: keyword detail and list
+reads need fields it does not hold (description, created_at) and stay on
+the read cache.
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from app.services.keyword_service import KeywordService
+
+# Lower bound for the first incremental refresh when the catalog is empty
+_EPOCH = "1970-01-01T00:00:00"
+
+
+class CatalogEntry:
+    """One keyword with its voice URLs, shaped like KeywordAudioResponse."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "language",
+        "pictogram_url",
+        "audio_id",
+        "voice_man_url",
+        "voice_woman_url",
+        "updated_at",
+    )
+
+    def __init__(self, row: Dict[str, Any]):
+        self.id = row["id"]
+        self.name = row["name"]
+        # A handful of distinct languages, shared instead of one str per row
+        self.language = sys.intern(row["language"])
+        self.pictogram_url = row.get("pictogram_url")
+        self.audio_id = row.get("audio_id")
+        self.voice_man_url = row.get("voice_man_url")
+        self.voice_woman_url = row.get("voice_woman_url")
+        self.updated_at = row.get("updated_at")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The entry as a KeywordAudioResponse dict (plus updated_at)."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class KeywordCatalog:
+    """All keywords with audio URLs, held in memory and refreshed by delta sync."""
+
+    def __init__(
+        self,
+        keyword_service: "KeywordService",
+        refresh_seconds: float = 10.0,
+        page_size: int = 500,
+        overlap_seconds: float = 60.0,
+        full_reload_seconds: Optional[float] = None,
+    ):
+        self.keyword_service = keyword_service
+        self.refresh_seconds = refresh_seconds
+        self.page_size = page_size
+        self.overlap_seconds = overlap_seconds
+        self.full_reload_seconds = full_reload_seconds
+        self._by_name: Dict[str, CatalogEntry] = {}
+        self._by_id: Dict[int, CatalogEntry] = {}
+        # Change-stream position: every change committed before it has been
+        # applied, give or take the overlap window re-read by each refresh
+        self.since = _EPOCH
+        self.loaded_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+        self.refreshes = 0
+        self.full_reloads = 0
+        # Local writes seen while a full reload is paging, applied to the new
+        # contents before they replace the current ones
+        self._discarded: Optional[List[Tuple[Optional[int], Optional[str]]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Look up a keyword by exact name, as a fresh dict."""
+        entry = self._by_name.get(name)
+        return entry.to_dict() if entry is not None else None
+
+    def get_by_id(self, keyword_id: int) -> Optional[Dict[str, Any]]:
+        """Look up a keyword by id, as a fresh dict."""
+        entry = self._by_id.get(keyword_id)
+        return entry.to_dict() if entry is not None else None
+
+    def upsert(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add or replace entries, dropping the old name of renamed keywords.
+        Rows already held at the same updated_at are skipped. Returns the
+        number of entries changed.
+        """
+        return sum(_put(self._by_id, self._by_name, row) for row in rows)
+
+    def discard(
+        self, keyword_id: Optional[int] = None, name: Optional[str] = None
+    ) -> bool:
+        """
+        Forget a keyword after a local write. Lookups fall through to the
+        database until the next refresh brings the new version back. Returns
+        whether an entry was dropped.
+        """
+        if self._discarded is not None:
+            self._discarded.append((keyword_id, name))
+        return _pop(self._by_id, self._by_name, keyword_id, name)
+
+    async def load(self) -> None:
+        """
+        Load the whole catalog into new indexes, then swap them in: lookups
+        keep using the current contents while it pages.
+        """
+        started = time.perf_counter()
+        started_at = _utcnow()
+        by_id: Dict[int, CatalogEntry] = {}
+        by_name: Dict[str, CatalogEntry] = {}
+        newest = datetime.fromisoformat(_EPOCH)
+        self._discarded = []
+        try:
+            async for row in self.keyword_service.iter_catalog(self.page_size):
+                _put(by_id, by_name, row)
+                if row.get("updated_at"):
+                    newest = max(newest, datetime.fromisoformat(row["updated_at"]))
+            for keyword_id, name in self._discarded:
+                _pop(by_id, by_name, keyword_id, name)
+        finally:
+            self._discarded = None
+        self._by_id, self._by_name = by_id, by_name
+        # Writes committed after paging started carry an updated_at close to
+        # or after started_at, which the next refresh re-reads
+        self.since = min(newest, started_at).isoformat()
+        self.loaded_at = self.refreshed_at = time.time()
+        logger.info(
+            f"Loaded {len(self)} keywords into the in-memory catalog in "
+            f"{time.perf_counter() - started:.2f}s "
+            f"(~{self.memory_usage() / 1024:.0f} KiB)"
+        )
+
+    async def refresh(self) -> int:
+        """
+        Apply every change since the last refresh, re-reading the last
+        `overlap_seconds` before it. Returns the number of entries changed.
+        """
+        applied = 0
+        since = datetime.fromisoformat(self.since) - timedelta(
+            seconds=self.overlap_seconds
+        )
+        changes = await self.keyword_service.list_changes(
+            since=max(since, datetime.fromisoformat(_EPOCH)), limit=self.page_size
+        )
+        while True:
+            applied += self.upsert(changes["upserted"])
+            for keyword_id in changes["deleted"]:
+                applied += self.discard(keyword_id=keyword_id)
+            if not changes["next_cursor"]:
+                break
+            changes = await self.keyword_service.list_changes(
+                limit=self.page_size, cursor=changes["next_cursor"]
+            )
+        self.since = changes["next_since"]
+        self.refreshed_at = time.time()
+        self.refreshes += 1
+        return applied
+
+    async def start(self) -> None:
+        """Load the catalog and keep refreshing it in the background."""
+        await self.load()
+        self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self) -> None:
+        """Stop the background refresh."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_forever(self) -> None:
+        """
+        Refresh every `refresh_seconds` and reload everything every
+        `full_reload_seconds`, keeping the last good state on errors.
+        """
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                if (
+                    self.full_reload_seconds
+                    and time.time() - self.loaded_at >= self.full_reload_seconds
+                ):
+                    await self.load()
+                    self.full_reloads += 1
+                    continue
+                applied = await self.refresh()
+                if applied:
+                    logger.debug(f"Applied {applied} keyword changes to the catalog")
+            except Exception as e:
+                logger.error(f"Keyword catalog refresh failed: {e}")
+
+    def memory_usage(self) -> int:
+        """
+        Approximate bytes held by the catalog: both index dicts, the entries
+        and every distinct object they reference (interned strings once).
+        """
+        seen = set()
+        total = sys.getsizeof(self._by_name) + sys.getsizeof(self._by_id)
+        for keyword_id, entry in self._by_id.items():
+            values = [getattr(entry, slot) for slot in entry.__slots__]
+            for obj in (keyword_id, entry, *values):
+                if obj is not None and id(obj) not in seen:
+                    seen.add(id(obj))
+                    total += sys.getsizeof(obj)
+        return total
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, memory and refresh state of the catalog."""
+        size = len(self)
+        memory = self.memory_usage()
+        return {
+            "size": size,
+            "memory_bytes": memory,
+            "memory_bytes_per_10k": round(memory / size * 10_000) if size else 0,
+            "since": self.since,
+            "loaded_at": self.loaded_at,
+            "refreshed_at": self.refreshed_at,
+            "refreshes": self.refreshes,
+            "refresh_seconds": self.refresh_seconds,
+            "overlap_seconds": self.overlap_seconds,
+            "full_reloads": self.full_reloads,
+            "full_reload_seconds": self.full_reload_seconds,
+        }
+
+
+def _utcnow() -> datetime:
+    """Now as a naive UTC datetime, like the updated_at columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _put(
+    by_id: Dict[int, CatalogEntry],
+    by_name: Dict[str, CatalogEntry],
+    row: Dict[str, Any],
+) -> bool:
+    """Index a row unless it is already held at its updated_at."""
+    previous = by_id.get(row["id"])
+    if previous is not None:
+        if row.get("updated_at") and previous.updated_at == row["updated_at"]:
+            return False
+        if by_name.get(previous.name) is previous:
+            del by_name[previous.name]
+    entry = CatalogEntry(row)
+    by_id[entry.id] = entry
+    by_name[entry.name] = entry
+    return True
+
+
+def _pop(
+    by_id: Dict[int, CatalogEntry],
+    by_name: Dict[str, CatalogEntry],
+    keyword_id: Optional[int],
+    name: Optional[str],
+) -> bool:
+    """Drop a keyword from both indexes by id and/or name."""
+    dropped = False
+    entry = by_id.pop(keyword_id, None) if keyword_id is not None else None
+    if entry is not None:
+        dropped = True
+        if by_name.get(entry.name) is entry:
+            del by_name[entry.name]
+    if name is not None:
+        entry = by_name.pop(name, None)
+        if entry is not None:
+            dropped = True
+            by_id.pop(entry.id, None)
+    return dropped
@@ -1,35 +1,99 @@
+import asyncio
 import os
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from loguru import logger
+from supabase import Client
 
 from app.core import SupabaseCRUD, get_supabase_client, settings
+from app.core.cache import TTLCache
+from app.core.executors import IMAGE, STORAGE, StageExecutors
+from app.core.job_queue import FAILED, GENERATION_STAGES, RUNNING, SUCCEEDED
+from app.core.storage import StorageBackend, utc_timestamp
 from app.models import Keyword, Voice
 from app.services.bg_remover import remove_background
 from app.services.do_bucket import DOSpacesClient
+from app.services.keyword_service import invalidate_cached_keyword
 from app.services.pictogram_generator_ideogram import generate_pictogram_ideogram
 from app.services.voice_generator import generate_voice
 
+if TYPE_CHECKING:
+    from app.services.image_judge import ImageJudge
+
+
+# AI providers the pipeline calls, for per-provider concurrency limits
+PROVIDERS = ("ideogram", "openai", "elevenlabs")
+
+# Called with (stage, status) as each pipeline stage starts and ends
+StageCallback = Callable[[str, str], Awaitable[None]]
+
+
+class GenerationStageError(Exception):
+    """A pipeline stage finished without producing its content."""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(f"{stage}: {message}")
+        self.stage = stage
+
 
 class KeywordContentGenerator:
     """
     Service to generate content (pictograms and audio) for keywords.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        supabase_client: Optional[Client] = None,
+        image_judge: Optional["ImageJudge"] = None,
+        do_client: Optional[DOSpacesClient] = None,
+        keyword_cache: Optional[TTLCache] = None,
+        crud: Optional[StorageBackend] = None,
+        executors: Optional[StageExecutors] = None,
+        provider_concurrency: Optional[Dict[str, int]] = None,
+    ):
         # Lazy import ImageJudge to avoid circular dependency
         from app.services.image_judge import ImageJudge
 
-        self.image_judge = ImageJudge()
-        self.do_client = DOSpacesClient()
+        # Shared clients are injected by the ServiceContainer; fall back to
+        # dedicated ones for standalone use.
+        self.image_judge = image_judge or ImageJudge()
+        self.do_client = do_client or DOSpacesClient()
 
         # Ensure directories exist
         self._initialize_directories()
 
-        # Initialize Supabase client
-        self.supabase_client = get_supabase_client()
-        self.supabase_crud = SupabaseCRUD(self.supabase_client)
+        # Storage backend; defaults to a Supabase client
+        self.supabase_crud = crud or SupabaseCRUD(
+            supabase_client or get_supabase_client()
+        )
+
+        # Keyword read cache shared with KeywordService, invalidated on writes
+        self.keyword_cache = keyword_cache
+
+        # Pools that run the blocking pipeline stages off the event loop
+        self.executors = executors or StageExecutors()
+
+        # Calls in flight per provider (see PROVIDERS), shared by every
+        # keyword generated at the same time; unlisted providers are unlimited.
+        # The provider functions also pass app.core.rate_limit, which holds
+        # the same limit process-wide; waiting here instead keeps the
+        # provider's threads free for calls from elsewhere (the /pictogram
+        # and /voice routes).
+        self.provider_limits = {
+            provider: asyncio.Semaphore(limit)
+            for provider, limit in (provider_concurrency or {}).items()
+        }
 
     def _initialize_directories(self) -> None:
         """Initialize necessary directories for storing assets."""
@@ -71,30 +135,62 @@ class KeywordContentGenerator:
         except Exception as e:
             logger.error(f"Error cleaning up pictogram files for {keyword_name}: {e}")
 
-    async def generate_content_for_keyword(self, keyword: Keyword) -> Keyword:
+    async def generate_content_for_keyword(
+        self,
+        keyword: Keyword,
+        stages: Iterable[str] = GENERATION_STAGES,
+        on_stage: Optional[StageCallback] = None,
+    ) -> Keyword:
         """
         Generate pictogram and audio for a keyword.
 
-        Steps:
-        1. Generate pictures for the keyword
-        2. Judge the best picture
-        3. Generate voice clips
-        4. Update the keyword with pictogram and audio
-        5. Return the updated keyword
+        Once the keyword row exists, two independent stages run
+        concurrently, so a keyword takes about as long as the slower one:
+        - picture: generate, judge the best, remove its background, upload
+        - voice: generate the man and woman voices in parallel, upload them
+        Blocking calls run on the stage executors. Each stage saves only its
+        own columns, and the updated keyword merges them.
+
+        `stages` limits the run to some stages (a retry skips those that
+        already succeeded) and `on_stage` is told when each starts and ends.
+        When a stage fails, the other still completes and the first error
+        (a GenerationStageError when nothing was produced) is raised.
         """
         try:
             # Get or create keyword in database
-            db_keyword = self._get_or_create_keyword(keyword)
-
-            # 1. Generate pictures
-            logger.info(f"Generating pictures for keyword: {db_keyword['name']}")
-            await self._generate_pictures(db_keyword["name"])
+            db_keyword = await self.executors.run(
+                STORAGE, self._get_or_create_keyword, keyword
+            )
 
-            # 2. Process the best picture
-            db_keyword = await self._process_best_picture(db_keyword)
+            branches = {
+                "picture": (self._process_picture, "pictogram_url"),
+                "voice": (self._process_voice_clips, "audio_id"),
+            }
+            selected = [stage for stage in GENERATION_STAGES if stage in set(stages)]
+            results = await asyncio.gather(
+                *(
+                    self._run_stage(
+                        stage, branches[stage][0], dict(db_keyword), on_stage
+                    )
+                    for stage in selected
+                ),
+                return_exceptions=True,
+            )
 
-            # 3. Generate and save voice clips
-            db_keyword = await self._process_voice_clips(db_keyword)
+            saved_at = []
+            for stage, result in zip(selected, results):
+                if isinstance(result, BaseException):
+                    continue
+                column = branches[stage][1]
+                db_keyword[column] = result.get(column)
+                # Stages stamp updated_at with the same isoformat when they save
+                saved_at.append(result["updated_at"])
+            if saved_at:
+                db_keyword["updated_at"] = max(saved_at)
+
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                raise errors[0]
 
             logger.info(
                 f"Content generation completed successfully for keyword: {db_keyword['name']}"
@@ -105,6 +201,29 @@ class KeywordContentGenerator:
             # Re-raise to allow the background task system to log it
             raise
 
+    async def generate_content_for_keywords(
+        self, keywords: List[Keyword]
+    ) -> List[Keyword]:
+        """
+        Generate pictograms and audio for a batch of keywords.
+
+        Runs as a single background job. A failure for one keyword is logged
+        and does not stop the rest of the batch.
+        """
+        logger.info(f"Generating content for a batch of {len(keywords)} keywords")
+        generated = []
+        for keyword in keywords:
+            try:
+                generated.append(await self.generate_content_for_keyword(keyword))
+            except Exception as e:
+                logger.error(f"Content generation failed for {keyword.name}: {e}")
+
+        logger.info(
+            f"Batch content generation finished: "
+            f"{len(generated)}/{len(keywords)} succeeded"
+        )
+        return generated
+
     def _get_or_create_keyword(self, keyword: Keyword) -> dict:
         """Get existing keyword or create a new one."""
         db_keywords = self.supabase_crud.read_filtered("keywords", "name", keyword.name)
@@ -122,6 +241,7 @@ class KeywordContentGenerator:
                 keyword_dict["language"] = keyword.language
 
             self.supabase_crud.create("keywords", keyword_dict)
+            invalidate_cached_keyword(self.keyword_cache, name=keyword.name)
             db_keywords = self.supabase_crud.read_filtered(
                 "keywords", "name", keyword.name
             )
@@ -134,15 +254,61 @@ class KeywordContentGenerator:
 
         return db_keyword
 
+    async def _call_provider(self, provider: str, fn: Callable, *args, **kwargs):
+        """Run a blocking provider call within the provider's concurrency limit."""
+        async with self.provider_limits.get(provider) or nullcontext():
+            return await self.executors.run_provider(provider, fn, *args, **kwargs)
+
+    async def _run_stage(
+        self,
+        stage: str,
+        branch: Callable[[dict], Awaitable[dict]],
+        keyword: dict,
+        on_stage: Optional[StageCallback],
+    ) -> dict:
+        """Run one pipeline stage, reporting its start and outcome."""
+
+        async def notify(status: str) -> None:
+            if on_stage is not None:
+                await on_stage(stage, status)
+
+        await notify(RUNNING)
+        try:
+            result = await branch(keyword)
+        except Exception:
+            await notify(FAILED)
+            raise
+        await notify(SUCCEEDED)
+        return result
+
+    def _save_keyword_columns(self, keyword: dict, columns: List[str]) -> None:
+        """
+        Write only `columns` of the keyword, so the concurrent picture and
+        voice branches do not overwrite each other's results.
+        """
+        self.supabase_crud.update(
+            "keywords", keyword["id"], {column: keyword[column] for column in columns}
+        )
+        invalidate_cached_keyword(self.keyword_cache, keyword_id=keyword["id"])
+        logger.info(f"Updated keyword: {keyword}")
+
+    async def _process_picture(self, keyword: dict) -> dict:
+        """Picture branch: generate candidates, then save the best one."""
+        logger.info(f"Generating pictures for keyword: {keyword['name']}")
+        await self._generate_pictures(keyword["name"])
+        return await self._process_best_picture(keyword)
+
     async def _process_best_picture(self, keyword: dict) -> dict:
         """Process, upload and save the best picture for the keyword."""
         # Judge the best picture
         logger.info(f"Judging the best picture for keyword: {keyword['name']}")
-        best_picture_path, explanation = self._judge_pictures(keyword["name"])
+        best_picture_path, explanation = await self._call_provider(
+            "openai", self._judge_pictures, keyword["name"]
+        )
 
         if not best_picture_path:
             logger.error(f"No suitable picture found for keyword: {keyword['name']}")
-            return keyword
+            raise GenerationStageError("picture", explanation)
 
         # Process the selected picture
         output_path = self.pictograms_dir_final / f"pic_{keyword['name']}_final.png"
@@ -152,25 +318,39 @@ class KeywordContentGenerator:
             logger.info(
                 f"Removing background from the best picture: {best_picture_path}"
             )
-            remove_background(best_picture_path, output_path)
+            await self.executors.run(
+                IMAGE, remove_background, str(best_picture_path), str(output_path)
+            )
 
             # Upload the processed image - using output_path directly
             filename = f"pic_{keyword['name']}_final.png"
-            self._upload_image_to_spaces(output_path, filename)
+            uploaded = await self.executors.run(
+                STORAGE, self._upload_image_to_spaces, output_path, filename
+            )
+            if not uploaded:
+                raise GenerationStageError("picture", f"Failed to upload {filename}")
 
             # Get and save the CDN URL
             uploaded_image_url = self.do_client.get_cdn_url_for_image(filename)
-            if uploaded_image_url:
-                keyword["pictogram_url"] = uploaded_image_url
-                self.supabase_crud.update("keywords", keyword["id"], keyword)
-                logger.info(f"Updated keyword: {keyword}")
-
-                # Clean up local files now that we have the CDN URL
-                self._cleanup_keyword_local_files(keyword["name"])
-            else:
+            if not uploaded_image_url:
                 logger.error(f"Failed to get CDN URL for image: {filename}")
+                raise GenerationStageError(
+                    "picture", f"No CDN URL for image: {filename}"
+                )
+            keyword["pictogram_url"] = uploaded_image_url
+            keyword["updated_at"] = utc_timestamp()
+            await self.executors.run(
+                STORAGE,
+                self._save_keyword_columns,
+                keyword,
+                ["pictogram_url", "updated_at"],
+            )
+
+            # Clean up local files now that we have the CDN URL
+            self._cleanup_keyword_local_files(keyword["name"])
         except Exception as e:
             logger.error(f"Error processing picture for {keyword['name']}: {e}")
+            raise
 
         return keyword
 
@@ -199,52 +379,77 @@ class KeywordContentGenerator:
         # Generate voice clips
         language = keyword.get("language", "en")  # Default to 'en' if language not set
         logger.info(f"Generating voice clips for keyword: {keyword['name']}")
-        audio_paths = self._generate_voice_clips(keyword["name"], language)
+        audio_paths = await self._generate_voice_clips(keyword["name"], language)
 
         # Upload audio files and get URLs
-        audio_urls = self._upload_audio_files(audio_paths)
-
-        # Save to database
-        audio = self._save_audio_to_db(keyword["id"], audio_urls)
+        audio_urls = await self._upload_audio_files(audio_paths)
+
+        # Save to database, into the keyword's audio row when a previous
+        # attempt already created one, so retries do not add rows
+        audio = await self.executors.run(
+            STORAGE,
+            self._save_audio_to_db,
+            keyword["id"],
+            audio_urls,
+            keyword.get("audio_id"),
+        )
         if audio:
             keyword["audio_id"] = audio["id"]  # Access id as a dictionary key
-            self.supabase_crud.update("keywords", keyword["id"], keyword)
-            logger.info(f"Updated keyword: {keyword}")
+            keyword["updated_at"] = utc_timestamp()
+            await self.executors.run(
+                STORAGE, self._save_keyword_columns, keyword, ["audio_id", "updated_at"]
+            )
 
             # Clean up local audio files now that they're saved in the database
             for voice_type, audio_path in audio_paths.items():
                 if audio_path and audio_urls.get(voice_type):
                     self._cleanup_local_file(Path(audio_path))
 
+        missing = [
+            voice_type for voice_type in audio_paths if voice_type not in audio_urls
+        ]
+        if missing:
+            raise GenerationStageError(
+                "voice", f"Voice clips not generated: {', '.join(missing)}"
+            )
+        if not audio:
+            raise GenerationStageError("voice", "Failed to save the voice clips")
         return keyword
 
-    def _upload_audio_files(self, audio_paths: Dict[str, str]) -> Dict[str, str]:
-        """Upload audio files to Digital Ocean Spaces and return URLs."""
-        audio_urls = {}
-
-        for voice_type, audio_path in audio_paths.items():
-            if not audio_path:
-                continue
-
-            try:
-                audio_filename = os.path.basename(audio_path)
-                self.do_client.upload_audio(
-                    local_file_path=audio_path,
-                    destination_key=f"voice_clips/{audio_filename}",
-                )
-                logger.info(
-                    f"Uploaded audio file to Digital Ocean Spaces: {audio_filename}"
+    async def _upload_audio_files(
+        self, audio_paths: Dict[str, Optional[str]]
+    ) -> Dict[str, str]:
+        """Upload audio files to Digital Ocean Spaces in parallel and return URLs."""
+        voice_types = [voice_type for voice_type, path in audio_paths.items() if path]
+        urls = await asyncio.gather(
+            *(
+                self.executors.run(
+                    STORAGE, self._upload_audio_file, audio_paths[voice_type]
                 )
+                for voice_type in voice_types
+            )
+        )
+        return {voice_type: url for voice_type, url in zip(voice_types, urls) if url}
 
-                cdn_url = self.do_client.get_cdn_url_for_audio(f"{audio_filename}")
-                if cdn_url:
-                    audio_urls[voice_type] = cdn_url
-                else:
-                    logger.error(f"Failed to get CDN URL for audio: {audio_filename}")
-            except Exception as e:
-                logger.error(f"Error uploading audio file {audio_path}: {e}")
+    def _upload_audio_file(self, audio_path: str) -> Optional[str]:
+        """Upload one audio file and return its CDN URL, or None on failure."""
+        try:
+            audio_filename = os.path.basename(audio_path)
+            self.do_client.upload_audio(
+                local_file_path=audio_path,
+                destination_key=f"voice_clips/{audio_filename}",
+            )
+            logger.info(
+                f"Uploaded audio file to Digital Ocean Spaces: {audio_filename}"
+            )
 
-        return audio_urls
+            cdn_url = self.do_client.get_cdn_url_for_audio(f"{audio_filename}")
+            if not cdn_url:
+                logger.error(f"Failed to get CDN URL for audio: {audio_filename}")
+            return cdn_url
+        except Exception as e:
+            logger.error(f"Error uploading audio file {audio_path}: {e}")
+            return None
 
     async def _generate_pictures(self, keyword_name: str) -> List[str]:
         """
@@ -256,7 +461,9 @@ class KeywordContentGenerator:
         # Generate Ideogram images
         try:
             logger.info(f"Generating 4 Ideogram images for keyword: {keyword_name}")
-            generate_pictogram_ideogram(keyword=keyword_name)
+            await self._call_provider(
+                "ideogram", generate_pictogram_ideogram, keyword=keyword_name
+            )
 
             # Add expected filenames based on naming convention
             ideogram_files = [
@@ -329,12 +536,13 @@ class KeywordContentGenerator:
         logger.error(f"No pictures found for keyword: {keyword_name}")
         return None, f"No pictures found for keyword: {keyword_name}"
 
-    def _generate_voice_clips(
+    async def _generate_voice_clips(
         self, keyword_name: str, language: str = "en"
-    ) -> Dict[str, str]:
+    ) -> Dict[str, Optional[str]]:
         """
         Generate voice clips for the keyword in the specified language.
-        Returns a dictionary with voice paths for man and woman voices.
+        The man and woman voices are requested in parallel. Returns a
+        dictionary with voice paths for man and woman voices.
         """
         voice_paths = {
             "voice_man": None,
@@ -347,27 +555,36 @@ class KeywordContentGenerator:
             return voice_paths
 
         voice_configs = self._get_voice_configs(language)
-
-        for voice_type, voice_id in voice_configs.items():
-            try:
-                logger.info(
-                    f"Generating {voice_type} voice for keyword: {keyword_name}"
+        paths = await asyncio.gather(
+            *(
+                self._call_provider(
+                    "elevenlabs",
+                    self._generate_voice_clip,
+                    keyword_name,
+                    voice_type,
+                    voice,
                 )
-                file_path = generate_voice(keyword_name, voice_id)
+                for voice_type, voice in voice_configs.items()
+            )
+        )
+        voice_paths.update(zip(voice_configs, paths))
+        return voice_paths
 
-                if file_path and os.path.exists(file_path):
-                    voice_paths[voice_type] = file_path
-                    logger.info(
-                        f"Successfully generated {voice_type} voice: {file_path}"
-                    )
-                else:
-                    logger.error(f"Voice generation returned invalid path: {file_path}")
-            except Exception as e:
-                logger.error(
-                    f"Error generating {voice_type} voice for {keyword_name}: {e}"
-                )
+    def _generate_voice_clip(
+        self, keyword_name: str, voice_type: str, voice: Voice
+    ) -> Optional[str]:
+        """Generate one voice clip and return its path, or None on failure."""
+        try:
+            logger.info(f"Generating {voice_type} voice for keyword: {keyword_name}")
+            file_path = generate_voice(keyword_name, voice)
 
-        return voice_paths
+            if file_path and os.path.exists(file_path):
+                logger.info(f"Successfully generated {voice_type} voice: {file_path}")
+                return file_path
+            logger.error(f"Voice generation returned invalid path: {file_path}")
+        except Exception as e:
+            logger.error(f"Error generating {voice_type} voice for {keyword_name}: {e}")
+        return None
 
     def _get_voice_configs(self, language: str) -> Dict[str, Voice]:
         """Get voice configurations based on language."""
@@ -380,14 +597,36 @@ class KeywordContentGenerator:
             return {"voice_man": Voice.MAN, "voice_woman": Voice.WOMAN}
 
     def _save_audio_to_db(
-        self, keyword_id: int, audio_paths: Dict[str, str]
+        self,
+        keyword_id: int,
+        audio_paths: Dict[str, str],
+        audio_id: Optional[int] = None,
     ) -> Optional[dict]:
-        """Save audio to the Supabase database."""
+        """
+        Save audio to the Supabase database. With the keyword's existing
+        `audio_id` its row is updated with the new URLs (keeping the others)
+        instead of inserting another row.
+        """
         if not (audio_paths.get("voice_man") or audio_paths.get("voice_woman")):
             logger.warning(f"No audio files to save for keyword_id: {keyword_id}")
             return None
 
         try:
+            if audio_id is not None:
+                urls = {
+                    voice_type: audio_paths[voice_type]
+                    for voice_type in ("voice_man", "voice_woman")
+                    if audio_paths.get(voice_type)
+                }
+                result = self.supabase_crud.update("audio_files", audio_id, urls)
+                if result:
+                    logger.info(f"Updated audio ID {audio_id} for keyword {keyword_id}")
+                    return result
+                logger.warning(
+                    f"Audio ID {audio_id} of keyword {keyword_id} not found, "
+                    "creating a new record"
+                )
+
             # Create audio record for Supabase
             audio_dict = {
                 "voice_man": audio_paths.get("voice_man"),
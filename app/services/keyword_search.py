@@ -0,0 +1,159 @@
+"""
+In-process keyword search for low-latency type-ahead.
+
+Names are normalized (case-folded, accents stripped) and indexed twice: a
+sorted array answers prefix queries by binary search, and a trigram inverted
+index answers substring and typo-tolerant queries with pg_trgm-style
+similarity. The index is immutable once built, so it can be shared between
+concurrent requests and replaced atomically on refresh.
+"""
+
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.trigram import inner_trigrams, similarity, trigrams
+
+# Scores per match kind; within a kind, names closer in length to the query
+# rank higher. Fuzzy matches score their trigram similarity scaled below this.
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+SUBSTRING_SCORE = 0.6
+FUZZY_SCORE = 0.5
+
+# Minimum trigram similarity for a typo-tolerant match (pg_trgm's default)
+DEFAULT_MIN_SIMILARITY = 0.3
+
+
+def normalize(text: str) -> str:
+    """Case-fold `text` and strip accents so "Café" matches "cafe"."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split())
+
+
+def score_name(
+    query: str, name: str, min_similarity: float = DEFAULT_MIN_SIMILARITY
+) -> Optional[Tuple[float, str]]:
+    """
+    Rank how well a normalized `name` matches a normalized `query`.
+
+    Returns (score, match) with match one of "exact", "prefix", "substring"
+    or "fuzzy", or None when the name does not match.
+    """
+    closeness = len(query) / max(len(name), 1)
+    if name == query:
+        return EXACT_SCORE, "exact"
+    if name.startswith(query):
+        return PREFIX_SCORE + 0.1 * closeness, "prefix"
+    if query in name:
+        return SUBSTRING_SCORE + 0.1 * closeness, "substring"
+    sim = similarity(trigrams(query), trigrams(name))
+    if sim >= min_similarity:
+        return FUZZY_SCORE * sim, "fuzzy"
+    return None
+
+
+class KeywordSearchIndex:
+    """Immutable prefix and trigram index over keyword rows."""
+
+    def __init__(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        min_similarity: float = DEFAULT_MIN_SIMILARITY,
+    ):
+        """
+        Index `rows`, which need `id`, `name` and `language`; the rows are
+        returned as-is in search hits.
+        """
+        self.min_similarity = min_similarity
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._names: Dict[int, str] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+        for row in rows:
+            keyword_id = row["id"]
+            name = normalize(row["name"])
+            self._rows[keyword_id] = row
+            self._names[keyword_id] = name
+            for gram in trigrams(name) | inner_trigrams(name):
+                self._postings.setdefault(gram, []).append(keyword_id)
+
+        # Sorted (name, id) pairs; a prefix is a contiguous range
+        self._sorted = sorted((name, kid) for kid, name in self._names.items())
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def search(
+        self, query: str, limit: int = 20, language: Optional[str] = None
+    ) -> List[Tuple[Dict[str, Any], float, str]]:
+        """
+        Find keywords whose name matches `query`, best first.
+
+        Returns up to `limit` (row, score, match) tuples. Exact and prefix
+        matches rank above substring matches, which rank above typo-tolerant
+        matches; ties are broken by name.
+        """
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        hits: Dict[int, Tuple[float, str]] = {}
+        for keyword_id in self._prefix_candidates(query):
+            hits[keyword_id] = score_name(query, self._names[keyword_id])
+
+        for keyword_id in self._trigram_candidates(query):
+            if keyword_id not in hits:
+                hit = score_name(query, self._names[keyword_id], self.min_similarity)
+                if hit is not None:
+                    hits[keyword_id] = hit
+
+        ranked = sorted(
+            (
+                (-score, self._names[kid], kid, match)
+                for kid, (score, match) in hits.items()
+                if language is None or self._rows[kid].get("language") == language
+            )
+        )
+        return [
+            (self._rows[kid], -neg_score, match)
+            for neg_score, _, kid, match in ranked[:limit]
+        ]
+
+    def _prefix_candidates(self, query: str) -> List[int]:
+        """Ids of every name starting with `query`."""
+        start = bisect_left(self._sorted, (query,))
+        ids = []
+        for name, keyword_id in self._sorted[start:]:
+            if not name.startswith(query):
+                break
+            ids.append(keyword_id)
+        return ids
+
+    def _trigram_candidates(self, query: str) -> Iterable[int]:
+        """
+        Ids that may contain `query` or be within typo distance of it.
+
+        Substring candidates must share every inner trigram of the query;
+        fuzzy candidates must share enough padded trigrams to possibly reach
+        `min_similarity`, which prunes most of the posting lists.
+        """
+        if len(query) < 3:
+            # Too short for trigrams; prefix matches are all type-ahead needs
+            return []
+
+        substring_ids: Optional[Set[int]] = None
+        for gram in inner_trigrams(query):
+            ids = set(self._postings.get(gram, ()))
+            substring_ids = ids if substring_ids is None else substring_ids & ids
+
+        query_grams = trigrams(query)
+        counts = Counter(
+            kid for gram in query_grams for kid in self._postings.get(gram, ())
+        )
+        # shared / (|q| + |n| - shared) >= s  implies  shared >= s * |q|
+        min_shared = self.min_similarity * len(query_grams)
+        fuzzy_ids = {kid for kid, shared in counts.items() if shared >= min_shared}
+        return (substring_ids or set()) | fuzzy_ids
@@ -1,119 +1,687 @@
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from loguru import logger
+from supabase import AsyncClient
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.singleflight import SingleFlight
+from app.core.storage import AsyncStorageBackend, utc_timestamp
 from app.models import Keyword
 from app.schemas import KeywordCreate, KeywordUpdate
-from app.services.base_service import SupabaseService
+from app.services.base_service import AsyncSupabaseService
+from app.services.keyword_search import KeywordSearchIndex, normalize, score_name
 
+if TYPE_CHECKING:
+    from app.services.keyword_catalog import KeywordCatalog
 
-class KeywordService(SupabaseService):
-    def __init__(self):
-        super().__init__(table_name="keywords", model_class=Keyword)
+# PostgREST embedding for the keyword's audio record. The hint picks the
+# keywords.audio_id -> audio_files.id constraint, since audio_files.keyword_id
+# points back at keywords and would otherwise make the relationship ambiguous.
+AUDIO_EMBED = "audio:audio_files!fk_audio(*)"
 
-    def _ensure_audio_loaded(self, keyword: Optional[Keyword]) -> Optional[Keyword]:
-        """Helper method to ensure the audio relationship is loaded for a keyword."""
-        if not keyword or not keyword.audio_id:
-            return keyword
+# Ids of deleted keywords, kept so offline clients can drop them on delta sync
+TOMBSTONES_TABLE = "keyword_tombstones"
 
-        # Get audio data from Supabase
-        audio_data = self.supabase_crud.read("audio_files", keyword.audio_id)
+# Denormalized read model behind the /keywords/audio lookups: one row per
+# keyword (id = keywords.id) shaped like _to_audio_response, so a lookup is a
+# single indexed read by name instead of a keywords/audio_files join. Database
+# triggers keep it in step with every keywords/audio_files write.
+AUDIO_LOOKUP_TABLE = "keyword_audio_lookup"
 
-        # Return keyword with audio data as a separate property
-        # We can't set keyword.audio directly in SQLModel due to how it handles relationships
-        if keyword:
-            # Create a dictionary representation of the keyword
-            keyword_dict = keyword.model_dump()
+# Cached in place of a row for names known not to exist (negative caching)
+NOT_FOUND = object()
+
+# Position of a change stream whose last page has already been returned
+CHANGES_END = "end"
+
+
+def _to_audio_response(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a keyword row with embedded audio into a KeywordAudioResponse
+    dict, which is also the row stored in AUDIO_LOOKUP_TABLE.
+    """
+    audio = row.get("audio") or {}
+    # updated_at feeds the HTTP cache validators; the response model drops it
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "language": row["language"],
+        "pictogram_url": row.get("pictogram_url"),
+        "audio_id": row.get("audio_id"),
+        "voice_man_url": audio.get("voice_man"),
+        "voice_woman_url": audio.get("voice_woman"),
+        "updated_at": row.get("updated_at"),
+    }
+
+
+def generation_pending(row: Dict[str, Any]) -> bool:
+    """
+    Whether a keyword still lacks its pictogram or a voice clip. Accepts rows
+    with `audio` embedded and AUDIO_LOOKUP_TABLE rows.
+    """
+    if "audio" in row:
+        audio = row.get("audio") or {}
+        voices = (audio.get("voice_man"), audio.get("voice_woman"))
+    else:
+        voices = (row.get("voice_man_url"), row.get("voice_woman_url"))
+    return not (row.get("pictogram_url") and all(voices))
+
+
+# Columns kept by every projected read: the keyset cursor needs the id and
+# the HTTP cache validators need updated_at and audio_id
+KEY_COLUMNS = ["id", "updated_at", "audio_id"]
+
+
+def project_fields(row: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only `fields` of a row (the whole row when fields is None)."""
+    if not fields:
+        return row
+    return {field: row.get(field) for field in fields}
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Normalize a timestamp for comparison with the naive TIMESTAMP columns."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
-            # Add audio data to the dictionary
-            if audio_data:
-                keyword_dict["audio"] = audio_data
-            else:
-                keyword_dict["audio"] = None
 
-            # Convert back to a Keyword model
-            return Keyword.model_validate(keyword_dict)
+def invalidate_cached_keyword(
+    cache: Optional[TTLCache],
+    keyword_id: Optional[int] = None,
+    name: Optional[str] = None,
+) -> None:
+    """
+    Drop every cached entry for a keyword.
 
-        return keyword
+    Entries are stored under ("id", id), ("name", name) and, for audio
+    lookups, ("audio", name); every one carries the keyword id, so matching
+    on it also catches the entries for a name that has since been renamed.
+    """
+    if cache is None:
+        return
+    if name is not None:
+        cache.invalidate(("name", name))
+        cache.invalidate(("audio", name))
+    if keyword_id is not None:
+        cache.invalidate_where(
+            lambda row: row is not NOT_FOUND and row.get("id") == keyword_id
+        )
+
+
+class KeywordService(AsyncSupabaseService):
+    def __init__(
+        self,
+        client: Optional[AsyncClient] = None,
+        cache: Optional[TTLCache] = None,
+        search_index_ttl_seconds: Optional[float] = None,
+        crud: Optional[AsyncStorageBackend] = None,
+        negative_ttl_seconds: float = 0.0,
+    ):
+        super().__init__(
+            table_name="keywords", model_class=Keyword, client=client, crud=crud
+        )
+        # Read-through cache of keyword rows with embedded audio; None disables
+        # it. Rows still waiting for content are not cached: the generation
+        # worker fills them in another process, which cannot invalidate it.
+        self.cache = cache
+        # Names that were not found are cached as NOT_FOUND for this long
+        # (0 disables), so bursts of probes for unknown words stay in process
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.negative_hits = 0
+        # In-process search index over the whole catalog, rebuilt in the
+        # background once this old or after a write; None searches Postgres
+        self.search_index_ttl_seconds = search_index_ttl_seconds
+        self._search_index: Optional[KeywordSearchIndex] = None
+        self._search_index_expires_at = 0.0
+        self._search_index_rebuild: Optional[asyncio.Task] = None
+        # Concurrent misses for the same keyword share one upstream fetch
+        self.flights = SingleFlight()
+        # Preloaded catalog answering audio lookups from memory, if enabled
+        self.catalog: Optional["KeywordCatalog"] = None
+
+    async def _get_with_audio(
+        self, column: str, value: Any
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a keyword row with its audio record embedded in one request.
+        Concurrent misses for the same key share a single fetch.
+        """
+        row = self.cache.get((column, value)) if self.cache is not None else None
+        if row is NOT_FOUND:
+            self.negative_hits += 1
+            return None
+        if row is None:
+            row = await self.flights.do(
+                (column, value), lambda: self._fetch_with_audio(column, value)
+            )
+        # Copy so callers cannot mutate the cached or shared row
+        return dict(row) if row else None
+
+    async def _fetch_with_audio(
+        self, column: str, value: Any
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read a keyword row with embedded audio and cache it once complete,
+        unless a write invalidated the cache while it was being read.
+        """
+        generation = self.cache.generation if self.cache is not None else None
+        row = await self.supabase_crud.read_with_embedded(
+            self.table_name, column, value, AUDIO_EMBED
+        )
+        if row and self.cache is not None and not generation_pending(row):
+            self.cache.set(("id", row["id"]), row, generation=generation)
+            self.cache.set(("name", row["name"]), row, generation=generation)
+        elif row is None and column == "name":
+            self._cache_not_found(("name", value), generation)
+        return row
+
+    def _cache_not_found(
+        self, key: Tuple[str, Any], generation: Optional[int] = None
+    ) -> None:
+        """
+        Remember that a name lookup found nothing. Only names are negatively
+        cached: `invalidate` drops them when a write introduces the name.
+        """
+        if self.cache is not None and self.negative_ttl_seconds > 0:
+            self.cache.set(
+                key,
+                NOT_FOUND,
+                ttl_seconds=self.negative_ttl_seconds,
+                generation=generation,
+            )
 
-    def create(self, keyword: KeywordCreate) -> Optional[Keyword]:
-        """Create a new keyword in Supabase."""
+    def invalidate(
+        self, keyword_id: Optional[int] = None, name: Optional[str] = None
+    ) -> None:
+        """Drop cached entries for a keyword after it was written."""
+        invalidate_cached_keyword(self.cache, keyword_id=keyword_id, name=name)
+        if self.catalog is not None:
+            self.catalog.discard(keyword_id=keyword_id, name=name)
+        self.flights.clear()
+        self._search_index_expires_at = 0.0
+
+    async def create(self, keyword: KeywordCreate) -> Optional[Keyword]:
+        """
+        Create a new keyword in Supabase.
+
+        Raises:
+            APIError: If the name already exists (code 23505).
+        """
         # Convert pydantic model to dict
         keyword_data = keyword.model_dump()
 
         # Add timestamp fields
-        now = datetime.now().isoformat()
+        now = utc_timestamp()
         keyword_data["created_at"] = now
         keyword_data["updated_at"] = now
 
         # Create in Supabase
-        result = super().create(keyword_data)
+        result = await super().create(keyword_data)
+        self.invalidate(name=keyword.name)
         return result
 
-    def get_by_id(self, keyword_id: int) -> Optional[Keyword]:
-        """Get a keyword by its ID from Supabase."""
-        keyword = super().get_by_id(keyword_id)
-        return self._ensure_audio_loaded(keyword)
+    async def bulk_create(self, keywords: List[KeywordCreate]) -> List[Keyword]:
+        """
+        Insert many keywords with a single upsert statement.
+
+        Keywords whose name already exists are skipped (ON CONFLICT (name) DO
+        NOTHING). Returns only the keywords that were newly created.
+        """
+        now = utc_timestamp()
+        rows = [
+            {**keyword.model_dump(), "created_at": now, "updated_at": now}
+            for keyword in keywords
+        ]
+        created = await self.supabase_crud.upsert_many(
+            self.table_name, rows, on_conflict="name", ignore_duplicates=True
+        )
+        for keyword in keywords:
+            self.invalidate(name=keyword.name)
+        return self._convert_list_to_models(created)
+
+    async def get_by_id(self, keyword_id: int) -> Optional[Keyword]:
+        """Get a keyword by its ID, served from the cache when possible."""
+        return self._convert_to_model(await self._get_with_audio("id", keyword_id))
+
+    async def get_by_name(self, name: str) -> Optional[Keyword]:
+        """Get a keyword by its name, served from the cache when possible."""
+        return self._convert_to_model(await self._get_with_audio("name", name))
+
+    async def get_detailed_by_id(self, keyword_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a keyword by its ID with its audio record under the `audio` key.
+        Returns a dictionary formatted for the KeywordReadDetailed schema.
+        Single rows are always read whole so they can be served from the
+        cache; use `project_fields` to serialize a subset.
+        """
+        return await self._get_with_audio("id", keyword_id)
 
-    def get_by_name(self, name: str) -> Optional[Keyword]:
-        """Get a keyword by its name from Supabase."""
-        keyword = super().get_by_name(name)
-        return self._ensure_audio_loaded(keyword)
+    async def get_detailed_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a keyword by its name with its audio record under the `audio` key.
+        Returns a dictionary formatted for the KeywordReadDetailed schema.
+        See `get_detailed_by_id`.
+        """
+        return await self._get_with_audio("name", name)
 
-    def get_keyword_with_audio_urls(self, name: str) -> Optional[Dict[str, Any]]:
+    async def get_keyword_with_audio_urls(self, name: str) -> Optional[Dict[str, Any]]:
         """
         Get a keyword by name with audio URLs.
         Returns a dictionary formatted for the KeywordAudioResponse schema.
         """
-        # Get the keyword with basic info
-        keyword = self.get_by_name(name)
-        if not keyword:
-            return None
+        results = await self.get_keywords_with_audio_urls([name])
+        return results[0]
 
-        # Prepare the base response
-        response = {
-            "id": keyword.id,
-            "name": keyword.name,
-            "language": keyword.language,
-            "pictogram_url": keyword.pictogram_url,
-            "audio_id": keyword.audio_id,
-            "voice_man_url": None,
-            "voice_woman_url": None,
-        }
+    async def get_keywords_with_audio_urls(
+        self, names: List[str], language: Optional[str] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Resolve many keyword names with their audio URLs.
+
+        Names are served from the preloaded catalog or the cache where
+        possible, then from AUDIO_LOOKUP_TABLE in one `in` query on its name
+        index. Concurrent requests missing the same names (a class opening
+        the same board) share that query; its key is the sorted, deduplicated
+        missing names, so the same names asked in another order coalesce too.
+        Keywords still waiting for content are always read from storage.
+        Results follow the order of `names`, with None for names that were
+        not found (or that do not match `language` when it is given).
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for name in dict.fromkeys(names):
+            if self.catalog is not None:
+                row = self.catalog.get(name)
+                if row is not None and not generation_pending(row):
+                    rows[name] = row
+                    continue
+            row = self.cache.get(("audio", name)) if self.cache is not None else None
+            if row is NOT_FOUND:
+                self.negative_hits += 1
+            elif row is not None:
+                rows[name] = row
+            else:
+                missing.append(name)
+
+        if missing:
+            # One key per set of names, whatever order they were asked in
+            missing = sorted(missing)
+            rows.update(
+                await self.flights.do(
+                    ("audio", tuple(missing)),
+                    lambda: self._fetch_audio_rows(missing),
+                )
+            )
 
-        # If we have an audio_id, fetch the audio record to get URLs
-        if keyword.audio_id:
-            audio_data = self.supabase_crud.read("audio_files", keyword.audio_id)
-            if audio_data:
-                response["voice_man_url"] = audio_data.get("voice_man")
-                response["voice_woman_url"] = audio_data.get("voice_woman")
+        return [
+            None
+            if row is None or (language and row["language"] != language)
+            else dict(row)
+            for row in (rows.get(name) for name in names)
+        ]
+
+    async def _fetch_audio_rows(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Read AUDIO_LOOKUP_TABLE rows by name and cache them, unless a write
+        invalidated the cache meanwhile.
+        """
+        generation = self.cache.generation if self.cache is not None else None
+        rows = {
+            row["name"]: row
+            for row in await self.supabase_crud.read_in(
+                AUDIO_LOOKUP_TABLE, "name", names
+            )
+        }
+        if self.cache is not None:
+            for name, row in rows.items():
+                if not generation_pending(row):
+                    self.cache.set(("audio", name), row, generation=generation)
+        for name in names:
+            if name not in rows:
+                self._cache_not_found(("audio", name), generation)
+        return rows
 
-        return response
+    def stats(self) -> Dict[str, Any]:
+        """Counters of the read cache, coalesced fetches and the catalog."""
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "negative_hits": self.negative_hits,
+            "single_flight": self.flights.stats(),
+            "catalog": self.catalog.stats() if self.catalog is not None else None,
+        }
 
-    def list(self, skip: int = 0, limit: int = 100) -> List[Keyword]:
+    async def list(self, skip: int = 0, limit: int = 100) -> List[Keyword]:
         """Get a list of keywords with pagination from Supabase."""
-        return super().list(limit=limit, offset=skip)
+        return await super().list(limit=limit, offset=skip)
+
+    async def list_rows(
+        self, skip: int = 0, limit: int = 100, columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a page of raw keyword rows restricted to `columns`. The rows also
+        carry KEY_COLUMNS; use `project_fields` to drop them.
+        """
+        fetch_columns = (
+            list(dict.fromkeys([*KEY_COLUMNS, *columns])) if columns else None
+        )
+        return await super().list_rows(limit=limit, offset=skip, columns=fetch_columns)
+
+    async def list_page(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Keyword], Optional[str]]:
+        """
+        Get a page of keywords ordered by id using keyset pagination.
+
+        Returns the keywords and the cursor for the next page, which is None
+        on the last page.
+
+        Raises:
+            ValueError: If `cursor` is not a valid cursor token.
+        """
+        rows, next_cursor = await self.list_page_rows(limit=limit, cursor=cursor)
+        return self._convert_list_to_models(rows), next_cursor
+
+    async def list_page_rows(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get a page of raw keyword rows restricted to `columns`, using keyset
+        pagination. The rows also carry KEY_COLUMNS; use `project_fields` to
+        drop them. See `list_page`.
+        """
+        after_id = None
+        if cursor:
+            after_id = decode_cursor(cursor).get("id")
+            if not isinstance(after_id, int):
+                raise ValueError(f"Invalid cursor: {cursor}")
+
+        fetch_columns = (
+            list(dict.fromkeys([*KEY_COLUMNS, *columns])) if columns else None
+        )
+
+        # Fetch one extra row to learn whether another page exists
+        rows = await self.supabase_crud.read_page(
+            self.table_name, limit=limit + 1, after_id=after_id, columns=fetch_columns
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor({"id": rows[-1]["id"]})
+        return rows, next_cursor
+
+    async def iter_catalog(self, page_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every keyword, flattened with its voice URLs, in id order.
+
+        Pages through the table by id with the audio record embedded, fetching
+        the next page while the current one is being consumed. Only one page is
+        held at a time, and the cache is bypassed so an export does not evict
+        the hot entries.
+        """
+        rows = await self.supabase_crud.read_page(
+            self.table_name, limit=page_size, embedded=AUDIO_EMBED
+        )
+        while rows:
+            next_page = None
+            if len(rows) == page_size:
+                next_page = asyncio.ensure_future(
+                    self.supabase_crud.read_page(
+                        self.table_name,
+                        limit=page_size,
+                        after_id=rows[-1]["id"],
+                        embedded=AUDIO_EMBED,
+                    )
+                )
+            try:
+                for row in rows:
+                    yield _to_audio_response(row)
+            except BaseException:
+                if next_page is not None:
+                    next_page.cancel()
+                raise
+            rows = await next_page if next_page is not None else []
+
+    async def list_changes(
+        self,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get the keywords upserted and deleted at or after `since`.
+
+        Upserted rows (with audio URLs) and tombstones are read as two streams
+        ordered by (timestamp, id), at most `limit` of each per call. The
+        returned `next_cursor` resumes both streams and pins `since`; once it
+        is None the client is caught up and should keep `next_since` for its
+        next sync. Rows stamped at or after `since` are returned again, so
+        changes must be applied idempotently, deletes after upserts.
+
+        `next_since` trails the present by KEYWORD_CHANGES_SAFETY_LAG_SECONDS:
+        a write that commits after a later one (a slow transaction, or a
+        machine whose clock is behind) carries an older timestamp, and would
+        be skipped for good if the next sync started after it. Changes
+        inside that window are returned again on the next sync.
+
+        Raises:
+            ValueError: If neither `since` nor a valid `cursor` is given.
+        """
+        if cursor:
+            state = decode_cursor(cursor)
+            if not isinstance(state.get("since"), str):
+                raise ValueError(f"Invalid cursor: {cursor}")
+        elif since is not None:
+            start = _to_naive_utc(since).isoformat()
+            state = {"since": start, "high": start, "upserted": None, "deleted": None}
+        else:
+            raise ValueError("Either since or cursor is required")
 
-    def update(
+        upserted, state["upserted"] = await self._read_change_stream(
+            self.table_name, "updated_at", "id", state, "upserted", limit, AUDIO_EMBED
+        )
+        deleted, state["deleted"] = await self._read_change_stream(
+            TOMBSTONES_TABLE, "deleted_at", "keyword_id", state, "deleted", limit
+        )
+
+        timestamps = [state["high"]]
+        timestamps += [row["updated_at"] for row in upserted]
+        timestamps += [row["deleted_at"] for row in deleted]
+        state["high"] = max(timestamps, key=datetime.fromisoformat)
+
+        done = state["upserted"] == CHANGES_END and state["deleted"] == CHANGES_END
+        settled = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=settings.KEYWORD_CHANGES_SAFETY_LAG_SECONDS
+        )
+        next_since = min(_to_naive_utc(datetime.fromisoformat(state["high"])), settled)
+        return {
+            "upserted": [_to_audio_response(row) for row in upserted],
+            "deleted": [row["keyword_id"] for row in deleted],
+            "next_since": next_since.isoformat(),
+            "next_cursor": None if done else encode_cursor(state),
+        }
+
+    async def _read_change_stream(
+        self,
+        table: str,
+        column: str,
+        key: str,
+        state: Dict[str, Any],
+        stream: str,
+        limit: int,
+        embedded: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Any]:
+        """Read the next page of one change stream and its new position."""
+        position = state.get(stream)
+        if position == CHANGES_END:
+            return [], CHANGES_END
+        if position is not None and not (
+            isinstance(position, list) and len(position) == 2
+        ):
+            raise ValueError("Invalid cursor")
+
+        # Fetch one extra row to learn whether the stream has more pages
+        rows = await self.supabase_crud.read_changed_since(
+            table,
+            column,
+            state["since"],
+            limit=limit + 1,
+            after=tuple(position) if position else None,
+            key=key,
+            embedded=embedded,
+        )
+        if len(rows) <= limit:
+            return rows, CHANGES_END
+        rows = rows[:limit]
+        return rows, [rows[-1][column], rows[-1][key]]
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 20,
+        language: Optional[str] = None,
+        full_text: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search keywords by name with prefix, substring and typo tolerance.
+
+        Served from the in-process index when enabled; `full_text` also
+        matches descriptions and always goes to the search_keywords Postgres
+        function. Returns KeywordAudioResponse dicts with `score` and `match`,
+        best first.
+        """
+        if full_text or self.search_index_ttl_seconds is None:
+            return await self._search_database(query, limit, language)
+
+        index = await self._get_search_index()
+        results = [
+            {**row, "score": round(score, 4), "match": match}
+            for row, score, match in index.search(query, limit, language)
+        ]
+        # The index may predate content generated since; re-read those rows
+        pending = [row["name"] for row in results if generation_pending(row)]
+        if pending:
+            fresh = dict(zip(pending, await self.get_keywords_with_audio_urls(pending)))
+            results = [{**row, **(fresh.get(row["name"]) or {})} for row in results]
+        return results
+
+    async def _search_database(
+        self, query: str, limit: int, language: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Search through the pg_trgm/full-text backed search_keywords function."""
+        rows = await self.supabase_crud.rpc(
+            "search_keywords",
+            {
+                "search_query": query,
+                "max_results": limit,
+                "search_language": language,
+            },
+            embedded=AUDIO_EMBED,
+        )
+        normalized = normalize(query)
+        results = []
+        for row in rows:
+            # Score like the in-process index; rows that only matched on
+            # their description fall through to a zero score
+            score, match = score_name(normalized, normalize(row["name"])) or (
+                0.0,
+                "description",
+            )
+            results.append(
+                {**_to_audio_response(row), "score": round(score, 4), "match": match}
+            )
+        return results
+
+    async def _get_search_index(self) -> KeywordSearchIndex:
+        """
+        Return the search index, building it on first use.
+
+        A stale index keeps serving while a single background task rebuilds
+        it, so type-ahead latency does not spike after writes.
+        """
+        if self._search_index is None:
+            await self._rebuild_search_index()
+        elif time.monotonic() >= self._search_index_expires_at and (
+            self._search_index_rebuild is None or self._search_index_rebuild.done()
+        ):
+            self._search_index_rebuild = asyncio.create_task(
+                self._rebuild_search_index()
+            )
+        return self._search_index
+
+    async def _rebuild_search_index(self) -> None:
+        """Load the catalog and swap in a fresh search index."""
+        # Push the expiry out first so concurrent callers do not rebuild too
+        expires_at = time.monotonic() + self.search_index_ttl_seconds
+        self._search_index_expires_at = expires_at
+        try:
+            rows = [
+                row
+                async for row in self.iter_catalog(
+                    page_size=settings.KEYWORD_EXPORT_PAGE_SIZE
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Failed to rebuild keyword search index: {e}")
+            self._search_index_expires_at = 0.0
+            if self._search_index is None:
+                raise
+            return
+        self._search_index = KeywordSearchIndex(rows)
+        logger.info(f"Built keyword search index over {len(rows)} keywords")
+
+    async def update(
         self, keyword_id: int, keyword_update: KeywordUpdate
     ) -> Optional[Keyword]:
-        """Update a keyword by its ID in Supabase."""
-        # Get current keyword
-        keyword = self.get_by_id(keyword_id)
-        if not keyword:
-            return None
+        """
+        Update a keyword by its ID in Supabase with a single UPDATE that
+        returns the row. Returns None if no keyword has that ID.
 
+        Raises:
+            APIError: If a rename collides with an existing name (code 23505).
+        """
         # Convert update model to dict, filtering out None values
         update_data = {
             k: v for k, v in keyword_update.model_dump().items() if v is not None
         }
 
         # Add updated timestamp
-        update_data["updated_at"] = datetime.now().isoformat()
+        update_data["updated_at"] = utc_timestamp()
 
         # Update in Supabase
-        updated_keyword = super().update(keyword_id, update_data)
-        return self._ensure_audio_loaded(updated_keyword)
+        updated_keyword = await super().update(keyword_id, update_data)
+        self.invalidate(keyword_id=keyword_id, name=update_data.get("name"))
+        return updated_keyword
+
+    async def delete(self, keyword_id: int) -> bool:
+        """
+        Delete a keyword by its ID from Supabase and record its tombstone.
+
+        The delete goes first, so a keyword that cannot be deleted (its audio
+        files still reference it) never gets one. A failure to record the
+        tombstone is raised rather than reported as success: delta sync
+        clients would otherwise keep the keyword until their next full export.
+        """
+        deleted = await super().delete(keyword_id)
+        self.invalidate(keyword_id=keyword_id)
+        if deleted:
+            await self._record_tombstone(keyword_id)
+        return deleted
 
-    def delete(self, keyword_id: int) -> bool:
-        """Delete a keyword by its ID from Supabase."""
-        return super().delete(keyword_id)
+    async def _record_tombstone(self, keyword_id: int) -> None:
+        """Record a deleted keyword id for delta sync clients."""
+        tombstone = {"keyword_id": keyword_id, "deleted_at": utc_timestamp()}
+        await self.supabase_crud.upsert_many(
+            TOMBSTONES_TABLE,
+            [tombstone],
+            on_conflict="keyword_id",
+            ignore_duplicates=False,
+        )
@@ -6,6 +6,7 @@ from fastapi.responses import JSONResponse
 from loguru import logger
 
 from app.core import settings
+from app.core.rate_limit import get_rate_limiters
 
 api_key = settings.IDEOGRAM_API_KEY
 pictogram_dir = Path("app/assets/pictograms")
@@ -79,6 +80,13 @@ SYSTEM_PROMPT_2 = (
 )
 
 
+def _request_images(url, headers, json):
+    """POST a generation request, raising for an error status (e.g. 429)."""
+    response = requests.post(url, headers=headers, json=json)
+    response.raise_for_status()
+    return response.json()
+
+
 def generate_pictogram_ideogram(
     keyword,
     output_filename=None,
@@ -116,9 +124,7 @@ def generate_pictogram_ideogram(
 
     try:
         logger.info(f"Sending request to Ideogram: {json}")
-        response = requests.post(url, headers=headers, json=json)
-        response.raise_for_status()
-        data = response.json()
+        data = get_rate_limiters().call("ideogram", _request_images, url, headers, json)
         logger.info(f"Response: {data}")
 
         # download the images
@@ -7,6 +7,7 @@ from loguru import logger
 from openai import OpenAI
 
 from app.core import settings
+from app.core.rate_limit import get_rate_limiters
 
 api_key = settings.OPENAI_API_KEY
 pictogram_dir = Path("app/assets/pictograms")
@@ -68,7 +69,9 @@ def generate_pictogram_openai(
 
         try:
             # Generate the pictogram using the latest OpenAI image generation API (DALL-E 3)
-            response = client.images.generate(
+            response = get_rate_limiters().call(
+                "openai",
+                client.images.generate,
                 model="dall-e-3",
                 prompt=final_prompt,
                 size="1024x1024",
@@ -116,7 +119,9 @@ def generate_pictogram_openai(
 
             try:
                 # Generate the pictogram
-                response = client.images.generate(
+                response = get_rate_limiters().call(
+                    "openai",
+                    client.images.generate,
                     model="dall-e-3",
                     prompt=final_prompt,
                     size="1024x1024",
@@ -0,0 +1,134 @@
+"""
+Batch content generation for whole vocabularies.
+
+enqueue_vocabulary() takes the words of a vocabulary file, creates the
+missing keywords in one upsert per chunk and queues a generation job on the
+durable queue (app.core.job_queue) for every keyword that lacks a pictogram
+or voice clips, all tagged with one batch. The workers generate them like
+any other job, so a batch survives restarts, and the batch's progress is
+counted from the status of its jobs. Keywords that already have their
+assets are skipped and a keyword with only some of them generates just the
+missing stages, so posting the same file again after a cancelled batch
+resumes where it stopped.
+
+Used by the `python -m app.batch` CLI and the admin API.
+"""
+
+import asyncio
+import csv
+import io
+import json
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.job_queue import GenerationQueue
+from app.models import Keyword
+from app.schemas import KeywordCreate
+from app.services.keyword_service import AUDIO_EMBED, KeywordService
+
+VOCABULARY_FORMATS = ("txt", "csv", "json")
+
+
+def parse_vocabulary(
+    text: str, fmt: str = "txt", language: str = "en"
+) -> List[KeywordCreate]:
+    """
+    Parse a vocabulary file into keywords, keeping the first of duplicates.
+
+    - txt: one word per line; blank lines and lines starting with # are ignored
+    - csv: a header row with a `name` column and optional `language` and
+      `description` columns
+    - json: a list of words or of objects with the same fields as csv
+
+    `language` applies to words that do not set their own.
+    Raises ValueError for an unknown format or an invalid entry.
+    """
+    if fmt == "txt":
+        items: List[Any] = [
+            line.strip()
+            for line in text.splitlines()
+            if line.strip() and not line.strip().startswith("#")
+        ]
+    elif fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        if "name" not in (reader.fieldnames or []):
+            raise ValueError("CSV vocabulary needs a header row with a name column")
+        items = [
+            {key: value for key, value in row.items() if key and value}
+            for row in reader
+        ]
+    elif fmt == "json":
+        items = json.loads(text)
+        if not isinstance(items, list):
+            raise ValueError("JSON vocabulary must be a list")
+    else:
+        raise ValueError(f"Unknown vocabulary format: {fmt}")
+
+    keywords: Dict[str, KeywordCreate] = {}
+    for index, item in enumerate(items, start=1):
+        data = {"name": item} if isinstance(item, str) else item
+        try:
+            keyword = KeywordCreate.model_validate({"language": language, **data})
+        except ValidationError as e:
+            raise ValueError(f"Invalid vocabulary entry {index}: {e}") from e
+        keyword.name = keyword.name.strip()
+        if keyword.name:
+            keywords.setdefault(keyword.name, keyword)
+    return list(keywords.values())
+
+
+def missing_stages(row: Dict[str, Any]) -> List[str]:
+    """Pipeline stages whose assets a keyword row (with `audio`) lacks."""
+    stages = []
+    if not row.get("pictogram_url"):
+        stages.append("picture")
+    audio = row.get("audio") or {}
+    if not (audio.get("voice_man") and audio.get("voice_woman")):
+        stages.append("voice")
+    return stages
+
+
+async def enqueue_vocabulary(
+    keyword_service: KeywordService,
+    queue: GenerationQueue,
+    keywords: List[KeywordCreate],
+    name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Create the missing keywords and queue the missing stages of every
+    keyword in one batch. Returns the batch's progress.
+    """
+    crud = keyword_service.supabase_crud
+    todo: List[Keyword] = []
+    stages: Dict[int, List[str]] = {}
+    created = skipped = 0
+    chunk_size = min(settings.KEYWORD_BULK_MAX_ITEMS, settings.KEYWORD_BATCH_MAX_NAMES)
+    for start in range(0, len(keywords), chunk_size):
+        chunk = keywords[start : start + chunk_size]
+        created += len(await keyword_service.bulk_create(chunk))
+        rows = await crud.read_in(
+            "keywords", "name", [keyword.name for keyword in chunk], AUDIO_EMBED
+        )
+        for row in rows:
+            missing = missing_stages(row)
+            if not missing:
+                skipped += 1
+                continue
+            keyword = Keyword.model_validate(
+                {k: v for k, v in row.items() if k != "audio"}
+            )
+            todo.append(keyword)
+            stages[keyword.id] = missing
+
+    batch = await asyncio.to_thread(
+        queue.create_batch, name, len(keywords), created, skipped
+    )
+    await asyncio.to_thread(queue.enqueue, todo, batch["id"], stages)
+    logger.info(
+        f"Vocabulary batch {batch['id']}: {len(keywords)} keywords, "
+        f"{created} created, {skipped} already complete, {len(todo)} queued"
+    )
+    return await asyncio.to_thread(queue.batch_progress, batch["id"])
@@ -5,6 +5,7 @@ from elevenlabs.client import ElevenLabs
 from loguru import logger
 
 from app.core import settings
+from app.core.rate_limit import get_rate_limiters
 from app.models import VOICE_ID_MAPPING, Voice
 
 # Check if API key is set
@@ -15,6 +16,11 @@ if not api_key:
 audio_dir = Path("app/assets/audio")
 
 
+def _convert(client: ElevenLabs, **kwargs) -> bytes:
+    """Text to speech; the audio streams in, so the request runs while joining."""
+    return b"".join(chunk for chunk in client.text_to_speech.convert(**kwargs))
+
+
 def generate_voice(text: str, voice: Voice):
     """Generate voice audio file for given text and voice type"""
     try:
@@ -44,15 +50,15 @@ def generate_voice(text: str, voice: Voice):
         )
 
         # Make the API call
-        audio = client.text_to_speech.convert(
+        audio_bytes = get_rate_limiters().call(
+            "elevenlabs",
+            _convert,
+            client,
             text=text,
             voice_id=voice_id,
             model_id="eleven_multilingual_v2",
             output_format="mp3_44100_128",
         )
-
-        # Convert the generator to bytes
-        audio_bytes = b"".join(chunk for chunk in audio)
         if not audio_bytes:
             logger.error(f"Received empty audio data for {text}")
             return None
@@ -110,16 +116,16 @@ def generate_voice_flemish(text: str, voice: Voice):
         )
 
         # Make the API call
-        audio = client.text_to_speech.convert(
+        audio_bytes = get_rate_limiters().call(
+            "elevenlabs",
+            _convert,
+            client,
             text=text,
             voice_id=voice_id,
             model_id="eleven_turbo_v2_5",
             output_format="mp3_44100_128",
             language_code="nl",
         )
-
-        # Convert the generator to bytes
-        audio_bytes = b"".join(chunk for chunk in audio)
         if not audio_bytes:
             logger.error(f"Received empty audio data for Flemish {text}")
             return None
@@ -0,0 +1,176 @@
+"""
+Content generation worker.
+
+Claims jobs from the generation queue (app.core.job_queue) and runs the
+content pipeline for them, at most GENERATION_WORKER_CONCURRENCY at a time.
+Failed jobs are retried with an exponential backoff; a retry reruns only
+the stages that did not succeed. Run any number of them next to the API:
+
+    python -m app.worker
+
+SIGTERM/SIGINT stop claiming new jobs and let the running ones finish.
+"""
+
+import asyncio
+import os
+import signal
+import socket
+from contextlib import suppress
+from typing import Any, Dict, Optional, Set
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.container import ServiceContainer
+from app.core.job_queue import SUCCEEDED, GenerationQueue, retry_delay
+from app.models import Keyword
+from app.services.keyword_content_generator import KeywordContentGenerator
+
+# Extra time a running job gets before other workers consider it lost
+_STALE_GRACE_SECONDS = 60.0
+
+
+class GenerationWorker:
+    """Polls the generation queue and runs a bounded number of jobs."""
+
+    def __init__(
+        self,
+        queue: GenerationQueue,
+        content_generator: KeywordContentGenerator,
+        concurrency: int = 4,
+        poll_seconds: float = 2.0,
+        job_timeout_seconds: float = 900.0,
+        name: Optional[str] = None,
+    ):
+        self.queue = queue
+        self.content_generator = content_generator
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.job_timeout_seconds = job_timeout_seconds
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._slots = asyncio.Semaphore(concurrency)
+        self._stopping = asyncio.Event()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def stop(self) -> None:
+        """Stop claiming jobs; run() returns once the running ones finish."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Claim and run jobs until stop() is called."""
+        logger.info(
+            f"Generation worker {self.name} started (concurrency {self.concurrency})"
+        )
+        while not self._stopping.is_set():
+            await self._slots.acquire()
+            job = None
+            if not self._stopping.is_set():
+                job = await asyncio.to_thread(self.queue.claim, self.name)
+            if job is None:
+                self._slots.release()
+                if self._stopping.is_set():
+                    break
+                # Idle: recover jobs of lost workers, then wait for new ones
+                await asyncio.to_thread(
+                    self.queue.requeue_stale,
+                    self.job_timeout_seconds + _STALE_GRACE_SECONDS,
+                )
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_seconds)
+                continue
+
+            task = asyncio.create_task(self._process(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if self._tasks:
+            logger.info(f"Waiting for {len(self._tasks)} running job(s) to finish")
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info(f"Generation worker {self.name} stopped")
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        """Run one job, then free its slot."""
+        try:
+            await self._run_job(job)
+        except Exception as e:
+            # Bookkeeping failed (e.g. the queue database is unreachable); the
+            # job stays running and is requeued once it is considered stale
+            logger.error(f"Generation job {job['id']} could not be recorded: {e}")
+        finally:
+            self._slots.release()
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        """Generate the job's pending stages and record the outcome."""
+        job_id = job["id"]
+        crud = self.content_generator.supabase_crud
+        row = await asyncio.to_thread(crud.read, "keywords", job["keyword_id"])
+        if not row:
+            await asyncio.to_thread(
+                self.queue.fail, job, "Keyword no longer exists", None
+            )
+            logger.warning(f"Generation job {job_id}: keyword was deleted")
+            return
+
+        stages = [stage for stage, state in job["stages"].items() if state != SUCCEEDED]
+        logger.info(
+            f"Generation job {job_id} for '{row['name']}' "
+            f"(attempt {job['attempts']}/{job['max_attempts']}, stages {stages})"
+        )
+
+        async def on_stage(stage: str, state: str) -> None:
+            await asyncio.to_thread(self.queue.set_stage, job_id, stage, state)
+
+        try:
+            await asyncio.wait_for(
+                self.content_generator.generate_content_for_keyword(
+                    Keyword.model_validate(row), stages=stages, on_stage=on_stage
+                ),
+                self.job_timeout_seconds,
+            )
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            delay = retry_delay(
+                job["attempts"],
+                settings.GENERATION_RETRY_BASE_SECONDS,
+                settings.GENERATION_RETRY_MAX_SECONDS,
+            )
+            retried = await asyncio.to_thread(self.queue.fail, job, error, delay)
+            if retried:
+                logger.warning(
+                    f"Generation job {job_id} failed, retrying in {delay:.0f}s: {error}"
+                )
+            else:
+                logger.error(f"Generation job {job_id} failed for good: {error}")
+            return
+
+        await asyncio.to_thread(self.queue.complete, job_id)
+        logger.info(f"Generation job {job_id} succeeded")
+
+
+async def run_worker() -> None:
+    """Build the services and run a worker until SIGTERM or SIGINT."""
+    services = await ServiceContainer.create()
+    try:
+        if services.generation_queue is None:
+            raise RuntimeError("GENERATION_QUEUE_ENABLED is off; nothing to process")
+        worker = GenerationWorker(
+            services.generation_queue,
+            services.content_generator,
+            concurrency=settings.GENERATION_WORKER_CONCURRENCY,
+            poll_seconds=settings.GENERATION_WORKER_POLL_SECONDS,
+            job_timeout_seconds=settings.GENERATION_JOB_TIMEOUT_SECONDS,
+        )
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, worker.stop)
+        await worker.run()
+    finally:
+        await services.aclose()
+
+
+def main() -> None:
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: memory and lookup latency of the preloaded keyword catalog.
+
+Loads KEYWORDS synthetic keywords into a KeywordCatalog and reports the
+memory it holds (measured with tracemalloc and by KeywordCatalog.memory_usage)
+next to the same rows kept as plain dicts, plus the time per lookup.
+
+Run from the repository root (the app settings, e.g. .env, must be loadable):
+
+    python -m benchmarks.keyword_catalog
+"""
+
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+# Load app.core before app.services, as the app does; the other order is an
+# import cycle
+import app.core  # noqa: F401
+from app.services.keyword_catalog import KeywordCatalog
+
+KEYWORDS = 10_000
+LOOKUPS = 100_000
+CDN = "https://faac.fra1.cdn.digitaloceanspaces.com"
+
+
+def make_row(keyword_id: int) -> Dict[str, Any]:
+    """A keyword with its audio URLs, shaped like an audio lookup row."""
+    name = f"keyword-{keyword_id}"
+    return {
+        "id": keyword_id,
+        "name": name,
+        "language": "en",
+        "pictogram_url": f"{CDN}/pictograms/pic_{name}_final.png",
+        "audio_id": keyword_id,
+        "voice_man_url": f"{CDN}/voice_clips/{name}_man.mp3",
+        "voice_woman_url": f"{CDN}/voice_clips/{name}_woman.mp3",
+        "updated_at": "2024-05-02T11:30:00.654321",
+    }
+
+
+def traced(build: Callable[[], Any]) -> int:
+    """Bytes still allocated by `build()` once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()  # noqa: F841 - kept alive until measured
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main() -> None:
+    # Rows are rebuilt inside each measurement so their strings are counted
+    def build_dicts() -> Dict[str, Dict[str, Any]]:
+        return {row["name"]: row for row in map(make_row, range(KEYWORDS))}
+
+    def build_catalog() -> KeywordCatalog:
+        catalog = KeywordCatalog(keyword_service=None)
+        catalog.upsert(map(make_row, range(KEYWORDS)))
+        return catalog
+
+    catalog = build_catalog()
+    per_10k = catalog.memory_usage() * 10_000 / KEYWORDS
+    print(f"Memory for {KEYWORDS} keywords")
+    print(f"  dict rows (tracemalloc)       {traced(build_dicts) / 1024:9.0f} KiB")
+    print(f"  catalog (tracemalloc)         {traced(build_catalog) / 1024:9.0f} KiB")
+    print(f"  catalog (memory_usage)        {catalog.memory_usage() / 1024:9.0f} KiB")
+    print(f"  per 10k keywords              {per_10k / 1024:9.0f} KiB")
+
+    names: List[str] = [f"keyword-{i % KEYWORDS}" for i in range(LOOKUPS)]
+    start = time.perf_counter()
+    for name in names:
+        catalog.get(name)
+    per_lookup = (time.perf_counter() - start) / LOOKUPS * 1e6
+    print(f"Lookup by name                  {per_lookup:9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
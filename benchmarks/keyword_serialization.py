@@ -0,0 +1,102 @@
+"""
+Microbenchmark: per-request CPU spent serializing keyword read responses.
+
+Compares FastAPI's default response path (SQLModel conversion for lists,
+response_model validation, jsonable_encoder, json.dumps) with the
+precompiled TypeAdapter path in app.core.serialization.
+
+Run from the repository root (the app settings, e.g. .env, must be loadable):
+
+    python -m benchmarks.keyword_serialization
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+
+from app.core.serialization import encode_json
+from app.models import Keyword
+from app.schemas import KeywordRead, KeywordReadDetailed
+
+ITERATIONS = 2000
+LIST_SIZE = 100
+
+
+def make_row(keyword_id: int) -> Dict[str, Any]:
+    """A keyword row with embedded audio, shaped like a Supabase response."""
+    return {
+        "id": keyword_id,
+        "name": f"keyword-{keyword_id}",
+        "description": "A word used in everyday conversation",
+        "language": "en",
+        "pictogram_url": f"https://cdn.example.com/pictograms/pic_{keyword_id}.png",
+        "created_at": "2024-05-01T10:00:00.123456",
+        "updated_at": "2024-05-02T11:30:00.654321",
+        "audio_id": keyword_id,
+        "audio": {
+            "id": keyword_id,
+            "keyword_id": keyword_id,
+            "voice_man": f"https://cdn.example.com/voice/{keyword_id}_man.mp3",
+            "voice_woman": f"https://cdn.example.com/voice/{keyword_id}_woman.mp3",
+            "created_at": "2024-05-01T10:00:00.123456",
+        },
+    }
+
+
+async def fastapi_encode(field: Any, content: Any) -> bytes:
+    """Encode the way a route returning `content` with a response_model does."""
+    serialized = await serialize_response(field=field, response_content=content)
+    return JSONResponse(content=serialized).body
+
+
+async def measure(label: str, encode: Callable[[], Any]) -> float:
+    """Run `encode` ITERATIONS times and print the mean time per call."""
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        result = encode()
+        if asyncio.iscoroutine(result):
+            await result
+    per_call = (time.perf_counter() - start) / ITERATIONS * 1e6
+    print(f"  {label:<28} {per_call:9.1f} us/request")
+    return per_call
+
+
+async def compare(name: str, baseline: Callable, fast: Callable) -> None:
+    """Check both paths produce the same JSON, then time them."""
+    assert json.loads(await baseline()) == json.loads(fast()), name
+    print(name)
+    before = await measure("FastAPI response_model", baseline)
+    after = await measure("TypeAdapter fast path", fast)
+    print(f"  saved {before - after:.1f} us/request ({before / after:.1f}x faster)")
+
+
+async def main() -> None:
+    row = make_row(1)
+    rows: List[Dict[str, Any]] = [make_row(i) for i in range(LIST_SIZE)]
+
+    detail_field = create_model_field("Response", KeywordReadDetailed)
+    detail_adapter = TypeAdapter(KeywordReadDetailed)
+    await compare(
+        "GET /keywords/{id}",
+        lambda: fastapi_encode(detail_field, dict(row)),
+        lambda: encode_json(dict(row), detail_adapter),
+    )
+
+    list_field = create_model_field("Response", List[KeywordRead])
+    list_adapter = TypeAdapter(List[KeywordRead])
+    await compare(
+        f"GET /keywords ({LIST_SIZE} rows)",
+        # The previous list path converted every row to a SQLModel instance
+        lambda: fastapi_encode(list_field, [Keyword.model_validate(r) for r in rows]),
+        lambda: encode_json(rows, list_adapter),
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -13,6 +13,62 @@ CREATE TABLE IF NOT EXISTS keywords (
 -- Create index on keywords.name
 CREATE INDEX IF NOT EXISTS idx_keywords_name ON keywords(name);
 
+-- Index for delta sync, which pages keywords by (updated_at, id)
+CREATE INDEX IF NOT EXISTS idx_keywords_updated_at_id ON keywords(updated_at, id);
+
+-- Tombstones of deleted keywords, so offline clients can drop them on sync
+CREATE TABLE IF NOT EXISTS keyword_tombstones (
+    keyword_id INTEGER PRIMARY KEY,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_keyword_tombstones_deleted_at
+ON keyword_tombstones(deleted_at, keyword_id);
+
+-- Keyword search: trigram index for prefix/substring/typo-tolerant name
+-- matches and a full-text index on descriptions
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_keywords_name_trgm
+ON keywords USING GIN (lower(name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_keywords_description_fts
+ON keywords USING GIN (to_tsvector('simple', coalesce(description, '')));
+
+-- Ranked search used by GET /keywords/search: exact, then prefix, then
+-- substring and similar names, then description-only matches
+CREATE OR REPLACE FUNCTION search_keywords(
+    search_query TEXT,
+    max_results INTEGER DEFAULT 20,
+    search_language VARCHAR DEFAULT NULL
+)
+RETURNS SETOF keywords
+LANGUAGE sql STABLE
+AS $$
+    WITH q AS (
+        SELECT
+            lower(search_query) AS term,
+            -- Escape LIKE wildcards so they match literally
+            replace(replace(replace(lower(search_query), '\', '\\'), '%', '\%'), '_', '\_')
+                AS pattern
+    )
+    SELECT k.*
+    FROM keywords k, q
+    WHERE (search_language IS NULL OR k.language = search_language)
+      AND (
+          lower(k.name) LIKE '%' || q.pattern || '%'
+          OR lower(k.name) % q.term
+          OR to_tsvector('simple', coalesce(k.description, ''))
+             @@ plainto_tsquery('simple', search_query)
+      )
+    ORDER BY
+        lower(k.name) = q.term DESC,
+        lower(k.name) LIKE q.pattern || '%' DESC,
+        similarity(lower(k.name), q.term) DESC,
+        k.name
+    LIMIT max_results;
+$$;
+
 -- Create audio_files table
 CREATE TABLE IF NOT EXISTS audio_files (
     id SERIAL PRIMARY KEY,
@@ -27,4 +83,135 @@ ALTER TABLE audio_files
 ADD CONSTRAINT fk_keyword FOREIGN KEY (keyword_id) REFERENCES keywords(id);
 
 ALTER TABLE keywords 
-ADD CONSTRAINT fk_audio FOREIGN KEY (audio_id) REFERENCES audio_files(id); 
\ No newline at end of file
+ADD CONSTRAINT fk_audio FOREIGN KEY (audio_id) REFERENCES audio_files(id);
+
+-- audio_files.keyword_id is not indexed by its foreign key; lookups of a
+-- keyword's audio and deletes of keywords would scan the table otherwise
+CREATE INDEX IF NOT EXISTS idx_audio_files_keyword_id ON audio_files(keyword_id);
+
+-- Denormalized read model for GET /keywords/audio/{name} and the batch
+-- lookup: one row per keyword with its voice URLs, so the hot path is a
+-- single index read instead of a keywords/audio_files join. Maintained by
+-- triggers on keywords and audio_files (below).
+CREATE TABLE IF NOT EXISTS keyword_audio_lookup (
+    id INTEGER PRIMARY KEY REFERENCES keywords(id) ON DELETE CASCADE,
+    name VARCHAR NOT NULL,
+    language VARCHAR NOT NULL,
+    pictogram_url TEXT,
+    audio_id INTEGER,
+    voice_man_url VARCHAR,
+    voice_woman_url VARCHAR,
+    updated_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_keyword_audio_lookup_by_name
+ON keyword_audio_lookup(name);
+
+-- Rebuild a keyword's row whenever the keyword is inserted or updated
+CREATE OR REPLACE FUNCTION sync_keyword_audio_lookup()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO keyword_audio_lookup (
+        id, name, language, pictogram_url, audio_id,
+        voice_man_url, voice_woman_url, updated_at
+    )
+    VALUES (
+        NEW.id, NEW.name, NEW.language, NEW.pictogram_url, NEW.audio_id,
+        (SELECT voice_man FROM audio_files WHERE id = NEW.audio_id),
+        (SELECT voice_woman FROM audio_files WHERE id = NEW.audio_id),
+        NEW.updated_at
+    )
+    ON CONFLICT (id) DO UPDATE SET
+        name = EXCLUDED.name,
+        language = EXCLUDED.language,
+        pictogram_url = EXCLUDED.pictogram_url,
+        audio_id = EXCLUDED.audio_id,
+        voice_man_url = EXCLUDED.voice_man_url,
+        voice_woman_url = EXCLUDED.voice_woman_url,
+        updated_at = EXCLUDED.updated_at;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS keywords_sync_audio_lookup ON keywords;
+CREATE TRIGGER keywords_sync_audio_lookup
+AFTER INSERT OR UPDATE ON keywords
+FOR EACH ROW EXECUTE FUNCTION sync_keyword_audio_lookup();
+
+-- Copy the voice URLs of an audio record to the keywords pointing at it,
+-- bumping their updated_at for the HTTP cache validators
+CREATE OR REPLACE FUNCTION sync_audio_file_lookup()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE keyword_audio_lookup
+    SET voice_man_url = NEW.voice_man,
+        voice_woman_url = NEW.voice_woman,
+        updated_at = GREATEST(
+            keyword_audio_lookup.updated_at, now() at time zone 'utc'
+        )
+    WHERE audio_id = NEW.id;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS audio_files_sync_audio_lookup ON audio_files;
+CREATE TRIGGER audio_files_sync_audio_lookup
+AFTER INSERT OR UPDATE ON audio_files
+FOR EACH ROW EXECUTE FUNCTION sync_audio_file_lookup();
+
+CREATE INDEX IF NOT EXISTS idx_keyword_audio_lookup_audio_id
+ON keyword_audio_lookup(audio_id);
+
+-- Durable content generation queue (app.core.job_queue): one row per job,
+-- claimed by `python -m app.worker` with FOR UPDATE SKIP LOCKED. stages
+-- holds the status of each pipeline stage ({"picture": ..., "voice": ...}).
+CREATE TABLE IF NOT EXISTS generation_jobs (
+    id SERIAL PRIMARY KEY,
+    keyword_id INTEGER NOT NULL,
+    keyword_name VARCHAR NOT NULL,
+    language VARCHAR NOT NULL DEFAULT 'en',
+    status VARCHAR NOT NULL DEFAULT 'queued',
+    stages JSONB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    last_error TEXT,
+    run_at TIMESTAMP NOT NULL DEFAULT now(),
+    locked_by VARCHAR,
+    locked_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    updated_at TIMESTAMP NOT NULL DEFAULT now(),
+    batch_id INTEGER
+);
+
+-- At most one queued or running job per keyword
+CREATE UNIQUE INDEX IF NOT EXISTS idx_generation_jobs_active
+ON generation_jobs(keyword_id) WHERE status IN ('queued', 'running');
+
+-- Due jobs, in claim order
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_queued
+ON generation_jobs(run_at, id) WHERE status = 'queued';
+
+-- Latest job of a keyword, for GET /keywords/{id}/generation
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_keyword_id
+ON generation_jobs(keyword_id, id);
+
+-- Vocabulary batches (app.services.vocabulary_batch): one row per batch,
+-- whose keywords are generated by generation_jobs rows with its batch_id.
+-- Progress is counted from the status of those jobs.
+CREATE TABLE IF NOT EXISTS generation_batches (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR,
+    total INTEGER NOT NULL,
+    created INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    cancelled_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- Jobs of a batch, for its progress
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_batch_id
+ON generation_jobs(batch_id, status) WHERE batch_id IS NOT NULL;
@@ -0,0 +1,98 @@
+-- Baseline: the schema from create_tables.sql before migrations existed.
+-- Every statement is idempotent, so it also applies cleanly to databases
+-- that were set up by running create_tables.sql by hand.
+
+-- Create tables without foreign key constraints first
+CREATE TABLE IF NOT EXISTS keywords (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR NOT NULL UNIQUE,
+    description TEXT,
+    pictogram_url TEXT,
+    language VARCHAR NOT NULL DEFAULT 'en',
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    audio_id INTEGER
+);
+
+-- Create index on keywords.name
+CREATE INDEX IF NOT EXISTS idx_keywords_name ON keywords(name);
+
+-- Index for delta sync, which pages keywords by (updated_at, id)
+CREATE INDEX IF NOT EXISTS idx_keywords_updated_at_id ON keywords(updated_at, id);
+
+-- Tombstones of deleted keywords, so offline clients can drop them on sync
+CREATE TABLE IF NOT EXISTS keyword_tombstones (
+    keyword_id INTEGER PRIMARY KEY,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_keyword_tombstones_deleted_at
+ON keyword_tombstones(deleted_at, keyword_id);
+
+-- Keyword search: trigram index for prefix/substring/typo-tolerant name
+-- matches and a full-text index on descriptions
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_keywords_name_trgm
+ON keywords USING GIN (lower(name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_keywords_description_fts
+ON keywords USING GIN (to_tsvector('simple', coalesce(description, '')));
+
+-- Ranked search used by GET /keywords/search: exact, then prefix, then
+-- substring and similar names, then description-only matches
+CREATE OR REPLACE FUNCTION search_keywords(
+    search_query TEXT,
+    max_results INTEGER DEFAULT 20,
+    search_language VARCHAR DEFAULT NULL
+)
+RETURNS SETOF keywords
+LANGUAGE sql STABLE
+AS $$
+    WITH q AS (
+        SELECT
+            lower(search_query) AS term,
+            -- Escape LIKE wildcards so they match literally
+            replace(replace(replace(lower(search_query), '\', '\\'), '%', '\%'), '_', '\_')
+                AS pattern
+    )
+    SELECT k.*
+    FROM keywords k, q
+    WHERE (search_language IS NULL OR k.language = search_language)
+      AND (
+          lower(k.name) LIKE '%' || q.pattern || '%'
+          OR lower(k.name) % q.term
+          OR to_tsvector('simple', coalesce(k.description, ''))
+             @@ plainto_tsquery('simple', search_query)
+      )
+    ORDER BY
+        lower(k.name) = q.term DESC,
+        lower(k.name) LIKE q.pattern || '%' DESC,
+        similarity(lower(k.name), q.term) DESC,
+        k.name
+    LIMIT max_results;
+$$;
+
+-- Create audio_files table
+CREATE TABLE IF NOT EXISTS audio_files (
+    id SERIAL PRIMARY KEY,
+    voice_man VARCHAR,
+    voice_woman VARCHAR,
+    keyword_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Add foreign key constraints after both tables exist (skipped when a
+-- database created from create_tables.sql already has them)
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_keyword') THEN
+        ALTER TABLE audio_files
+        ADD CONSTRAINT fk_keyword FOREIGN KEY (keyword_id) REFERENCES keywords(id);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_audio') THEN
+        ALTER TABLE keywords
+        ADD CONSTRAINT fk_audio FOREIGN KEY (audio_id) REFERENCES audio_files(id);
+    END IF;
+END
+$$;
@@ -0,0 +1,3 @@
+-- audio_files.keyword_id is not indexed by its foreign key; lookups of a
+-- keyword's audio and deletes of keywords would scan the table otherwise
+CREATE INDEX IF NOT EXISTS idx_audio_files_keyword_id ON audio_files(keyword_id);
@@ -0,0 +1,87 @@
+-- Denormalized read model for GET /keywords/audio/{name} and the batch
+-- lookup: one row per keyword with its voice URLs, so the hot path is a
+-- single index read instead of a keywords/audio_files join. Triggers on
+-- keywords and audio_files keep it up to date in the transaction of every
+-- write, whoever makes it (API, generation worker, SQL console,
+-- migrations). Rows of deleted keywords go with them (ON DELETE CASCADE).
+CREATE TABLE IF NOT EXISTS keyword_audio_lookup (
+    id INTEGER PRIMARY KEY REFERENCES keywords(id) ON DELETE CASCADE,
+    name VARCHAR NOT NULL,
+    language VARCHAR NOT NULL,
+    pictogram_url TEXT,
+    audio_id INTEGER,
+    voice_man_url VARCHAR,
+    voice_woman_url VARCHAR,
+    updated_at TIMESTAMP NOT NULL
+);
+
+-- Names are unique in keywords already; a unique index here would reject
+-- row by row updates that swap two names
+CREATE INDEX IF NOT EXISTS idx_keyword_audio_lookup_by_name
+ON keyword_audio_lookup(name);
+
+-- Rebuild a keyword's row whenever the keyword is inserted or updated
+CREATE OR REPLACE FUNCTION sync_keyword_audio_lookup()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO keyword_audio_lookup (
+        id, name, language, pictogram_url, audio_id,
+        voice_man_url, voice_woman_url, updated_at
+    )
+    VALUES (
+        NEW.id, NEW.name, NEW.language, NEW.pictogram_url, NEW.audio_id,
+        (SELECT voice_man FROM audio_files WHERE id = NEW.audio_id),
+        (SELECT voice_woman FROM audio_files WHERE id = NEW.audio_id),
+        NEW.updated_at
+    )
+    ON CONFLICT (id) DO UPDATE SET
+        name = EXCLUDED.name,
+        language = EXCLUDED.language,
+        pictogram_url = EXCLUDED.pictogram_url,
+        audio_id = EXCLUDED.audio_id,
+        voice_man_url = EXCLUDED.voice_man_url,
+        voice_woman_url = EXCLUDED.voice_woman_url,
+        updated_at = EXCLUDED.updated_at;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS keywords_sync_audio_lookup ON keywords;
+CREATE TRIGGER keywords_sync_audio_lookup
+AFTER INSERT OR UPDATE ON keywords
+FOR EACH ROW EXECUTE FUNCTION sync_keyword_audio_lookup();
+
+-- Copy the voice URLs of an audio record to the keywords pointing at it
+CREATE OR REPLACE FUNCTION sync_audio_file_lookup()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE keyword_audio_lookup
+    SET voice_man_url = NEW.voice_man, voice_woman_url = NEW.voice_woman
+    WHERE audio_id = NEW.id;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS audio_files_sync_audio_lookup ON audio_files;
+CREATE TRIGGER audio_files_sync_audio_lookup
+AFTER INSERT OR UPDATE ON audio_files
+FOR EACH ROW EXECUTE FUNCTION sync_audio_file_lookup();
+
+CREATE INDEX IF NOT EXISTS idx_keyword_audio_lookup_audio_id
+ON keyword_audio_lookup(audio_id);
+
+-- Backfill existing keywords
+INSERT INTO keyword_audio_lookup (
+    id, name, language, pictogram_url, audio_id,
+    voice_man_url, voice_woman_url, updated_at
+)
+SELECT
+    k.id, k.name, k.language, k.pictogram_url, k.audio_id,
+    a.voice_man, a.voice_woman, k.updated_at
+FROM keywords k
+LEFT JOIN audio_files a ON a.id = k.audio_id
+ON CONFLICT (id) DO NOTHING;
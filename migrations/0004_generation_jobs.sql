@@ -0,0 +1,31 @@
+-- Durable content generation queue (app.core.job_queue): one row per job,
+-- claimed by `python -m app.worker` with FOR UPDATE SKIP LOCKED. stages
+-- holds the status of each pipeline stage ({"picture": ..., "voice": ...}).
+CREATE TABLE IF NOT EXISTS generation_jobs (
+    id SERIAL PRIMARY KEY,
+    keyword_id INTEGER NOT NULL,
+    keyword_name VARCHAR NOT NULL,
+    language VARCHAR NOT NULL DEFAULT 'en',
+    status VARCHAR NOT NULL DEFAULT 'queued',
+    stages JSONB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    last_error TEXT,
+    run_at TIMESTAMP NOT NULL DEFAULT now(),
+    locked_by VARCHAR,
+    locked_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- At most one queued or running job per keyword
+CREATE UNIQUE INDEX IF NOT EXISTS idx_generation_jobs_active
+ON generation_jobs(keyword_id) WHERE status IN ('queued', 'running');
+
+-- Due jobs, in claim order
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_queued
+ON generation_jobs(run_at, id) WHERE status = 'queued';
+
+-- Latest job of a keyword, for GET /keywords/{id}/generation
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_keyword_id
+ON generation_jobs(keyword_id, id);
@@ -0,0 +1,18 @@
+-- Vocabulary batches (app.services.vocabulary_batch): one row per batch,
+-- whose keywords are generated by generation_jobs rows with its batch_id.
+-- Progress is counted from the status of those jobs.
+CREATE TABLE IF NOT EXISTS generation_batches (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR,
+    total INTEGER NOT NULL,
+    created INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    cancelled_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS batch_id INTEGER;
+
+-- Jobs of a batch, for its progress
+CREATE INDEX IF NOT EXISTS idx_generation_jobs_batch_id
+ON generation_jobs(batch_id, status) WHERE batch_id IS NOT NULL;
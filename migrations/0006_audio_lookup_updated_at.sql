@@ -0,0 +1,18 @@
+-- Audio writes change a keyword's lookup row too: bump its updated_at, so
+-- the HTTP cache validators built from it change with the voice URLs.
+-- GREATEST keeps it from moving back behind a later keyword write.
+CREATE OR REPLACE FUNCTION sync_audio_file_lookup()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE keyword_audio_lookup
+    SET voice_man_url = NEW.voice_man,
+        voice_woman_url = NEW.voice_woman,
+        updated_at = GREATEST(
+            keyword_audio_lookup.updated_at, now() at time zone 'utc'
+        )
+    WHERE audio_id = NEW.id;
+    RETURN NULL;
+END
+$$;
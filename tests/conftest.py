@@ -0,0 +1,51 @@
+"""
+Shared fixtures. The suite runs against the in-process SQLite backend, so it
+needs no network, database server or provider keys; the settings the app
+requires are filled in with placeholders before it is imported.
+"""
+
+import os
+
+for _name in (
+    "ENVIRONMENT",
+    "OPENAI_API_KEY",
+    "GOOGLE_API_KEY",
+    "IDEOGRAM_API_KEY",
+    "ELEVEN_LABS_API_KEY",
+    "OPEN_SYMBOLS_SECRET_KEY",
+    "ADMIN_API_KEY",
+    "SPACES_KEY",
+    "SPACES_SECRET",
+    "BUCKET",
+    "REGION",
+):
+    os.environ.setdefault(_name, "test")
+os.environ["STORAGE_BACKEND"] = "sqlite"
+os.environ["SQLITE_DATABASE_PATH"] = ":memory:"
+
+import pytest  # noqa: E402
+
+# app.core before app.services, as the API imports them
+import app.core  # noqa: E402, F401
+from app.core.cache import TTLCache  # noqa: E402
+from app.core.sqlite_db import AsyncSQLiteCRUD, SQLiteCRUD  # noqa: E402
+from app.services.keyword_service import KeywordService  # noqa: E402
+
+
+@pytest.fixture
+def crud():
+    crud = SQLiteCRUD(":memory:")
+    yield crud
+    crud.close()
+
+
+@pytest.fixture
+def cache():
+    return TTLCache(max_size=100, ttl_seconds=60)
+
+
+@pytest.fixture
+def keyword_service(crud, cache):
+    return KeywordService(
+        crud=AsyncSQLiteCRUD(crud), cache=cache, negative_ttl_seconds=30
+    )
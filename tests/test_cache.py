@@ -0,0 +1,73 @@
+import time
+
+from app.core.cache import TTLCache
+
+
+def test_get_returns_stored_value_until_it_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl_seconds=10)
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    now[0] += 10
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_per_entry_ttl_overrides_the_default(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl_seconds=10)
+
+    cache.set("short", 1, ttl_seconds=1)
+    cache.set("long", 2)
+    now[0] += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_full_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_where_removes_matching_values():
+    cache = TTLCache()
+    cache.set(("id", 1), {"id": 1})
+    cache.set(("name", "eat"), {"id": 1})
+    cache.set(("id", 2), {"id": 2})
+
+    assert cache.invalidate_where(lambda row: row["id"] == 1) == 2
+    assert cache.get(("id", 2)) == {"id": 2}
+    assert cache.get(("name", "eat")) is None
+
+
+def test_set_with_stale_generation_is_dropped():
+    cache = TTLCache()
+    generation = cache.generation
+    cache.invalidate("a")
+
+    assert cache.set("a", "old", generation=generation) is False
+    assert cache.get("a") is None
+    assert cache.stats()["stale_sets"] == 1
+    assert cache.set("a", "new", generation=cache.generation) is True
+    assert cache.get("a") == "new"
+
+
+def test_stats_count_hits_and_misses():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
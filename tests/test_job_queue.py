@@ -0,0 +1,142 @@
+import pytest
+
+from app.core.job_queue import (
+    CANCELLED,
+    FAILED,
+    PENDING,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    SQLiteGenerationQueue,
+    retry_delay,
+)
+from app.models import Keyword
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteGenerationQueue(str(tmp_path / "jobs.db"), max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def keyword(keyword_id, name=None):
+    return Keyword(id=keyword_id, name=name or f"word{keyword_id}", language="en")
+
+
+def test_retry_delay_backs_off_exponentially():
+    assert [retry_delay(n, 30, 100) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+
+def test_enqueue_keeps_one_active_job_per_keyword(queue):
+    first = queue.enqueue([keyword(1)])[0]
+    again = queue.enqueue([keyword(1)])[0]
+    assert again["id"] == first["id"]
+    assert first["status"] == QUEUED
+    assert first["stages"] == {"picture": PENDING, "voice": PENDING}
+
+
+def test_enqueue_marks_stages_not_requested_as_succeeded(queue):
+    job = queue.enqueue([keyword(1)], stages={1: ["voice"]})[0]
+    assert job["stages"] == {"picture": SUCCEEDED, "voice": PENDING}
+
+
+def test_claim_runs_each_job_once(queue):
+    queue.enqueue([keyword(1), keyword(2)])
+    first = queue.claim("a")
+    second = queue.claim("b")
+    assert {first["keyword_id"], second["keyword_id"]} == {1, 2}
+    assert first["status"] == RUNNING
+    assert first["attempts"] == 1
+    assert first["locked_by"] == "a"
+    assert queue.claim("c") is None
+
+
+def test_failed_job_is_retried_until_max_attempts(queue):
+    queue.enqueue([keyword(1)])
+    job = queue.claim("w")
+    queue.set_stage(job["id"], "picture", SUCCEEDED)
+    assert queue.fail(job, "boom", delay=0) is True
+
+    retried = queue.claim("w")
+    assert retried["id"] == job["id"]
+    assert retried["attempts"] == 2
+    assert retried["last_error"] == "boom"
+    # The retry keeps the stages that already succeeded
+    assert retried["stages"]["picture"] == SUCCEEDED
+
+    assert queue.fail(retried, "boom again", delay=0) is False
+    assert queue.latest_for_keyword(1)["status"] == FAILED
+    assert queue.claim("w") is None
+
+
+def test_retry_waits_for_its_delay(queue):
+    queue.enqueue([keyword(1)])
+    job = queue.claim("w")
+    assert queue.fail(job, "boom", delay=60) is True
+    assert queue.claim("w") is None
+    assert queue.latest_for_keyword(1)["status"] == QUEUED
+
+
+def test_fail_without_delay_is_permanent(queue):
+    queue.enqueue([keyword(1)])
+    job = queue.claim("w")
+    assert queue.fail(job, "bad input") is False
+    assert queue.latest_for_keyword(1)["status"] == FAILED
+
+
+def test_keyword_can_be_requeued_once_its_job_is_done(queue):
+    first = queue.enqueue([keyword(1)])[0]
+    queue.complete(queue.claim("w")["id"])
+    second = queue.enqueue([keyword(1)])[0]
+    assert second["id"] != first["id"]
+    assert second["status"] == QUEUED
+
+
+def test_requeue_stale_releases_jobs_of_lost_workers(queue):
+    queue.enqueue([keyword(1)])
+    job = queue.claim("lost")
+    assert queue.requeue_stale(60) == 0
+
+    queue.connection.execute(
+        "UPDATE generation_jobs SET locked_at = '2000-01-01T00:00:00' WHERE id = ?",
+        (job["id"],),
+    )
+    assert queue.requeue_stale(60) == 1
+    requeued = queue.latest_for_keyword(1)
+    assert requeued["status"] == QUEUED
+    assert requeued["locked_by"] is None
+
+
+def test_batch_progress_and_cancel(queue):
+    batch = queue.create_batch("animals", total=3, created=3)
+    queue.enqueue([keyword(1), keyword(2), keyword(3)], batch_id=batch["id"])
+
+    queue.complete(queue.claim("w")["id"])
+    failed = queue.claim("w")
+    queue.fail(failed, "boom")
+
+    progress = queue.batch_progress(batch["id"])
+    assert progress["status"] == RUNNING
+    assert (progress["jobs"], progress["done"]) == (3, 2)
+    assert progress["succeeded"] == 1
+    assert progress["failed"] == 1
+    assert progress["remaining"] == 1
+    assert progress["errors"] == [{"name": failed["keyword_name"], "error": "boom"}]
+
+    queue.cancel_batch(batch["id"])
+    progress = queue.batch_progress(batch["id"])
+    assert progress["status"] == CANCELLED
+    assert progress["cancelled"] == 1
+    assert progress["remaining"] == 0
+    assert queue.claim("w") is None
+    assert queue.batch_progress(batch["id"] + 1) is None
+
+
+def test_batch_adopts_active_job_of_its_keyword(queue):
+    job = queue.enqueue([keyword(1)])[0]
+    batch = queue.create_batch(None, total=1)
+    adopted = queue.enqueue([keyword(1)], batch_id=batch["id"])[0]
+    assert adopted["id"] == job["id"]
+    assert adopted["batch_id"] == batch["id"]
+    assert [b["id"] for b in queue.list_batches()] == [batch["id"]]
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.schemas import KeywordCreate, KeywordUpdate
+from app.services.keyword_catalog import KeywordCatalog
+
+
+@pytest.fixture
+def catalog(keyword_service):
+    catalog = KeywordCatalog(keyword_service, page_size=2, overlap_seconds=60)
+    keyword_service.catalog = catalog
+    return catalog
+
+
+def test_load_pages_through_every_keyword(keyword_service, catalog):
+    async def scenario():
+        for name in ("a", "b", "c"):
+            await keyword_service.create(KeywordCreate(name=name))
+        await catalog.load()
+        assert len(catalog) == 3
+        assert catalog.get("b")["name"] == "b"
+        assert catalog.get("B") is None
+
+    asyncio.run(scenario())
+
+
+def test_refresh_applies_upserts_renames_and_deletes(keyword_service, catalog):
+    async def scenario():
+        cat = await keyword_service.create(KeywordCreate(name="cat"))
+        await catalog.load()
+
+        dog = await keyword_service.create(KeywordCreate(name="dog"))
+        await keyword_service.update(cat.id, KeywordUpdate(name="kitten"))
+        await keyword_service.delete(dog.id)
+        await catalog.refresh()
+
+        assert catalog.get("cat") is None
+        assert catalog.get("kitten")["id"] == cat.id
+        assert catalog.get("dog") is None
+        assert len(catalog) == 1
+
+    asyncio.run(scenario())
+
+
+def test_overlap_window_is_re_read_without_reapplying(keyword_service, catalog):
+    async def scenario():
+        await keyword_service.create(KeywordCreate(name="cat"))
+        await catalog.load()
+        # The overlap re-reads "cat", already held at the same updated_at
+        assert await catalog.refresh() == 0
+
+        await keyword_service.create(KeywordCreate(name="dog"))
+        assert await catalog.refresh() == 1
+        assert await catalog.refresh() == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,44 @@
+from app.core.trigram import similarity, trigrams
+from app.services.keyword_search import KeywordSearchIndex, normalize
+
+ROWS = [
+    {"id": 1, "name": "Eat", "language": "en"},
+    {"id": 2, "name": "eating", "language": "en"},
+    {"id": 3, "name": "sweet", "language": "en"},
+    {"id": 4, "name": "café", "language": "nl"},
+    {"id": 5, "name": "water", "language": "en"},
+]
+
+
+def search(query, **kwargs):
+    index = KeywordSearchIndex(ROWS)
+    return [(row["id"], match) for row, _, match in index.search(query, **kwargs)]
+
+
+def test_trigrams_are_padded_like_pg_trgm():
+    assert trigrams("cat") == {"  c", " ca", "cat", "at "}
+    assert similarity(trigrams("cat"), trigrams("cat")) == 1.0
+    assert similarity(trigrams("cat"), set()) == 0.0
+
+
+def test_normalize_folds_case_accents_and_spaces():
+    assert normalize("  Café   Au LAIT ") == "cafe au lait"
+
+
+def test_exact_ranks_above_prefix_above_substring():
+    assert search("eat") == [(1, "exact"), (2, "prefix")]
+    assert search("ting") == [(2, "substring")]
+
+
+def test_typos_match_fuzzily():
+    assert (5, "fuzzy") in search("watr")
+
+
+def test_accents_and_language_filter():
+    assert search("cafe") == [(4, "exact")]
+    assert search("cafe", language="en") == []
+
+
+def test_limit_and_empty_query():
+    assert len(search("e", limit=1)) == 1
+    assert search("   ") == []
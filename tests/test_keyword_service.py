@@ -0,0 +1,231 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from postgrest import APIError
+
+from app.core.config import settings
+from app.schemas import KeywordCreate, KeywordUpdate
+from app.services.keyword_service import NOT_FOUND
+
+
+def add_content(crud, keyword_id, pictogram_url="http://pictogram"):
+    """Give a keyword a pictogram and voices, so its reads are cacheable."""
+    audio = crud.create(
+        "audio_files",
+        {"keyword_id": keyword_id, "voice_man": "man.mp3", "voice_woman": "w.mp3"},
+    )
+    crud.update(
+        "keywords",
+        keyword_id,
+        {"pictogram_url": pictogram_url, "audio_id": audio["id"]},
+    )
+
+
+def test_duplicate_name_raises_a_unique_violation(keyword_service):
+    async def scenario():
+        await keyword_service.create(KeywordCreate(name="cat"))
+        with pytest.raises(APIError) as error:
+            await keyword_service.create(KeywordCreate(name="cat"))
+        assert error.value.code == "23505"
+
+    asyncio.run(scenario())
+
+
+def test_reads_are_served_from_the_cache(keyword_service, crud, cache):
+    async def scenario():
+        keyword = await keyword_service.create(KeywordCreate(name="cat"))
+        add_content(crud, keyword.id)
+        keyword_service.invalidate(keyword_id=keyword.id)
+
+        first = await keyword_service.get_detailed_by_id(keyword.id)
+        assert first["audio"]["voice_man"] == "man.mp3"
+        # Written behind the service's back: a cached read does not see it
+        crud.update("keywords", keyword.id, {"pictogram_url": "http://other"})
+        assert await keyword_service.get_detailed_by_id(keyword.id) == first
+        assert cache.get(("name", "cat"))["id"] == keyword.id
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_lookups_of_the_same_names_share_one_read(keyword_service):
+    async def scenario():
+        await keyword_service.create(KeywordCreate(name="cat"))
+        backend = keyword_service.supabase_crud
+        read_in = backend.read_in
+        reads = []
+
+        async def counting_read_in(*args, **kwargs):
+            reads.append(args)
+            await asyncio.sleep(0.01)
+            return await read_in(*args, **kwargs)
+
+        backend.read_in = counting_read_in
+        results = await asyncio.gather(
+            *(keyword_service.get_keywords_with_audio_urls(["cat"]) for _ in range(3))
+        )
+        assert [rows[0]["name"] for rows in results] == ["cat"] * 3
+        assert len(reads) == 1
+
+    asyncio.run(scenario())
+
+
+def test_lookups_of_the_same_names_in_any_order_share_one_read(keyword_service):
+    async def scenario():
+        for name in ("cat", "dog"):
+            await keyword_service.create(KeywordCreate(name=name))
+        backend = keyword_service.supabase_crud
+        read_in = backend.read_in
+        reads = []
+
+        async def counting_read_in(*args, **kwargs):
+            reads.append(args)
+            await asyncio.sleep(0.01)
+            return await read_in(*args, **kwargs)
+
+        backend.read_in = counting_read_in
+        first, second = await asyncio.gather(
+            keyword_service.get_keywords_with_audio_urls(["cat", "dog"]),
+            keyword_service.get_keywords_with_audio_urls(["dog", "cat", "dog"]),
+        )
+        assert [row["name"] for row in first] == ["cat", "dog"]
+        assert [row["name"] for row in second] == ["dog", "cat", "dog"]
+        assert len(reads) == 1
+
+    asyncio.run(scenario())
+
+
+def test_missing_name_is_negatively_cached_until_created(keyword_service, cache):
+    async def scenario():
+        assert await keyword_service.get_keyword_with_audio_urls("cat") is None
+        assert cache.get(("audio", "cat")) is NOT_FOUND
+        assert await keyword_service.get_keyword_with_audio_urls("cat") is None
+        assert keyword_service.negative_hits == 1
+
+        await keyword_service.create(KeywordCreate(name="cat"))
+        row = await keyword_service.get_keyword_with_audio_urls("cat")
+        assert row is not None and row["name"] == "cat"
+
+    asyncio.run(scenario())
+
+
+def test_missing_name_is_negatively_cached_until_renamed_to(keyword_service, cache):
+    async def scenario():
+        dog = await keyword_service.create(KeywordCreate(name="dog"))
+        assert await keyword_service.get_by_name("cat") is None
+        assert cache.get(("name", "cat")) is NOT_FOUND
+
+        await keyword_service.update(dog.id, KeywordUpdate(name="cat"))
+        renamed = await keyword_service.get_by_name("cat")
+        assert renamed is not None and renamed.id == dog.id
+
+    asyncio.run(scenario())
+
+
+def test_keywords_awaiting_content_are_not_cached(keyword_service, crud, cache):
+    async def scenario():
+        keyword = await keyword_service.create(KeywordCreate(name="cat"))
+        assert (await keyword_service.get_detailed_by_id(keyword.id))["audio"] is None
+        lookup = await keyword_service.get_keyword_with_audio_urls("cat")
+        assert lookup["voice_man_url"] is None
+
+        # The generation worker writes without invalidating this process
+        add_content(crud, keyword.id)
+        detailed = await keyword_service.get_detailed_by_id(keyword.id)
+        assert detailed["audio"]["voice_man"] == "man.mp3"
+        lookup = await keyword_service.get_keyword_with_audio_urls("cat")
+        assert lookup["voice_man_url"] == "man.mp3"
+        assert cache.get(("audio", "cat"))["voice_man_url"] == "man.mp3"
+
+    asyncio.run(scenario())
+
+
+def test_update_during_a_read_is_not_overwritten_by_it(keyword_service, crud, cache):
+    """A read that started before an update must not cache the old row."""
+
+    async def scenario():
+        keyword = await keyword_service.create(KeywordCreate(name="cat"))
+        add_content(crud, keyword.id, "http://old")
+        keyword_service.invalidate(keyword_id=keyword.id)
+
+        backend = keyword_service.supabase_crud
+        read = backend.read_with_embedded
+        started = asyncio.Event()
+
+        async def slow_read(*args, **kwargs):
+            row = await read(*args, **kwargs)
+            started.set()
+            await asyncio.sleep(0.1)
+            return row
+
+        backend.read_with_embedded = slow_read
+        reader = asyncio.create_task(keyword_service.get_detailed_by_id(keyword.id))
+        await started.wait()
+        backend.read_with_embedded = read
+
+        await keyword_service.update(
+            keyword.id, KeywordUpdate(pictogram_url="http://new")
+        )
+        # The slow read still returns what it saw, but must not cache it
+        assert (await reader)["pictogram_url"] == "http://old"
+
+        current = await keyword_service.get_detailed_by_id(keyword.id)
+        assert current["pictogram_url"] == "http://new"
+        assert cache.stats()["stale_sets"] >= 1
+
+    asyncio.run(scenario())
+
+
+def test_list_changes_next_since_trails_the_present(keyword_service):
+    async def scenario():
+        since = datetime.now() - timedelta(days=1)
+        await keyword_service.create(KeywordCreate(name="cat"))
+        changes = await keyword_service.list_changes(since=since, limit=10)
+        assert [row["name"] for row in changes["upserted"]] == ["cat"]
+        assert changes["next_cursor"] is None
+
+        # The new row is inside the safety lag, so the next sync re-reads it
+        next_since = datetime.fromisoformat(changes["next_since"])
+        lag = timedelta(seconds=settings.KEYWORD_CHANGES_SAFETY_LAG_SECONDS)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        assert next_since <= now - lag + timedelta(seconds=1)
+        again = await keyword_service.list_changes(since=next_since, limit=10)
+        assert [row["name"] for row in again["upserted"]] == ["cat"]
+
+    asyncio.run(scenario())
+
+
+def test_list_changes_pages_with_a_cursor(keyword_service):
+    async def scenario():
+        since = datetime.now() - timedelta(days=1)
+        for name in ("a", "b", "c"):
+            await keyword_service.create(KeywordCreate(name=name))
+        deleted_keyword = await keyword_service.get_by_name("a")
+        assert await keyword_service.delete(deleted_keyword.id) is True
+
+        names, deleted = [], []
+        page = await keyword_service.list_changes(since=since, limit=1)
+        while True:
+            names += [row["name"] for row in page["upserted"]]
+            deleted += page["deleted"]
+            if page["next_cursor"] is None:
+                break
+            page = await keyword_service.list_changes(cursor=page["next_cursor"])
+        assert sorted(names) == ["b", "c"]
+        assert deleted == [deleted_keyword.id]
+
+    asyncio.run(scenario())
+
+
+def test_delete_raises_when_the_tombstone_cannot_be_recorded(keyword_service):
+    async def scenario():
+        keyword = await keyword_service.create(KeywordCreate(name="cat"))
+
+        async def failing_upsert_many(*args, **kwargs):
+            raise APIError({"message": "boom", "code": "08000"})
+
+        keyword_service.supabase_crud.upsert_many = failing_upsert_many
+        with pytest.raises(APIError):
+            await keyword_service.delete(keyword.id)
+
+    asyncio.run(scenario())
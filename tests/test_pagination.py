@@ -0,0 +1,18 @@
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips():
+    position = {"id": 42, "name": "eat"}
+    cursor = encode_cursor(position)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == position
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", "bm90IGpzb24", "WzEsMl0"])
+def test_malformed_cursor_raises_value_error(cursor):
+    # Not base64, base64 of "not json", and a JSON list instead of an object
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
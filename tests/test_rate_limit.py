@@ -0,0 +1,117 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import ProviderLimiter, parse_retry_after, throttle_delay
+
+
+def too_many_requests(headers=None):
+    error = RuntimeError("429")
+    error.response = SimpleNamespace(status_code=429, headers=headers or {})
+    return error
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_throttle_delay():
+    assert throttle_delay(too_many_requests({"Retry-After": "3"})) == 3.0
+    assert throttle_delay(too_many_requests({"retry-after-ms": "250"})) == 0.25
+    assert throttle_delay(too_many_requests()) == 0.0
+    assert throttle_delay(ValueError("boom")) is None
+    error = RuntimeError("500")
+    error.status_code = 500
+    assert throttle_delay(error) is None
+
+
+def test_token_bucket_spaces_calls_after_the_burst():
+    limiter = ProviderLimiter("test", requests_per_minute=600, burst=2)
+    started = time.monotonic()
+    for _ in range(4):
+        limiter.call(lambda: None)
+    elapsed = time.monotonic() - started
+    # Two calls ride the burst; the next two wait ~0.1s each at 10/s
+    assert 0.15 <= elapsed < 1.0
+    stats = limiter.stats()
+    assert stats["calls"] == 4
+    assert stats["in_flight"] == 0
+    assert stats["waiting"] == 0
+
+
+def test_unconfigured_provider_is_not_throttled():
+    limiter = ProviderLimiter("test")
+    started = time.monotonic()
+    for _ in range(50):
+        limiter.call(lambda: None)
+    assert time.monotonic() - started < 0.5
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the limiter's sleeps instead of sleeping."""
+    slept = []
+    now = [time.monotonic()]
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limit.time, "sleep", sleep)
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return slept
+
+
+def test_429_is_retried_after_retry_after_and_halves_the_rate(sleeps):
+    limiter = ProviderLimiter("test", requests_per_minute=60, burst=5)
+    responses = [too_many_requests({"Retry-After": "2"}), "ok"]
+
+    def fn():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert limiter.call(fn) == "ok"
+    assert sleeps and sleeps[0] == pytest.approx(2.0)
+    assert limiter.throttled == 1
+    # Halved to 0.5/s by the 429, then raised by 5% of 1/s by the success
+    assert limiter.rate == pytest.approx(0.55)
+
+
+def test_429_gives_up_after_max_retries(sleeps):
+    limiter = ProviderLimiter("test", max_retries=2, backoff_base_seconds=1.0)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise too_many_requests()
+
+    with pytest.raises(RuntimeError):
+        limiter.call(fn)
+    assert len(calls) == 3
+    assert limiter.throttled == 3
+    # Exponential backoff with up to 25% jitter between the attempts
+    assert 1.0 <= sleeps[0] <= 1.25
+    assert 2.0 <= sleeps[1] <= 2.5
+
+
+def test_other_errors_are_not_retried(sleeps):
+    limiter = ProviderLimiter("test")
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        limiter.call(fn)
+    assert len(calls) == 1
+    assert limiter.throttled == 0
+    assert sleeps == []
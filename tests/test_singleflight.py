@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_calls_for_a_key_share_one_execution():
+    flights = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    async def main():
+        return await asyncio.gather(*(flights.do("k", fetch) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    assert flights.stats()["coalesced"] == 4
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_exception_reaches_every_waiting_caller():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            flights.do("k", fail), flights.do("k", fail), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert flights.executions == 1
+
+
+def test_calls_after_completion_or_clear_run_again():
+    flights = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        number = len(executions)
+        await asyncio.sleep(0.01)
+        return number
+
+    async def main():
+        assert await flights.do("k", fetch) == 1
+        first = asyncio.ensure_future(flights.do("k", fetch))
+        await asyncio.sleep(0)
+        flights.clear()
+        second = await flights.do("k", fetch)
+        return await first, second
+
+    assert asyncio.run(main()) == (2, 3)
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flights = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flights.do("k", fetch))
+        second = asyncio.ensure_future(flights.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,66 @@
+"""keyword_audio_lookup is kept in step with its sources by triggers."""
+
+LOOKUP = "keyword_audio_lookup"
+
+
+def lookup(crud, keyword_id):
+    return crud.read(LOOKUP, keyword_id)
+
+
+def test_new_keyword_gets_a_lookup_row(crud):
+    keyword = crud.create("keywords", {"name": "eat", "language": "nl"})
+
+    row = lookup(crud, keyword["id"])
+    assert (row["name"], row["language"], row["voice_man_url"]) == ("eat", "nl", None)
+
+
+def test_keyword_and_audio_writes_reach_the_lookup(crud):
+    keyword = crud.create("keywords", {"name": "eat"})
+    audio = crud.create("audio_files", {"keyword_id": keyword["id"], "voice_man": "m1"})
+    crud.update(
+        "keywords", keyword["id"], {"audio_id": audio["id"], "pictogram_url": "p"}
+    )
+    assert lookup(crud, keyword["id"])["voice_man_url"] == "m1"
+
+    crud.update("audio_files", audio["id"], {"voice_woman": "w1"})
+    row = lookup(crud, keyword["id"])
+    assert (row["pictogram_url"], row["voice_man_url"], row["voice_woman_url"]) == (
+        "p",
+        "m1",
+        "w1",
+    )
+
+
+def test_audio_writes_bump_the_lookup_updated_at(crud):
+    keyword = crud.create(
+        "keywords", {"name": "eat", "updated_at": "2024-05-01T10:00:00"}
+    )
+    audio = crud.create("audio_files", {"keyword_id": keyword["id"]})
+    crud.update("keywords", keyword["id"], {"audio_id": audio["id"]})
+    assert lookup(crud, keyword["id"])["updated_at"] == "2024-05-01T10:00:00"
+
+    crud.update("audio_files", audio["id"], {"voice_man": "m1"})
+    assert lookup(crud, keyword["id"])["updated_at"] > "2024-05-01T10:00:00"
+
+
+def test_renames_and_name_swaps_are_accepted(crud):
+    first = crud.create("keywords", {"name": "a"})
+    second = crud.create("keywords", {"name": "b"})
+
+    # Each rename reuses a name another keyword just gave up
+    crud.update("keywords", first["id"], {"name": "tmp"})
+    crud.update("keywords", second["id"], {"name": "a"})
+    crud.update("keywords", first["id"], {"name": "b"})
+
+    assert lookup(crud, first["id"])["name"] == "b"
+    assert lookup(crud, second["id"])["name"] == "a"
+    assert [row["id"] for row in crud.read_filtered(LOOKUP, "name", "a")] == [
+        second["id"]
+    ]
+
+
+def test_deleted_keyword_leaves_the_lookup(crud):
+    keyword = crud.create("keywords", {"name": "eat"})
+    crud.delete("keywords", keyword["id"])
+
+    assert lookup(crud, keyword["id"]) is None
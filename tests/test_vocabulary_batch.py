@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from app.core.job_queue import PENDING, SUCCEEDED, SQLiteGenerationQueue
+from app.schemas import KeywordCreate
+from app.services.vocabulary_batch import enqueue_vocabulary, parse_vocabulary
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SQLiteGenerationQueue(str(tmp_path / "jobs.db"))
+    yield queue
+    queue.close()
+
+
+def test_parse_vocabulary_formats():
+    assert [k.name for k in parse_vocabulary("eat\n# comment\n\ndrink\neat\n")] == [
+        "eat",
+        "drink",
+    ]
+    csv = "name,language\neten,nl\ndrink,\n"
+    parsed = parse_vocabulary(csv, "csv", language="en")
+    assert [(k.name, k.language) for k in parsed] == [("eten", "nl"), ("drink", "en")]
+    assert [k.name for k in parse_vocabulary('["eat", {"name": "go"}]', "json")] == [
+        "eat",
+        "go",
+    ]
+    with pytest.raises(ValueError):
+        parse_vocabulary("{}", "json")
+
+
+def test_enqueue_vocabulary_queues_only_missing_stages(keyword_service, crud, queue):
+    async def scenario():
+        done = await keyword_service.create(KeywordCreate(name="done"))
+        audio = crud.create(
+            "audio_files",
+            {"keyword_id": done.id, "voice_man": "m", "voice_woman": "w"},
+        )
+        crud.update(
+            "keywords", done.id, {"pictogram_url": "p", "audio_id": audio["id"]}
+        )
+        half = await keyword_service.create(KeywordCreate(name="half"))
+        crud.update("keywords", half.id, {"pictogram_url": "p"})
+
+        words = parse_vocabulary("done\nhalf\nnew\n")
+        progress = await enqueue_vocabulary(keyword_service, queue, words, "core")
+        assert (progress["total"], progress["created"], progress["skipped"]) == (
+            3,
+            1,
+            1,
+        )
+        assert progress["queued"] == 2
+
+        assert queue.latest_for_keyword(done.id) is None
+        assert queue.latest_for_keyword(half.id)["stages"] == {
+            "picture": SUCCEEDED,
+            "voice": PENDING,
+        }
+
+        # Posting the file again moves the active jobs to the new batch
+        # instead of queueing them twice
+        again = await enqueue_vocabulary(keyword_service, queue, words, "core")
+        assert again["queued"] == 2
+        assert queue.batch_progress(progress["id"])["queued"] == 0
+
+    asyncio.run(scenario())